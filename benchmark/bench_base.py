@@ -0,0 +1,81 @@
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_path not in sys.path:
+    sys.path.insert(0, root_path)
+os.chdir(root_path)
+
+from PySide6.QtCore import QPoint  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from common import widget_base  # noqa: E402
+
+
+def get_app() -> QApplication:
+    return QApplication.instance() or QApplication([])
+
+
+def get_frame() -> widget_base.Frame:
+    # widgets are singletons, so every benchmark in the process shares the same frame
+    if not hasattr(get_frame, 'frame'):
+        get_app()
+        get_frame.frame = widget_base.Frame(is_import_module=True)
+        get_frame.frame.show()
+    return get_frame.frame
+
+
+def clear_frame(frame: widget_base.Frame) -> None:
+    frame.remove_all_objects()
+    frame.set_coordinate_offset(QPoint())
+    get_app().processEvents()
+
+
+def fill_frame(frame: widget_base.Frame, num: int, interval: QPoint = QPoint(120, 40), num_col: int = 100) -> widget_base.Object:
+    obj = frame.widget_object_manager.generate_object(pos=QPoint())
+    for idx in range(num):
+        obj.add_object(widget_base.Text(obj=obj,
+                                        pos=QPoint((idx % num_col) * interval.x(), (idx // num_col) * interval.y()),
+                                        text=str(idx)))
+    get_app().processEvents()
+    return obj
+
+
+def measure(func: Callable, repeat: int = 10) -> Dict[str, float]:
+    durations: List[float] = []
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - time_start)
+
+    return {
+        'mean': statistics.mean(durations),
+        'median': statistics.median(durations),
+        'min': min(durations),
+        'max': max(durations)
+    }
+
+
+def print_result(name: str, result: Dict[str, float]) -> None:
+    print('{0:<40} mean {1:>10.3f} ms  median {2:>10.3f} ms  min {3:>10.3f} ms  max {4:>10.3f} ms'.format(
+        name, result['mean'] * 1e3, result['median'] * 1e3, result['min'] * 1e3, result['max'] * 1e3))
+
+
+def get_rss() -> Dict[str, float]:
+    # MiB, current from /proc when available, peak from getrusage (KiB on linux)
+    current = 0.0
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1 << 10)
+
+    return {
+        'current': current,
+        'peak': peak
+    }
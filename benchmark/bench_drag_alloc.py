@@ -0,0 +1,64 @@
+import gc
+import tracemalloc
+
+from PySide6.QtCore import QEvent, QPoint, QPointF
+from PySide6.QtGui import Qt, QMouseEvent
+
+from benchmark import bench_base
+from common import widget_base
+
+# bytes a mouse move may leave allocated once the drag is warmed up
+retained_bytes_per_move_ceiling = 16
+# transient bytes the whole run may peak at above its start
+peak_bytes_ceiling = 64 * 1024
+
+
+def make_mouse_event(event_type: QEvent.Type, pos: QPoint, button: Qt.MouseButton) -> QMouseEvent:
+    return QMouseEvent(event_type, QPointF(pos), QPointF(pos + QPoint(100, 100)),
+                       button, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+
+
+def move(text: widget_base.Text, frame: widget_base.Frame, events, moves_per_frame: int) -> None:
+    for idx, event in enumerate(events):
+        text.mouseMoveEvent(event)
+        if idx % moves_per_frame == moves_per_frame - 1:
+            frame.flush_coalesced()
+
+
+def main(num: int = 10000, moves_per_frame: int = 8) -> None:
+    frame = bench_base.get_frame()
+    obj = frame.widget_object_manager.generate_object(pos=QPoint())
+    text = obj.add_object(widget_base.Text(obj=obj, pos=QPoint(100, 100), text='drag'))
+
+    # events are built up front, they belong to Qt and not to the drag path
+    events = [make_mouse_event(QEvent.Type.MouseMove, QPoint(5 + idx % 50, 5 + idx % 30), Qt.MouseButton.NoButton) for idx in range(num)]
+    text.mousePressEvent(make_mouse_event(QEvent.Type.MouseButtonPress, QPoint(5, 5), Qt.MouseButton.LeftButton))
+    move(text, frame, events[:100], moves_per_frame)
+
+    gc.collect()
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    memory_start, _ = tracemalloc.get_traced_memory()
+    move(text, frame, events, moves_per_frame)
+    _, memory_peak = tracemalloc.get_traced_memory()
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    text.mouseReleaseEvent(make_mouse_event(QEvent.Type.MouseButtonRelease, QPoint(5, 5), Qt.MouseButton.LeftButton))
+
+    stats = snapshot_end.compare_to(snapshot_start, 'lineno')
+    retained_bytes = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    retained_blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    print('{0:<40} retained {1:>8.2f} bytes {2:>8.4f} blocks per move  peak {3:>8} bytes'.format(
+        'drag {0} moves'.format(num), retained_bytes / num, retained_blocks / num, memory_peak - memory_start))
+    for stat in stats[:5]:
+        print('    {0}'.format(stat))
+
+    bench_base.clear_frame(frame)
+
+    assert retained_bytes / num <= retained_bytes_per_move_ceiling, 'drag path retains memory per move'
+    assert memory_peak - memory_start <= peak_bytes_ceiling, 'drag path allocates too much per move'
+
+
+if __name__ == '__main__':
+    main()
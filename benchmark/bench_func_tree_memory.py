@@ -0,0 +1,90 @@
+import gc
+import tracemalloc
+from collections import deque
+
+from benchmark import bench_base  # noqa: F401
+from common import widget_base
+from widgets import widget_git
+
+
+class DictFunc(widget_base.Func):
+    # a subclass without __slots__ gets an instance dict back, as Func had before
+    pass
+
+
+class DictFuncArg(widget_base.FuncArg):
+    def __init__(self, key: str, **kwargs):
+        super().__init__(key, parse_key=lambda x: ' {0}'.format(x), parse_value=lambda x: ' {0}'.format(x), **kwargs)
+
+
+def build_tree(func_cls, func_arg_cls, num: int, num_children: int = 10) -> widget_base.Func:
+    root = func_cls(name='root', args=[func_arg_cls('root')])
+    process_list = deque([root])
+    cnt = 1
+    while cnt < num:
+        father = process_list.popleft()
+        for _ in range(min(num_children, num - cnt)):
+            func = func_cls(name=str(cnt), args=[func_arg_cls(str(cnt))], parent=father)
+            father.children.append(func)
+            process_list.append(func)
+            cnt += 1
+        father.is_leaf = False
+
+    return root
+
+
+def measure_tree(func_cls, func_arg_cls, num: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    root = build_tree(func_cls, func_arg_cls, num)
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    del root
+    return size / num
+
+
+class HistoryCommit:
+    # the fields CommitTable reads from a git commit, a linear history with a merge every 10 commits
+    __slots__ = ('hexsha', 'message', 'committed_date', 'parents')
+
+    def __init__(self, idx: int, parents: list):
+        self.hexsha = '{0:040x}'.format(idx)
+        self.message = 'commit {0}'.format(idx)
+        self.committed_date = 1700000000 + idx
+        self.parents = parents
+
+
+def measure_commits(num: int) -> float:
+    # newest first, as fetch_commits sorts them
+    ori_commits = [HistoryCommit(0, [])]
+    for idx in range(1, num):
+        ori_commits.append(HistoryCommit(idx, [ori_commits[-1]] + ([ori_commits[-10]] if idx % 10 == 0 and idx >= 10 else [])))
+    ori_commits.reverse()
+
+    gc.collect()
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    table = widget_git.CommitTable(ori_commits)
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # hexsha and message strings are shared with the input, as they are with the git objects, only the table itself is counted
+    size = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    del table
+    return size / num
+
+
+def main(num: int = 100000) -> None:
+    for name, func_cls, func_arg_cls in [
+        ('dict-backed', DictFunc, DictFuncArg),
+        ('slotted', widget_base.Func, widget_base.FuncArg)
+    ]:
+        print('{0:<40} {1:>10.1f} bytes per node'.format('{0} {1} func tree'.format(num, name), measure_tree(func_cls, func_arg_cls, num)))
+    print('{0:<40} {1:>10.1f} bytes per commit'.format('{0} commits in columns'.format(num), measure_commits(num)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import tracemalloc
+
+from PySide6.QtCore import QCoreApplication, QEvent
+
+from benchmark import bench_base
+from common import widget_base, memory_snapshot
+from widgets import widget_git
+
+# python heap an open and close cycle may keep once warmed up, caches and interned strings settle in the warm up
+retained_bytes_per_cycle_ceiling = 4 * 1024
+
+
+def flush_deletes() -> None:
+    # processEvents does not run deferred deletes, deleteLater only takes effect here
+    app = bench_base.get_app()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    app.processEvents()
+
+
+def open_and_close_git_tab(frame: widget_base.Frame) -> None:
+    git_tab = widget_git.GitTab(frame)
+    git_tab.load_git_repo([widget_base.FuncArg('path', bench_base.root_path)])
+    git_tab.log()
+    bench_base.get_app().processEvents()
+
+    # what closing the tabs does, then the object itself
+    git_tab.tab_local.delete_all_pages()
+    git_tab.tab_remote.delete_all_pages()
+    bench_base.clear_frame(frame)
+    flush_deletes()
+
+
+def main(num: int = 20, num_warm_up: int = 3) -> None:
+    frame = bench_base.get_frame()
+    frame.load_widget(frame, 'widget_git')
+
+    for _ in range(num_warm_up):
+        open_and_close_git_tab(frame)
+
+    tracemalloc.start(10)
+    snapshot_start = memory_snapshot.MemorySnapshot(frame)
+    for _ in range(num):
+        open_and_close_git_tab(frame)
+    snapshot_end = memory_snapshot.MemorySnapshot(frame)
+    tracemalloc.stop()
+
+    diff = snapshot_end.compare_to(snapshot_start)
+    print('{0:<40} retained {1:>10.1f} bytes per cycle'.format('git tab open and close x{0}'.format(num), diff['traced_bytes'] / num))
+    print(memory_snapshot.format_diff(diff))
+
+    assert memory_snapshot.is_leak_free(diff), 'qt objects survive closing a git tab'
+    assert diff['traced_bytes'] / num <= retained_bytes_per_cycle_ceiling, 'closing a git tab does not return the python heap to baseline'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+from PySide6.QtCore import QPoint
+
+from benchmark import bench_base
+from common import widget_base
+
+
+def main(num: int = 2000) -> None:
+    frame = bench_base.get_frame()
+    obj = frame.widget_object_manager.generate_object(pos=QPoint())
+
+    def create() -> None:
+        texts = [widget_base.Text(obj=obj, pos=QPoint((idx % 100) * 120, (idx // 100) * 40), text=str(idx)) for idx in range(num)]
+        obj.add_objects(texts)
+
+    num_item_start = len(frame.scene().items())
+    result = bench_base.measure(create, repeat=1)
+    bench_base.print_result('create {0} texts'.format(num), result)
+    print('{0:<40} scene items added {1}'.format('', len(frame.scene().items()) - num_item_start))
+
+    # chrome is only paid for the objects which actually use it
+    sub_objs = list(obj.children_objects)
+    result = bench_base.measure(lambda: [sub_obj.create_bounding_rect() for sub_obj in sub_objs], repeat=1)
+    bench_base.print_result('create {0} bounding rects'.format(num), result)
+    print('{0:<40} scene items added {1}'.format('', len(frame.scene().items()) - num_item_start))
+
+    bench_base.clear_frame(frame)
+
+
+if __name__ == '__main__':
+    main()
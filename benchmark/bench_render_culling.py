@@ -0,0 +1,28 @@
+from PySide6.QtCore import QPoint
+
+from benchmark import bench_base
+
+
+def pan(frame, widget_render, num_step: int = 20) -> None:
+    for step in range(num_step):
+        frame.set_coordinate_offset(QPoint(-step * 15, -step * 10))
+        widget_render.flush_dirty()
+    bench_base.get_app().processEvents()
+
+
+def main(num: int = 10000) -> None:
+    frame = bench_base.get_frame()
+    widget_render = frame.load_widget(frame, 'widget_render')
+    bench_base.fill_frame(frame, num)
+
+    for is_culling in [False, True]:
+        widget_render.is_culling = is_culling
+        widget_render.re_render_all()
+        result = bench_base.measure(lambda: pan(frame, widget_render), repeat=5)
+        bench_base.print_result('pan {0} objects, culling {1}'.format(num, 'on' if is_culling else 'off'), result)
+
+    bench_base.clear_frame(frame)
+
+
+if __name__ == '__main__':
+    main()
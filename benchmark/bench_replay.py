@@ -0,0 +1,32 @@
+import argparse
+import json
+
+from benchmark import bench_base
+from common import input_trace
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='replay a recorded input trace headlessly into a fresh frame')
+    parser.add_argument('trace', help='log/input_trace_<time>.jsonl.gz, recorded with Ctrl+Alt+I')
+    parser.add_argument('--realtime', action='store_true', help='keep the recorded timing instead of replaying as fast as possible')
+    parser.add_argument('--output', help='save the report as json')
+    parser.add_argument('--budget', type=float, help='fail when the total handling time exceeds this many ms')
+    args = parser.parse_args()
+
+    frame = bench_base.get_frame()
+    replayer = input_trace.InputReplayer(frame, input_trace.load_trace(args.trace))
+    replayer.replay(is_realtime=args.realtime)
+    print(replayer.get_summary())
+
+    report = replayer.get_report()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget is not None:
+        assert report['latency_ms'] <= args.budget, 'replay took {0:.1f} ms to handle, budget is {1:.1f} ms'.format(
+            report['latency_ms'], args.budget)
+
+
+if __name__ == '__main__':
+    main()
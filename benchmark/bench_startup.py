@@ -0,0 +1,58 @@
+import subprocess
+import sys
+import time
+
+time_start = time.perf_counter()
+
+from PySide6.QtCore import QObject, QEvent  # noqa: E402
+
+from benchmark import bench_base  # noqa: E402
+
+# seconds from interpreter start of this script to the first paint of the frame
+first_paint_budget = 3.0
+# modules only feature widgets need, none of them may be imported before the first paint
+deferred_modules = ['numpy', 'cv2', 'git', 'paramiko', 'flask', 'flask_socketio', 'PySide6.QtWebEngineWidgets']
+
+
+class PaintWatcher(QObject):
+    def __init__(self):
+        super().__init__()
+        self.time_first_paint = None
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # noqa
+        if event.type() == QEvent.Type.Paint and self.time_first_paint is None:
+            self.time_first_paint = time.perf_counter()
+        return False
+
+
+def run() -> None:
+    app = bench_base.get_app()
+    paint_watcher = PaintWatcher()
+
+    from common import widget_base
+    frame = widget_base.Frame(is_import_module=True)
+    frame.viewport().installEventFilter(paint_watcher)
+    frame.show()
+
+    while paint_watcher.time_first_paint is None and time.perf_counter() - time_start < first_paint_budget * 10:
+        app.processEvents()
+
+    time_first_paint = paint_watcher.time_first_paint - time_start
+    loaded_modules = [module for module in deferred_modules if module in sys.modules]
+    print('{0:<40} {1:>10.3f} s  budget {2:.3f} s'.format('time to first paint', time_first_paint, first_paint_budget))
+    print('{0:<40} {1}'.format('deferred modules loaded', loaded_modules or 'none'))
+
+    assert time_first_paint <= first_paint_budget, 'first paint is over budget'
+    assert not loaded_modules, 'heavy modules are imported at startup: {0}'.format(loaded_modules)
+
+
+def main() -> None:
+    # startup has to be measured in a fresh interpreter, nothing may be imported beforehand
+    subprocess.run([sys.executable, '-m', 'benchmark.bench_startup', 'run'], check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 2 and sys.argv[1] == 'run':
+        run()
+    else:
+        main()
@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, List, Any
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtCore import QEvent, QPoint, QPointF, QSize
+from PySide6.QtGui import Qt, QMouseEvent
+
+from benchmark import bench_base
+from common import widget_base
+from widgets import widget_object_manager
+
+default_scales = [1000, 10000, 50000]
+default_threshold = 0.1  # a case regresses when its median is this much slower than the baseline
+
+
+def make_mouse_event(event_type: QEvent.Type, pos: QPoint, button: Qt.MouseButton) -> QMouseEvent:
+    return QMouseEvent(event_type, QPointF(pos), QPointF(pos), button, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+
+
+def flush_deletes() -> None:
+    bench_base.get_app().sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    bench_base.get_app().processEvents()
+
+
+def timed(func: Callable) -> float:
+    time_start = time.perf_counter()
+    func()
+    return time.perf_counter() - time_start
+
+
+def case_add_remove(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    durations = {'add': [], 'remove': []}
+    for _ in range(3):
+        objs = []
+        durations['add'].append(timed(lambda: objs.extend(
+            frame.widget_object_manager.generate_object(pos=QPoint(idx % 100 * 120, idx // 100 * 40)) for idx in range(num))))
+        durations['remove'].append(timed(lambda: [frame.remove_object(obj) for obj in objs]))
+        flush_deletes()
+    return durations
+
+
+def case_drag_select(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    widget_drag_select = frame.load_widget(frame, 'widget_drag_select')
+    bench_base.fill_frame(frame, num)
+
+    # sweep from the empty corner above the objects to past the last one, left to right selects by intersection
+    end = QPoint(100 * 120, (num // 100 + 1) * 40)
+    moves = [make_mouse_event(QEvent.Type.MouseMove, QPoint(end.x() * step // 20, end.y() * step // 20), Qt.MouseButton.NoButton)
+             for step in range(1, 21)]
+
+    def sweep() -> None:
+        widget_drag_select.on_mouse_press(make_mouse_event(QEvent.Type.MouseButtonPress, QPoint(-5, -5), Qt.MouseButton.LeftButton))
+        for event in moves:
+            widget_drag_select.on_mouse_move(event)
+        widget_drag_select.on_mouse_release(make_mouse_event(QEvent.Type.MouseButtonRelease, end, Qt.MouseButton.LeftButton))
+
+    return {'sweep': [timed(sweep) for _ in range(3)]}
+
+
+def case_pan_re_render(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    widget_render = frame.load_widget(frame, 'widget_render')
+    bench_base.fill_frame(frame, num)
+
+    def pan() -> None:
+        for step in range(20):
+            frame.set_coordinate_offset(QPoint(-step * 15, -step * 10))
+            widget_render.re_render_all()
+        bench_base.get_app().processEvents()
+
+    return {'pan': [timed(pan) for _ in range(3)]}
+
+
+def case_render_to_frame(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    widget_render = frame.load_widget(frame, 'widget_render')
+
+    class Paste:
+        def __init__(self):
+            self.render_list = [widget_base.RenderData(str(idx), widget_base.RenderType.RENDER_TYPE_PLAIN_TEXT) for idx in range(num)]
+
+    paste = Paste()
+    durations = []
+    for _ in range(3):
+        durations.append(timed(lambda: widget_render.render_to_frame(paste)))
+        bench_base.clear_frame(frame)
+        flush_deletes()
+    return {'paste': durations}
+
+
+def case_table_render_list(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    obj = frame.widget_object_manager.generate_object(pos=QPoint())
+    table = obj.add_object(widget_base.Table(obj=obj, pos=QPoint(), size=QSize(800, 600), enable_checkbox=False))
+
+    table_header = ['name', 'value']
+    table_data = [widget_base.TableRow(data={
+        'name': widget_base.TableCell('name', str(idx), widget_base.TableCellType.LINEEDIT_READONLY, QSize(100, 20)),
+        'value': widget_base.TableCell('value', str(idx), widget_base.TableCellType.LINEEDIT_READONLY, QSize(100, 20))
+    }) for idx in range(num)]
+
+    durations = []
+    for _ in range(3):
+        durations.append(timed(lambda: table.render_list(table_header, table_data)))
+        table.setRowCount(0)
+        flush_deletes()
+    return {'render_list': durations}
+
+
+def case_func_tree(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    # binary fan-out, log2(num) levels deep
+    root = widget_base.Func(name='root')
+    process_list = deque([root])
+    cnt = 1
+    while cnt < num:
+        father = process_list.popleft()
+        for _ in range(min(2, num - cnt)):
+            func = widget_base.Func(name=str(cnt), parent=father)
+            father.children.append(func)
+            process_list.append(func)
+            cnt += 1
+        father.is_leaf = False
+
+    obj = frame.widget_object_manager.generate_object(pos=QPoint())
+    durations = []
+    for _ in range(3):
+        func_tree = []
+        durations.append(timed(lambda: func_tree.append(obj.add_object(widget_base.FuncTree(obj, QPoint(), [root])))))
+        func_tree[0].deleteLater()
+        flush_deletes()
+    return {'build': durations}
+
+
+def case_object_tree(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    bench_base.fill_frame(frame, num)
+
+    durations = []
+    for _ in range(3):
+        obj = frame.widget_object_manager.generate_object(pos=QPoint())
+
+        def open_tree() -> None:
+            view = obj.add_object(widget_object_manager.ObjectTreeView(obj, QPoint()))
+            view.expandAll()
+            bench_base.get_app().processEvents()
+
+        durations.append(timed(open_tree))
+        frame.remove_object(obj)
+        flush_deletes()
+    return {'open': durations}
+
+
+def case_remove_subtree(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    # one object holding num children, as a git tab or a file manager would
+    durations = []
+    for _ in range(3):
+        obj = bench_base.fill_frame(frame, num)
+        durations.append(timed(lambda: frame.remove_object(obj)))
+        flush_deletes()
+    return {'remove': durations}
+
+
+def case_group_drag(frame: widget_base.Frame, num: int) -> Dict[str, List[float]]:
+    widget_render = frame.load_widget(frame, 'widget_render')
+    obj = bench_base.fill_frame(frame, num)
+    for sub_obj in obj.children_objects:
+        sub_obj.select()
+        frame.group_idx.add(sub_obj.render_idx)
+
+    def drag() -> None:
+        for step in range(20):
+            frame.move_objects(frame.get_group(), 5 if step < 10 else -5, 3 if step < 10 else -3)
+        widget_render.re_render_all()
+        bench_base.get_app().processEvents()
+
+    return {'drag': [timed(drag) for _ in range(3)]}
+
+
+cases: Dict[str, Callable[[widget_base.Frame, int], Dict[str, List[float]]]] = {
+    'add_remove': case_add_remove,
+    'drag_select': case_drag_select,
+    'pan_re_render': case_pan_re_render,
+    'render_to_frame': case_render_to_frame,
+    'table_render_list': case_table_render_list,
+    'func_tree': case_func_tree,
+    'object_tree': case_object_tree,
+    'remove_subtree': case_remove_subtree,
+    'group_drag': case_group_drag
+}
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    durations = sorted(durations)
+    return {
+        'median': durations[len(durations) // 2],
+        'min': durations[0],
+        'max': durations[-1]
+    }
+
+
+def run_case(name: str, num: int) -> None:
+    # child process entry, one json line on stdout
+    frame = bench_base.get_frame()
+    results = cases[name](frame, num)
+    bench_base.clear_frame(frame)
+    print(json.dumps({'{0}.{1}/{2}'.format(name, step, num): summarize(durations) for step, durations in results.items()}))
+
+
+def run_suite(names: List[str], scales: List[int], output: str) -> Dict[str, Any]:
+    # every case and scale runs in a fresh process, so the singleton widgets and the heap start clean each time
+    results: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    for name in names:
+        for num in scales:
+            env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+            process = subprocess.run([sys.executable, '-m', 'benchmark.bench_suite', 'case', name, str(num)],
+                                     env=env, cwd=bench_base.root_path, capture_output=True, text=True)
+            if process.returncode:
+                print('{0}/{1} failed\n{2}'.format(name, num, process.stderr), file=sys.stderr)
+                failures.append('{0}/{1}'.format(name, num))
+                continue
+
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+            for key, summary in result.items():
+                print('{0:<40} median {1:>10.3f} ms  min {2:>10.3f} ms  max {3:>10.3f} ms'.format(
+                    key, summary['median'] * 1e3, summary['min'] * 1e3, summary['max'] * 1e3))
+            results.update(result)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'pyside': pyside_version,
+            'platform': platform.platform(),
+            'commit': subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=bench_base.root_path,
+                                     capture_output=True, text=True).stdout.strip()
+        },
+        'results': results,
+        'failures': failures
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print('results saved to {0}'.format(output))
+    return report
+
+
+def compare(baseline_path: str, result_path: str, threshold: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    with open(result_path) as f:
+        result = json.load(f)['results']
+
+    is_regressed = False
+    for key in sorted(set(baseline) | set(result)):
+        if key not in baseline or key not in result:
+            # a case that stopped producing a result crashed or was dropped, which is worse than any slowdown
+            print('{0:<40} {1}'.format(key, 'new' if key in result else 'MISSING'))
+            is_regressed |= key not in result
+            continue
+
+        ratio = result[key]['median'] / baseline[key]['median'] - 1 if baseline[key]['median'] else 0.0
+        status = 'REGRESSED' if ratio > threshold else ('improved' if ratio < -threshold else '')
+        is_regressed |= ratio > threshold
+        print('{0:<40} {1:>10.3f} ms -> {2:>10.3f} ms  {3:>+7.1%}  {4}'.format(
+            key, baseline[key]['median'] * 1e3, result[key]['median'] * 1e3, ratio, status))
+    return not is_regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='headless canvas benchmark suite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_run = subparsers.add_parser('run', help='run the suite and save the medians as json')
+    parser_run.add_argument('--cases', nargs='+', default=list(cases), choices=list(cases))
+    parser_run.add_argument('--scales', nargs='+', type=int, default=default_scales)
+    parser_run.add_argument('--output', default='log/bench_{0}.json'.format(time.strftime('%Y%m%d_%H%M%S')))
+    parser_run.add_argument('--baseline', help='compare against this result once the run is done')
+    parser_run.add_argument('--threshold', type=float, default=default_threshold)
+
+    parser_compare = subparsers.add_parser('compare', help='compare a result against a stored baseline')
+    parser_compare.add_argument('baseline')
+    parser_compare.add_argument('result')
+    parser_compare.add_argument('--threshold', type=float, default=default_threshold)
+
+    parser_case = subparsers.add_parser('case', help='run a single case, used by run')
+    parser_case.add_argument('name', choices=list(cases))
+    parser_case.add_argument('num', type=int)
+
+    args = parser.parse_args()
+    if args.command == 'case':
+        run_case(args.name, args.num)
+    elif args.command == 'run':
+        report = run_suite(args.cases, args.scales, args.output)
+        is_passed = not args.baseline or compare(args.baseline, args.output, args.threshold)
+        if report['failures'] or not is_passed:
+            sys.exit(1)
+    elif args.command == 'compare':
+        if not compare(args.baseline, args.result, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import collections
+import subprocess
+import sys
+
+from PySide6.QtCore import QPoint, QSize
+
+from benchmark import bench_base
+from common import widget_base
+
+
+def run(num: int, is_virtualizing: bool) -> None:
+    frame = bench_base.get_frame()
+    widget_render = frame.load_widget(frame, 'widget_render')
+    widget_render.is_virtualizing = is_virtualizing
+
+    obj = bench_base.fill_frame(frame, num)
+
+    # a column of the heavier widgets right of the texts, one table and one function tree per 200 texts
+    table_header = ['name', 'value']
+    func_list = [widget_base.Func(name=str(idx)) for idx in range(50)]
+    for idx in range(num // 200):
+        table = obj.add_object(widget_base.Table(obj=obj, pos=QPoint(12200, idx * 700), size=QSize(400, 300), enable_checkbox=False))
+        table.render_list(table_header, [widget_base.TableRow(data={
+            'name': widget_base.TableCell('name', str(row), widget_base.TableCellType.LINEEDIT_READONLY, QSize(100, 20)),
+            'value': widget_base.TableCell('value', str(row), widget_base.TableCellType.LINEEDIT_READONLY, QSize(100, 20))
+        }) for row in range(20)])
+        obj.add_object(widget_base.FuncTree(obj, QPoint(12700, idx * 700), func_list))
+    bench_base.get_app().processEvents()
+
+    for sub_obj in obj.children_objects:
+        if not isinstance(sub_obj, widget_base.FuncArgsTable):
+            sub_obj.is_virtualizable = True
+
+    # pan away from the filled area and back, so that most objects leave the viewport at least once
+    def pan() -> None:
+        for step in range(40):
+            frame.set_coordinate_offset(QPoint(-step * 300, -step * 200))
+            widget_render.flush_dirty()
+        frame.set_coordinate_offset(QPoint())
+        widget_render.flush_dirty()
+        bench_base.get_app().processEvents()
+
+    result = bench_base.measure(pan, repeat=3)
+    rss = bench_base.get_rss()
+    bench_base.print_result('pan {0} objects, virtualization {1}'.format(num, 'on' if is_virtualizing else 'off'), result)
+    virtualized = collections.Counter(frame.render_data[idx].cls.__name__ for idx in widget_render.virtualized_idx)
+    print('{0:<40} current {1:>10.1f} MiB  peak {2:>10.1f} MiB  virtualized {3}'.format(
+        '', rss['current'], rss['peak'], dict(virtualized) or 0))
+
+
+def main(num: int = 20000) -> None:
+    # each mode runs in its own process, otherwise the peak RSS of the first one hides the second
+    for is_virtualizing in [False, True]:
+        subprocess.run([sys.executable, '-m', 'benchmark.bench_virtualization', str(num), str(int(is_virtualizing))], check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        run(int(sys.argv[1]), bool(int(sys.argv[2])))
+    else:
+        main()
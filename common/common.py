@@ -3,7 +3,7 @@ import os
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QMimeData, QUrl
+from PySide6.QtCore import QMimeData, QUrl, QPoint
 
 from common import widget_base
 
@@ -79,6 +79,13 @@ def is_point_a_in_rec_b(a_x, a_y, b_left, b_right, b_top, b_bottom) -> bool:
         return False
 
 
+def assign_point(dst: QPoint, x: int, y: int) -> QPoint:
+    # update a point in place, so that hot paths do not allocate a new one
+    dst.setX(x)
+    dst.setY(y)
+    return dst
+
+
 def join_path(*args) -> str:
     return Path(str(os.path.join(*args))).as_posix()
 
@@ -1,10 +1,12 @@
-from typing import Union
+from typing import Union, TYPE_CHECKING
 from config import Config
 
-import numpy as np
 from PySide6.QtCore import Qt, QSize, QUrl
 from PySide6.QtGui import QImage, QPixmap
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 def qimage_to_qpixmap(image: QImage) -> QPixmap:
     return QPixmap().fromImage(image)
@@ -14,15 +16,17 @@ def qpixmap_to_qimage(image: QPixmap) -> QImage:
     return image.toImage()
 
 
-def qimage_to_numpy_bgr(image: QImage) -> np.array:
+def qimage_to_numpy_bgr(image: QImage) -> 'np.array':
+    import numpy as np  # deferred, numpy is only needed by the screenshot tool
+
     return np.array(image.bits(), dtype=np.uint8).reshape(image.height(), image.width(), 4)[:, :, :3]
 
 
-def qpixmap_to_numpy_bgr(image: QPixmap) -> np.array:
+def qpixmap_to_numpy_bgr(image: QPixmap) -> 'np.array':
     return qimage_to_numpy_bgr(image.toImage())
 
 
-def numpy_bgr_to_qpimage(image: np.array) -> QImage:
+def numpy_bgr_to_qpimage(image: 'np.array') -> QImage:
     if image.ndim == 3:
         return QImage(image.tobytes(), image.shape[1], image.shape[0], image.shape[1] * 3, QImage.Format.Format_BGR888)
     else:
@@ -30,7 +34,7 @@ def numpy_bgr_to_qpimage(image: np.array) -> QImage:
         return QImage()
 
 
-def numpy_bgr_to_qpixmap(image: np.array) -> QPixmap:
+def numpy_bgr_to_qpixmap(image: 'np.array') -> QPixmap:
     return QPixmap.fromImage(numpy_bgr_to_qpimage(image))
 
 
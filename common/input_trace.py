@@ -0,0 +1,243 @@
+import gzip
+import json
+import time
+from typing import List, Dict, Any, Optional
+
+from PySide6.QtCore import QObject, QEvent, QPoint, QPointF, QMimeData, QUrl
+from PySide6.QtGui import Qt, QCursor, QMouseEvent, QDragEnterEvent, QDragMoveEvent, QDragLeaveEvent, QDropEvent
+from PySide6.QtWidgets import QApplication
+
+from common.signal_profiler import LatencyHistogram
+
+trace_version = 1
+
+mouse_event_types = {
+    QEvent.Type.MouseButtonPress: 'press',
+    QEvent.Type.MouseMove: 'move',
+    QEvent.Type.MouseButtonRelease: 'release'
+}
+drag_event_types = {
+    QEvent.Type.DragEnter: 'drag_enter',
+    QEvent.Type.DragMove: 'drag_move',
+    QEvent.Type.DragLeave: 'drag_leave',
+    QEvent.Type.Drop: 'drop'
+}
+modifier_keys = {key.value for key in [Qt.Key.Key_Control, Qt.Key.Key_Alt, Qt.Key.Key_Shift, Qt.Key.Key_Meta]}
+
+
+def dump_mime_data(mime: QMimeData) -> Dict[str, Any]:
+    # images and custom formats are not kept, a trace stays small and text based
+    return {
+        'text': mime.text() if mime.hasText() else None,
+        'html': mime.html() if mime.hasHtml() else None,
+        'urls': [url.toString() for url in mime.urls()] if mime.hasUrls() else None
+    }
+
+
+def load_mime_data(data: Dict[str, Any]) -> QMimeData:
+    mime = QMimeData()
+    if data.get('text') is not None:
+        mime.setText(data['text'])
+    if data.get('html') is not None:
+        mime.setHtml(data['html'])
+    if data.get('urls') is not None:
+        mime.setUrls([QUrl(url) for url in data['urls']])
+    return mime
+
+
+class InputRecorder(QObject):
+    # records what reaches the frame, one row per event, [time ms, kind, fields...]
+    def __init__(self, frame):
+        super().__init__(frame)
+        self.frame = frame
+
+        self.header: Dict[str, Any] = {}
+        self.events: List[List[Any]] = []
+        self.time_start = 0.0
+        self.is_recording = False
+
+    def start(self) -> None:
+        if self.is_recording:
+            return
+
+        self.header = {
+            'version': trace_version,
+            'time': time.time(),
+            'size': list(self.frame.size().toTuple()),
+            'coordinate_offset': list(self.frame.coordinate_offset.toTuple())
+        }
+        self.events = []
+        self.time_start = time.perf_counter()
+        self.is_recording = True
+
+        # mouse and drag events go to the viewport, keys and resizes to the view itself
+        self.frame.viewport().installEventFilter(self)
+        self.frame.installEventFilter(self)
+
+    def stop(self) -> None:
+        if not self.is_recording:
+            return
+
+        self.frame.viewport().removeEventFilter(self)
+        self.frame.removeEventFilter(self)
+        self.is_recording = False
+
+    def drop_trailing_keys(self, key: Qt.Key) -> None:
+        # the shortcut stopping the recording is recorded too, with the modifiers pressed for it
+        while self.events and self.events[-1][1] == 'key' and (self.events[-1][2] == key.value or self.events[-1][2] in modifier_keys):
+            self.events.pop()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        timestamp = round((time.perf_counter() - self.time_start) * 1e3, 3)
+        event_type = event.type()
+
+        if watched is self.frame.viewport():
+            if event_type in mouse_event_types:
+                pos = event.position().toPoint()
+                self.events.append([timestamp, mouse_event_types[event_type], pos.x(), pos.y(),
+                                    event.button().value, event.buttons().value, event.modifiers().value])
+            elif event_type in drag_event_types:
+                row = [timestamp, drag_event_types[event_type]]
+                if event_type != QEvent.Type.DragLeave:
+                    pos = event.position().toPoint()
+                    row.extend([pos.x(), pos.y(), event.possibleActions().value, event.buttons().value, event.modifiers().value])
+                if event_type in (QEvent.Type.DragEnter, QEvent.Type.Drop):
+                    row.append(dump_mime_data(event.mimeData()))
+                self.events.append(row)
+        elif watched is self.frame:
+            # every key press is offered as a shortcut override first, shortcuts never reach KeyPress
+            if event_type == QEvent.Type.ShortcutOverride:
+                self.events.append([timestamp, 'key', Qt.Key(event.key()).value, event.modifiers().value, event.text()])
+            elif event_type == QEvent.Type.Resize:
+                self.events.append([timestamp, 'resize', event.size().width(), event.size().height()])
+
+        return False
+
+    def save(self, file_path: str) -> None:
+        with gzip.open(file_path, 'wt') as f:
+            f.write(json.dumps(self.header) + '\n')
+            for row in self.events:
+                f.write(json.dumps(row, separators=(',', ':')) + '\n')
+
+
+def load_trace(file_path: str) -> Dict[str, Any]:
+    with gzip.open(file_path, 'rt') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != trace_version:
+            raise ValueError('unsupported input trace version: {0}'.format(header.get('version')))
+        return {'header': header, 'events': [json.loads(line) for line in f if line.strip()]}
+
+
+class InputReplayer:
+    # feeds a trace back into a frame, each event is timed until the event loop is idle again
+    def __init__(self, frame, trace: Dict[str, Any]):
+        self.frame = frame
+        self.header = trace['header']
+        self.events = trace['events']
+
+        self.mime: Optional[QMimeData] = None  # kept until the next drag, the events only borrow it
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.total_latency = 0.0
+        self.duration = 0.0
+
+    def prepare(self) -> None:
+        self.frame.resize(*self.header['size'])
+        self.frame.set_coordinate_offset(QPoint(*self.header['coordinate_offset']))
+        self.frame.activateWindow()
+        self.frame.setFocus()
+        QApplication.processEvents()
+
+    def send_mouse_event(self, kind: str, row: List[Any]) -> None:
+        _, _, x, y, button, buttons, modifiers = row
+        viewport = self.frame.viewport()
+        pos = QPoint(x, y)
+        global_pos = viewport.mapToGlobal(pos)
+        # objects created at the cursor look it up through QCursor
+        QCursor.setPos(global_pos)
+
+        event_type = {'press': QEvent.Type.MouseButtonPress, 'move': QEvent.Type.MouseMove, 'release': QEvent.Type.MouseButtonRelease}[kind]
+        event = QMouseEvent(event_type, QPointF(pos), QPointF(global_pos),
+                            Qt.MouseButton(button), Qt.MouseButton(buttons), Qt.KeyboardModifier(modifiers))
+        QApplication.sendEvent(viewport, event)
+
+    def send_drag_event(self, kind: str, row: List[Any]) -> None:
+        viewport = self.frame.viewport()
+        if kind == 'drag_leave':
+            QApplication.sendEvent(viewport, QDragLeaveEvent())
+            return
+
+        x, y, actions, buttons, modifiers = row[2:7]
+        QCursor.setPos(viewport.mapToGlobal(QPoint(x, y)))
+        if kind in ('drag_enter', 'drop'):
+            self.mime = load_mime_data(row[7])
+
+        args = (Qt.DropAction(actions), self.mime, Qt.MouseButton(buttons), Qt.KeyboardModifier(modifiers))
+        if kind == 'drag_enter':
+            event = QDragEnterEvent(QPoint(x, y), *args)
+        elif kind == 'drag_move':
+            event = QDragMoveEvent(QPoint(x, y), *args)
+        else:
+            event = QDropEvent(QPointF(x, y), *args)
+        QApplication.sendEvent(viewport, event)
+
+    def send(self, row: List[Any]) -> None:
+        kind = row[1]
+        if kind in mouse_event_types.values():
+            self.send_mouse_event(kind, row)
+        elif kind in drag_event_types.values():
+            self.send_drag_event(kind, row)
+        elif kind == 'key':
+            # through QTest so that the shortcut map sees the key press as a real one would, deferred as the recorder does not need it
+            from PySide6.QtTest import QTest
+            QTest.keyClick(self.frame, Qt.Key(row[2]), Qt.KeyboardModifier(row[3]))
+        elif kind == 'resize':
+            self.frame.resize(row[2], row[3])
+
+    def replay(self, is_realtime: bool = False) -> None:
+        self.prepare()
+
+        time_start = time.perf_counter()
+        for row in self.events:
+            if is_realtime:
+                time_target = time_start + row[0] / 1e3
+                while time.perf_counter() < time_target:
+                    QApplication.processEvents()
+                    time.sleep(min(1e-3, max(time_target - time.perf_counter(), 0.0)))
+
+            time_event = time.perf_counter()
+            self.send(row)
+            QApplication.processEvents()
+            latency = time.perf_counter() - time_event
+
+            self.histograms.setdefault(row[1], LatencyHistogram()).record(latency)
+            self.total_latency += latency
+
+        self.frame.flush_coalesced()
+        QApplication.processEvents()
+        self.duration = time.perf_counter() - time_start
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            'num_events': len(self.events),
+            'recorded_ms': self.events[-1][0] if self.events else 0.0,
+            'duration_ms': self.duration * 1e3,
+            'latency_ms': self.total_latency * 1e3,
+            'events': {kind: {
+                'count': histogram.count,
+                'total_ms': histogram.total * 1e3,
+                'p50_ms': histogram.percentile(50) * 1e3,
+                'p95_ms': histogram.percentile(95) * 1e3,
+                'p99_ms': histogram.percentile(99) * 1e3,
+                'max_ms': histogram.max * 1e3
+            } for kind, histogram in self.histograms.items()}
+        }
+
+    def get_summary(self) -> str:
+        report = self.get_report()
+        lines = ['replayed {0} events in {1:.1f} ms (recorded {2:.1f} ms), {3:.1f} ms handling'.format(
+            report['num_events'], report['duration_ms'], report['recorded_ms'], report['latency_ms'])]
+        for kind, row in sorted(report['events'].items(), key=lambda x: -x[1]['total_ms']):
+            lines.append('{0:>8} events {1:>10.2f} ms total  p50 {2:>8.3f}  p95 {3:>8.3f}  p99 {4:>8.3f}  max {5:>8.3f} ms  {6}'.format(
+                row['count'], row['total_ms'], row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms'], kind))
+        return '\n'.join(lines)
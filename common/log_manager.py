@@ -0,0 +1,66 @@
+import collections
+import json
+import sys
+import time
+from typing import Deque, Dict, Any
+
+import loguru
+
+from config import Config
+
+
+class LogManager:
+    # the sinks are process wide, every frame gets the same logger and setup only runs once
+    def __init__(self):
+        self.logger = loguru.logger
+        self.is_setup = False
+
+        self.ring_buffer: Deque[str] = collections.deque(maxlen=Config.Log().ring_buffer_size)
+        self.num_messages = 0  # total ever appended, tells a viewer whether the ring buffer changed
+
+    @staticmethod
+    def is_perf(record: Dict[str, Any]) -> bool:
+        return record['extra'].get('channel') == 'perf'
+
+    @staticmethod
+    def is_not_perf(record: Dict[str, Any]) -> bool:
+        return record['extra'].get('channel') != 'perf'
+
+    def append(self, message: str) -> None:
+        # runs on the calling thread, a deque append is all it costs
+        self.ring_buffer.append(message.rstrip('\n'))
+        self.num_messages += 1
+
+    def setup(self) -> 'loguru.Logger':
+        if self.is_setup:
+            return self.logger
+        self.is_setup = True
+
+        config = Config.Log()
+        date_and_time = time.strftime('%Y-%m-%d_%H-%M-%S')
+
+        # file sinks are enqueued, formatting stays on the caller while writing, rotation and compression run on the writer thread
+        self.logger.remove()
+        if config.enable_console:
+            self.logger.add(sys.stderr, level=config.level, enqueue=True, filter=self.is_not_perf)
+        self.logger.add('log/{0}.log'.format(date_and_time), level=config.level, enqueue=True, filter=self.is_not_perf,
+                        rotation=config.rotation, retention=config.retention, compression=config.compression)
+        if config.enable_perf_channel:
+            self.logger.add('log/perf_{0}.jsonl'.format(date_and_time), format='{extra[perf]}', level='DEBUG', enqueue=True,
+                            filter=self.is_perf, rotation=config.rotation, retention=config.retention, compression=config.compression)
+        # perf events go to their own file only, they would push the messages out of the viewer buffer
+        self.logger.add(self.append, level=config.level, filter=self.is_not_perf, format='{time:HH:mm:ss.SSS} | {level: <8} | {message}')
+
+        return self.logger
+
+    def perf(self, event: str, **fields) -> None:
+        # one json object per line in log/perf_<time>.jsonl, e.g. perf('stall', duration_ms=250.0)
+        payload = json.dumps({'time': time.time(), 'event': event, **fields})
+        self.logger.bind(channel='perf', perf=payload).debug('perf ' + payload)
+
+    def complete(self) -> None:
+        # waits until the writer threads drained their queues
+        self.logger.complete()
+
+
+manager = LogManager()
@@ -0,0 +1,104 @@
+import collections
+import gc
+import time
+import tracemalloc
+from typing import Dict, Counter, Any, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtWidgets import QGraphicsItem
+
+tracked_types = (QObject, QGraphicsItem, QPixmap, QImage)
+
+
+class MemorySnapshot:
+    # live qt wrappers by type plus the tracemalloc heap when tracing, diff two of them to find leaks
+    def __init__(self, frame):
+        gc.collect()
+        self.time = time.time()
+
+        self.wrapper_counts: Counter[str] = collections.Counter()  # python wrappers by type, across the whole process
+        self.deleted_wrapper_counts: Counter[str] = collections.Counter()  # wrappers kept alive after their c++ object is gone
+        self.pixel_bytes: Counter[str] = collections.Counter()
+        for obj in gc.get_objects():
+            if not isinstance(obj, tracked_types):
+                continue
+
+            type_name = type(obj).__qualname__
+            if not shiboken6.isValid(obj):
+                self.deleted_wrapper_counts[type_name] += 1
+                continue
+
+            self.wrapper_counts[type_name] += 1
+            if isinstance(obj, QPixmap):
+                self.pixel_bytes[type_name] += obj.width() * obj.height() * obj.depth() // 8
+            elif isinstance(obj, QImage):
+                self.pixel_bytes[type_name] += obj.sizeInBytes()
+
+        # c++ children of the frame by class, includes the ones python no longer references
+        self.qobject_counts: Counter[str] = collections.Counter(
+            child.metaObject().className() for child in frame.findChildren(QObject))
+        self.num_scene_items = len(frame.scene().items())
+        self.num_render_data = len(frame.render_data)
+
+        self.traced_snapshot: Optional[tracemalloc.Snapshot] = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        self.traced_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    @staticmethod
+    def diff_counter(old: Counter[str], new: Counter[str]) -> Dict[str, int]:
+        keys = set(old) | set(new)
+        return {key: new[key] - old[key] for key in sorted(keys) if new[key] != old[key]}
+
+    def compare_to(self, old: 'MemorySnapshot', num_lines: int = 10) -> Dict[str, Any]:
+        top_lines = []
+        if self.traced_snapshot is not None and old.traced_snapshot is not None:
+            stats = self.traced_snapshot.compare_to(old.traced_snapshot, 'lineno')
+            top_lines = [{
+                'location': '{0}:{1}'.format(stat.traceback[0].filename, stat.traceback[0].lineno),
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff
+            } for stat in stats[:num_lines] if stat.size_diff]
+
+        return {
+            'duration': self.time - old.time,
+            'wrapper_counts': self.diff_counter(old.wrapper_counts, self.wrapper_counts),
+            'deleted_wrapper_counts': self.diff_counter(old.deleted_wrapper_counts, self.deleted_wrapper_counts),
+            'pixel_bytes': self.diff_counter(old.pixel_bytes, self.pixel_bytes),
+            'qobject_counts': self.diff_counter(old.qobject_counts, self.qobject_counts),
+            'num_scene_items': self.num_scene_items - old.num_scene_items,
+            'num_render_data': self.num_render_data - old.num_render_data,
+            'traced_bytes': self.traced_bytes - old.traced_bytes,
+            'top_lines': top_lines
+        }
+
+    def get_summary(self) -> str:
+        return 'memory snapshot, {0} qt wrappers ({1} deleted), {2} frame children, {3} scene items, {4} objects, {5:.1f} MiB pixels, {6:.1f} MiB traced'.format(
+            sum(self.wrapper_counts.values()), sum(self.deleted_wrapper_counts.values()), sum(self.qobject_counts.values()),
+            self.num_scene_items, self.num_render_data, sum(self.pixel_bytes.values()) / (1 << 20), self.traced_bytes / (1 << 20))
+
+
+def is_leak_free(diff: Dict[str, Any]) -> bool:
+    # no qt object survived between the two snapshots, python heap growth is judged by the caller
+    return not (any(count > 0 for count in diff['wrapper_counts'].values()) or
+                any(count > 0 for count in diff['deleted_wrapper_counts'].values()) or
+                any(count > 0 for count in diff['qobject_counts'].values()) or
+                diff['num_scene_items'] > 0 or diff['num_render_data'] > 0)
+
+
+def format_diff(diff: Dict[str, Any]) -> str:
+    lines = ['memory diff over {0:.1f} s, {1:+} scene items, {2:+} objects, {3:+.1f} KiB traced'.format(
+        diff['duration'], diff['num_scene_items'], diff['num_render_data'], diff['traced_bytes'] / (1 << 10))]
+    for key, title in [('wrapper_counts', 'qt wrappers'),
+                       ('deleted_wrapper_counts', 'deleted qt wrappers'),
+                       ('qobject_counts', 'frame children'),
+                       ('pixel_bytes', 'pixel bytes')]:
+        if diff[key]:
+            lines.append('  {0}'.format(title))
+            lines.extend('    {0:>+10}  {1}'.format(count, type_name) for type_name, count in
+                         sorted(diff[key].items(), key=lambda x: -abs(x[1])))
+    if diff['top_lines']:
+        lines.append('  allocations')
+        lines.extend('    {0:>+10.1f} KiB {1:>+8} blocks  {2}'.format(line['size_diff'] / (1 << 10), line['count_diff'], line['location'])
+                     for line in diff['top_lines'])
+    return '\n'.join(lines)
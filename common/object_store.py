@@ -0,0 +1,78 @@
+from typing import Dict, List, Iterable, Tuple
+
+root_idx = -1  # the frame, parent of every top level object
+
+
+class ObjectStore:
+    # parent and child links by render_idx, children are kept in insertion ordered dicts,
+    # which gives a stable order (oldest first) and O(1) unlinking
+    def __init__(self):
+        self.parents: Dict[int, int] = {}
+        self.children: Dict[int, Dict[int, None]] = {root_idx: {}}
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self.parents
+
+    def insert(self, idx: int, parent_idx: int = root_idx) -> None:
+        if idx in self.parents:
+            self.move(idx, parent_idx)
+            return
+
+        self.parents[idx] = parent_idx
+        children = self.children.get(parent_idx)
+        if children is None:
+            self.children[parent_idx] = {idx: None}
+        else:
+            children[idx] = None
+
+    def insert_many(self, items: Iterable[Tuple[int, int]]) -> None:
+        for idx, parent_idx in items:
+            self.insert(idx, parent_idx)
+
+    def move(self, idx: int, parent_idx: int) -> None:
+        # reparented after its new siblings
+        old_parent_idx = self.parents[idx]
+        del self.children[old_parent_idx][idx]
+        self.parents[idx] = parent_idx
+        self.children.setdefault(parent_idx, {})[idx] = None
+
+    def get_parent(self, idx: int) -> int:
+        return self.parents[idx]
+
+    def get_children(self, idx: int) -> List[int]:
+        return list(self.children.get(idx, ()))
+
+    def iter_subtree(self, idx: int) -> Iterable[int]:
+        # pre-order, siblings oldest first, without recursion so that deep trees cannot hit the recursion limit
+        yield idx
+        stack = [iter(self.children.get(idx, ()))]
+        while stack:
+            child_idx = next(stack[-1], None)
+            if child_idx is None:
+                stack.pop()
+                continue
+
+            yield child_idx
+            children = self.children.get(child_idx)
+            if children:
+                stack.append(iter(children))
+
+    def remove_subtree(self, idx: int) -> List[int]:
+        # unlinks idx and everything below it at once, the removed indices are returned parents first
+        if idx not in self.parents:
+            return []
+
+        idx_list = list(self.iter_subtree(idx))
+        del self.children[self.parents[idx]][idx]
+        for _idx in idx_list:
+            del self.parents[_idx]
+            self.children.pop(_idx, None)
+        return idx_list
+
+    def clear(self) -> None:
+        self.parents.clear()
+        self.children.clear()
+        self.children[root_idx] = {}
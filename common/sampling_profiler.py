@@ -0,0 +1,96 @@
+import collections
+import marshal
+import sys
+import threading
+import time
+from typing import Dict, Tuple, List, Counter, Optional
+
+FuncKey = Tuple[str, int, str]  # (filename, first line, function name), the key used by pstats
+
+
+class SamplingProfiler:
+    # samples the python stack of every thread, the process runs unmodified in between
+    def __init__(self, interval: float):
+        self.interval = interval  # second
+
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+        self.samples: Counter[Tuple[str, Tuple[FuncKey, ...]]] = collections.Counter()  # (thread name, root first stack) -> count
+        self.num_samples = 0
+        self.time_start = 0.0
+        self.time_end = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self.samples = collections.Counter()
+        self.num_samples = 0
+        self.stop_event.clear()
+        self.time_start = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name='sampling_profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if not self.is_running:
+            return
+
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.time_end = time.perf_counter()
+
+    def run(self) -> None:
+        self_thread_id = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():  # noqa
+                if thread_id == self_thread_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+
+                self.samples[(thread_names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+            self.num_samples += 1
+
+    def dump_collapsed(self, file_path: str) -> None:
+        # one line per unique stack, "thread;root;...;leaf count", readable by speedscope and flamegraph.pl
+        with open(file_path, 'w') as f:
+            for (thread_name, stack), count in self.samples.most_common():
+                frames = [thread_name] + ['{0} ({1}:{2})'.format(name, filename, line) for filename, line, name in stack]
+                f.write('{0} {1}\n'.format(';'.join(frame.replace(';', ':') for frame in frames), count))
+
+    def get_pstats(self) -> Dict[FuncKey, Tuple[int, int, float, float, Dict[FuncKey, Tuple[int, int, float, float]]]]:
+        # sampled approximation of the cProfile layout: call counts are sample counts, times are samples * interval
+        stats: Dict[FuncKey, List] = {}
+        for (_, stack), count in self.samples.items():
+            duration = count * self.interval
+            for idx, func in enumerate(stack):
+                stat = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                stat[0] += count
+                stat[1] += count
+                if func not in stack[:idx]:
+                    stat[3] += duration
+                if idx == len(stack) - 1:
+                    stat[2] += duration
+                if idx:
+                    caller = stack[idx - 1]
+                    nc, cc, tt, ct = stat[4].get(caller, (0, 0, 0.0, 0.0))
+                    stat[4][caller] = (nc + count, cc + count, tt + (duration if idx == len(stack) - 1 else 0.0), ct + duration)
+
+        return {func: (cc, nc, tt, ct, callers) for func, (cc, nc, tt, ct, callers) in stats.items()}
+
+    def dump_pstats(self, file_path: str) -> None:
+        # loadable by pstats.Stats(file_path) and snakeviz
+        with open(file_path, 'wb') as f:
+            marshal.dump(self.get_pstats(), f)
@@ -0,0 +1,160 @@
+import time
+from typing import List, Dict, Tuple, Callable, Any
+
+from PySide6.QtCore import QObject
+
+signal_names = [
+    'signalKeyPress',
+    'signalMousePress',
+    'signalMouseMove',
+    'signalMouseRelease',
+    'signalDragEnter',
+    'signalDragMove',
+    'signalDragLeave',
+    'signalDrop',
+    'signalResize',
+    'signalObjectAdd',
+    'signalObjectRemove',
+    'signalRender'
+]
+
+
+class LatencyHistogram:
+    # log2 buckets in microseconds, bucket i holds durations in [2^(i-1), 2^i) us
+    num_buckets = 32
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * self.num_buckets
+        self.count = 0
+        self.total = 0.0  # second
+        self.max = 0.0  # second
+
+    def record(self, duration: float) -> None:
+        self.buckets[min(int(duration * 1e6).bit_length(), self.num_buckets - 1)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent: float) -> float:
+        # upper bound of the bucket holding the percentile, in second
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * percent / 100
+        cnt = 0
+        for idx, bucket in enumerate(self.buckets):
+            cnt += bucket
+            if cnt >= threshold:
+                return min((1 << idx) / 1e6, self.max)
+        return self.max
+
+
+class SignalProxy:
+    # stands in for a SignalInstance on the frame, every slot connected through it is timed
+    def __init__(self, profiler: 'SignalProfiler', signal_name: str, signal: Any):
+        self.profiler = profiler
+        self.signal_name = signal_name
+        self.signal = signal
+        self.wrapped_slots: Dict[Any, List[Callable]] = {}
+
+    def connect(self, slot: Callable, *args) -> Any:
+        wrapped_slot = self.profiler.wrap_slot(self.signal_name, slot)
+        self.wrapped_slots.setdefault(slot, []).append(wrapped_slot)
+
+        # qt drops a bound slot with its receiver, the wrapper is a plain function and has to be dropped by hand
+        receiver = getattr(slot, '__self__', None)
+        if isinstance(receiver, QObject):
+            receiver.destroyed.connect(lambda: self.forget_slot(slot, wrapped_slot))
+        return self.signal.connect(wrapped_slot, *args)
+
+    def forget_slot(self, slot: Callable, wrapped_slot: Callable) -> None:
+        wrapped_slots = self.wrapped_slots.get(slot, [])
+        if wrapped_slot not in wrapped_slots:
+            # already disconnected by the receiver itself
+            return
+
+        wrapped_slots.remove(wrapped_slot)
+        if not wrapped_slots:
+            self.wrapped_slots.pop(slot)
+        self.signal.disconnect(wrapped_slot)
+
+    def disconnect(self, slot: Callable = None) -> Any:
+        if slot is None:
+            self.wrapped_slots.clear()
+            return self.signal.disconnect()
+
+        wrapped_slots = self.wrapped_slots.get(slot)
+        if not wrapped_slots:
+            return self.signal.disconnect(slot)
+
+        wrapped_slot = wrapped_slots.pop()
+        if not wrapped_slots:
+            self.wrapped_slots.pop(slot)
+        return self.signal.disconnect(wrapped_slot)
+
+    def emit(self, *args) -> None:
+        self.signal.emit(*args)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.signal, item)
+
+
+class SignalProfiler:
+    def __init__(self, frame):
+        self.frame = frame
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def install(self) -> None:
+        # must run before the widgets connect, the instance attributes shadow the class signals
+        for signal_name in signal_names:
+            setattr(self.frame, signal_name, SignalProxy(self, signal_name, getattr(self.frame, signal_name)))
+
+    @staticmethod
+    def get_slot_name(slot: Callable) -> str:
+        owner = getattr(slot, '__self__', None)
+        slot_name = getattr(slot, '__qualname__', None) or repr(slot)
+        if owner is not None and hasattr(owner, 'objectName') and owner.objectName():
+            return '{0}.{1}'.format(owner.objectName(), getattr(slot, '__name__', slot_name))
+        return slot_name
+
+    def wrap_slot(self, signal_name: str, slot: Callable) -> Callable:
+        histogram = self.histograms.setdefault((signal_name, self.get_slot_name(slot)), LatencyHistogram())
+
+        def wrapped_slot(*args):
+            time_start = time.perf_counter()
+            try:
+                return slot(*args)
+            finally:
+                histogram.record(time.perf_counter() - time_start)
+
+        return wrapped_slot
+
+    def reset(self) -> None:
+        for key in self.histograms:
+            self.histograms[key] = LatencyHistogram()
+
+    def get_report(self) -> List[Dict[str, Any]]:
+        report = []
+        for (signal_name, slot_name), histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            report.append({
+                'signal': signal_name,
+                'slot': slot_name,
+                'count': histogram.count,
+                'total_ms': histogram.total * 1e3,
+                'p50_ms': histogram.percentile(50) * 1e3,
+                'p95_ms': histogram.percentile(95) * 1e3,
+                'p99_ms': histogram.percentile(99) * 1e3,
+                'max_ms': histogram.max * 1e3
+            })
+        # slots blocking the gui thread the longest come first
+        return sorted(report, key=lambda x: -x['total_ms'])
+
+    def get_summary(self) -> str:
+        lines = ['signal profile, {0} slots'.format(len(self.histograms))]
+        for row in self.get_report():
+            lines.append('{0:>8} calls {1:>10.2f} ms total  p50 {2:>8.3f}  p95 {3:>8.3f}  p99 {4:>8.3f}  max {5:>8.3f} ms  {6} -> {7}'.format(
+                row['count'], row['total_ms'], row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms'], row['signal'], row['slot']))
+        return '\n'.join(lines)
@@ -0,0 +1,139 @@
+from typing import Dict, Set, Tuple, Iterable
+
+from common import common
+
+
+class SpatialIndex:
+    # uniform grid hash, every rect is registered in all the cells it overlaps,
+    # rects spanning too many cells are kept aside and checked linearly
+    def __init__(self, cell_size: int = 128, max_cells: int = 256):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.rects: Dict[int, Tuple[int, int, int, int]] = {}  # idx -> (left, right, top, bottom)
+        self.cell_ranges: Dict[int, Tuple[int, int, int, int]] = {}  # idx -> (col_start, col_end, row_start, row_end)
+        self.large_rects: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self.rects
+
+    def get_cell_range(self, left, right, top, bottom) -> Tuple[int, int, int, int]:
+        return (int(min(left, right) // self.cell_size),
+                int(max(left, right) // self.cell_size),
+                int(min(top, bottom) // self.cell_size),
+                int(max(top, bottom) // self.cell_size))
+
+    def is_large(self, cell_range: Tuple[int, int, int, int]) -> bool:
+        col_start, col_end, row_start, row_end = cell_range
+        return (col_end - col_start + 1) * (row_end - row_start + 1) > self.max_cells
+
+    def insert(self, idx: int, left, right, top, bottom) -> None:
+        if idx in self.rects:
+            self.move(idx, left, right, top, bottom)
+            return
+
+        cell_range = self.get_cell_range(left, right, top, bottom)
+        self.rects[idx] = (left, right, top, bottom)
+        self.cell_ranges[idx] = cell_range
+
+        if self.is_large(cell_range):
+            self.large_rects.add(idx)
+            return
+
+        col_start, col_end, row_start, row_end = cell_range
+        for col in range(col_start, col_end + 1):
+            for row in range(row_start, row_end + 1):
+                cell = self.cells.get((col, row))
+                if cell is None:
+                    self.cells[(col, row)] = {idx}
+                else:
+                    cell.add(idx)
+
+    def insert_many(self, rects: Iterable[Tuple[int, int, int, int, int]]) -> None:
+        for idx, left, right, top, bottom in rects:
+            self.insert(idx, left, right, top, bottom)
+
+    def remove(self, idx: int) -> None:
+        if idx not in self.rects:
+            return
+
+        self.rects.pop(idx)
+        cell_range = self.cell_ranges.pop(idx)
+
+        if idx in self.large_rects:
+            self.large_rects.remove(idx)
+            return
+
+        col_start, col_end, row_start, row_end = cell_range
+        for col in range(col_start, col_end + 1):
+            for row in range(row_start, row_end + 1):
+                cell = self.cells.get((col, row))
+                if cell is not None:
+                    cell.discard(idx)
+                    if not cell:
+                        self.cells.pop((col, row))
+
+    def move(self, idx: int, left, right, top, bottom) -> None:
+        if idx not in self.rects:
+            return
+
+        if self.cell_ranges[idx] == self.get_cell_range(left, right, top, bottom):
+            self.rects[idx] = (left, right, top, bottom)
+        else:
+            self.remove(idx)
+            self.insert(idx, left, right, top, bottom)
+
+    def move_many(self, rects: Iterable[Tuple[int, int, int, int, int]]) -> None:
+        # rects staying in the same cells, the common case for small drags, only have their bounds replaced
+        for idx, left, right, top, bottom in rects:
+            if idx not in self.rects:
+                continue
+
+            if self.cell_ranges[idx] == self.get_cell_range(left, right, top, bottom):
+                self.rects[idx] = (left, right, top, bottom)
+            else:
+                self.remove(idx)
+                self.insert(idx, left, right, top, bottom)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.rects.clear()
+        self.cell_ranges.clear()
+        self.large_rects.clear()
+
+    def get_candidates(self, left, right, top, bottom) -> Set[int]:
+        cell_range = self.get_cell_range(left, right, top, bottom)
+        col_start, col_end, row_start, row_end = cell_range
+
+        # the query covers more cells than there are occupied ones, walk the occupied cells instead
+        if (col_end - col_start + 1) * (row_end - row_start + 1) > len(self.cells):
+            candidates = set()
+            for (col, row), cell in self.cells.items():
+                if col_start <= col <= col_end and row_start <= row <= row_end:
+                    candidates.update(cell)
+        else:
+            candidates = set()
+            for col in range(col_start, col_end + 1):
+                for row in range(row_start, row_end + 1):
+                    cell = self.cells.get((col, row))
+                    if cell:
+                        candidates.update(cell)
+
+        candidates.update(self.large_rects)
+        return candidates
+
+    def query_intersect(self, left, right, top, bottom) -> Set[int]:
+        return set(idx for idx in self.get_candidates(left, right, top, bottom)
+                   if common.is_rec_overlapped(left, right, top, bottom, *self.rects[idx]))
+
+    def query_contain(self, left, right, top, bottom) -> Set[int]:
+        return set(idx for idx in self.get_candidates(left, right, top, bottom)
+                   if common.is_rec_a_contain_b(left, right, top, bottom, *self.rects[idx]))
+
+    def query_point(self, x, y) -> Set[int]:
+        return set(idx for idx in self.get_candidates(x, x, y, y)
+                   if common.is_point_a_in_rec_b(x, y, *self.rects[idx]))
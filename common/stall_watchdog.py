@@ -0,0 +1,88 @@
+import collections
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Tuple, Counter, Deque, Any, Optional
+
+from PySide6.QtCore import QTimer
+
+from common import log_manager
+from config import Config
+
+
+class StallWatchdog:
+    # the gui thread heartbeats through a QTimer, a daemon thread samples its stack when the heartbeat is late
+    def __init__(self, frame, logger):
+        self.logger = logger
+
+        self.threshold = Config.Watchdog().stall_threshold / 1000  # second
+        self.sample_interval = Config.Watchdog().sample_interval / 1000  # second
+        self.max_stack_depth = Config.Watchdog().max_stack_depth
+        self.num_top_stacks = Config.Watchdog().num_top_stacks
+
+        self.main_thread_id = threading.get_ident()
+        self.last_heartbeat = time.monotonic()
+
+        self.heartbeat_timer = QTimer(frame)
+        self.heartbeat_timer.setInterval(Config.Watchdog().heartbeat_interval)
+        self.heartbeat_timer.timeout.connect(self.heartbeat)
+
+        self.thread = threading.Thread(target=self.run, name='stall_watchdog', daemon=True)
+        self.stop_event = threading.Event()
+
+        self.stall_start: Optional[float] = None
+        self.stall_samples: Counter[Tuple[str, ...]] = collections.Counter()
+        self.stall_reports: Deque[Dict[str, Any]] = collections.deque(maxlen=Config.Watchdog().num_reports)
+
+    def start(self) -> None:
+        # called once the event loop runs, otherwise the startup itself is reported as a stall
+        self.last_heartbeat = time.monotonic()
+        self.heartbeat_timer.start()
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.heartbeat_timer.stop()
+        self.stop_event.set()
+
+    def heartbeat(self) -> None:
+        self.last_heartbeat = time.monotonic()
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.sample_interval):
+            last_heartbeat = self.last_heartbeat
+            if time.monotonic() - last_heartbeat >= self.threshold:
+                if self.stall_start is None:
+                    self.stall_start = last_heartbeat
+                self.sample()
+            elif self.stall_start is not None:
+                self.report(last_heartbeat - self.stall_start)
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.main_thread_id)  # noqa
+        if frame is None:
+            return
+
+        stack = traceback.extract_stack(frame)[-self.max_stack_depth:]
+        self.stall_samples[tuple('{0}:{1} {2}'.format(f.filename, f.lineno, f.name) for f in stack)] += 1
+
+    def report(self, duration: float) -> None:
+        num_samples = sum(self.stall_samples.values())
+        top_stacks = self.stall_samples.most_common(self.num_top_stacks)
+        self.stall_reports.append({
+            'time': time.time(),
+            'duration_ms': duration * 1e3,
+            'num_samples': num_samples,
+            'top_stacks': [{'count': count, 'stack': list(stack)} for stack, count in top_stacks]
+        })
+
+        lines = ['event loop stalled for {0:.0f} ms, {1} samples'.format(duration * 1e3, num_samples)]
+        for stack, count in top_stacks:
+            lines.append('  {0}/{1} samples in {2}'.format(count, num_samples, stack[-1] if stack else '?'))
+            lines.extend('      {0}'.format(line) for line in reversed(stack))
+        self.logger.warning('\n'.join(lines))
+        log_manager.manager.perf('stall', duration_ms=duration * 1e3, num_samples=num_samples,
+                                 top_frame=top_stacks[0][0][-1] if top_stacks and top_stacks[0][0] else None)
+
+        self.stall_start = None
+        self.stall_samples = collections.Counter()
@@ -0,0 +1,93 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import List, Dict, Tuple, Any
+
+from config import Config
+
+time_origin = time.perf_counter()  # as early as the first import of this module, main.py imports it first
+
+
+class StartupTracer:
+    # collects complete events in the chrome trace format, open the dumped file in chrome://tracing or ui.perfetto.dev
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.is_enabled = Config.Startup().enable_trace
+        self.is_finished = False
+        self.pid = os.getpid()
+
+    @staticmethod
+    def to_us(timestamp: float) -> float:
+        return (timestamp - time_origin) * 1e6
+
+    def begin(self) -> Tuple[float, float]:
+        return time.perf_counter(), time.process_time()
+
+    def end(self, name: str, category: str, start: Tuple[float, float]) -> None:
+        if not self.is_enabled or self.is_finished:
+            return
+
+        wall_start, cpu_start = start
+        wall_end, cpu_end = time.perf_counter(), time.process_time()
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': self.to_us(wall_start),
+            'dur': (wall_end - wall_start) * 1e6,
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': {'cpu_ms': (cpu_end - cpu_start) * 1e3}
+        })
+
+    @contextlib.contextmanager
+    def trace(self, name: str, category: str = 'startup'):
+        start = self.begin()
+        try:
+            yield
+        finally:
+            self.end(name, category, start)
+
+    def instant(self, name: str, category: str = 'startup') -> None:
+        if not self.is_enabled or self.is_finished:
+            return
+
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'i',
+            's': 'p',
+            'ts': self.to_us(time.perf_counter()),
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': {'cpu_ms': time.process_time() * 1e3}
+        })
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+    def get_summary(self) -> str:
+        lines = ['startup trace, {0:.1f} ms until first paint'.format(
+            max((event['ts'] for event in self.events if event['ph'] == 'i'), default=0) / 1e3)]
+        for event in sorted((event for event in self.events if event['ph'] == 'X'), key=lambda x: -x['dur']):
+            lines.append('{0:>10.1f} ms wall {1:>10.1f} ms cpu  [{2}] {3}'.format(
+                event['dur'] / 1e3, event['args']['cpu_ms'], event['cat'], event['name']))
+        return '\n'.join(lines)
+
+    def finish(self, logger, file_path: str) -> None:
+        if not self.is_enabled or self.is_finished:
+            return
+
+        self.is_finished = True
+        try:
+            self.dump(file_path)
+            logger.info('startup trace saved to {0}'.format(file_path))
+        except OSError as e:
+            logger.error('failed to save startup trace: {0}'.format(e))
+        logger.info(self.get_summary())
+
+
+tracer = StartupTracer()
@@ -1,15 +1,17 @@
+import contextlib
 import copy
 import importlib
+import math
 import os
+import time
 import traceback
 from enum import Enum, unique, auto
-from typing import List, Dict, Set, Union, Callable, TypedDict, Optional, Any, cast
+from typing import List, Dict, Set, Tuple, Union, Callable, TypedDict, Optional, Any, cast
 
-import loguru
-from PySide6.QtCore import Signal, Qt, QSize, QPoint, QRect, QPointF, QMimeData
+import shiboken6
+from PySide6.QtCore import Signal, Qt, QSize, QPoint, QRect, QPointF, QMimeData, QTimer
 from PySide6.QtGui import (QImage, QPixmap, QCursor, QKeyEvent, QMouseEvent, QPaintEvent, QFontMetrics, QAction, QContextMenuEvent,
                            QPainter, QResizeEvent, QDragEnterEvent, QDragMoveEvent, QDragLeaveEvent, QDropEvent, QIcon)
-from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWidgets import (QWidget, QPushButton, QTreeWidget, QTreeWidgetItem, QTableWidget, QTabWidget, QCheckBox, QLineEdit,
                                QPlainTextEdit, QHeaderView, QAbstractItemView, QGraphicsItem, QGraphicsScene, QGraphicsView,
                                QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsTextItem, QMenu, QGraphicsRectItem,
@@ -21,7 +23,11 @@ import pipeline
 import widgets
 
 from config import Config
-from common import common, converter
+from common import common, converter, spatial_index, object_store, startup_tracer, signal_profiler, stall_watchdog, log_manager
+
+# resolved once, they are read on every mouse move
+cursor_move_distance_tolerance = Config.Object.SubObject.Click().cursor_move_distance_tolerance
+cursor_press_time_tolerance = Config.Object.SubObject.Click().cursor_press_time_tolerance / 1000  # second
 
 
 ####################################################################################################
@@ -39,10 +45,14 @@ class Frame(QGraphicsView):
     signalDragLeave = Signal(object)
     signalDrop = Signal(object)
     signalResize = Signal(object)
+    signalObjectAdd = Signal(object)
+    signalObjectRemove = Signal(object)
+    signalRender = Signal()
 
     def __init__(self,
                  size: QSize = QSize(1400, 800),
                  is_import_module: bool = False):
+        time_init = startup_tracer.tracer.begin()
         super().__init__()
 
         self.setWindowFlags(
@@ -61,10 +71,30 @@ class Frame(QGraphicsView):
         self.setScene(QGraphicsScene(self.rect()))
         self.resize(size)
 
+        # optional container hosting every object which is not pinned to the frame
+        self.canvas: Optional[QWidget] = None
+        self.canvas_item: Optional[QGraphicsRectItem] = None
+        self.canvas_origin = QPoint()
+        if Config.Render().enable_canvas_container:
+            self.init_canvas()
+
         self.render_data = {}  # idx -> obj, store all the data needed to be rendered
         self.render_idx = 0  # play the role as uuid
+        self.spatial_index = spatial_index.SpatialIndex()  # idx -> global bounding rect, used for hit-testing
+        self.object_store = object_store.ObjectStore()  # parent and ordered children by idx, whole subtrees are removed through it
+        self.pinned_idx: Set[int] = set()  # objects positioned by RelativePos, they follow the frame instead of the canvas
+        self.relative_pos_dependents: Dict[Any, Set[int]] = {}  # ref object -> idx of the objects positioned relative to it
+        self.dirty_idx: Set[int] = set()  # objects to be laid out on the next render
+        self.group_idx: Set[int] = set()  # objects selected by the rubber band, dragged together
+        self.group_index = spatial_index.SpatialIndex()  # top level object idx -> aggregated bounds, prunes queries by whole groups
+        self.dirty_groups: Set['Object'] = set()  # top level objects whose entry in group_index is stale
+        self.handle_overlays: Dict[int, 'GraphicsHandleOverlay'] = {}  # address of the c++ scene -> its handles
+        self.is_viewport_dirty = False  # coordinate offset or frame size changed
+        self.is_offset_dirty = False
         self.widgets = {}
         self.pipeline = {}
+        self.lazy_widgets: Dict[str, Dict[str, Any]] = dict(Config.Plugin().lazy_widgets) if is_import_module else {}
+        self.lazy_shortcuts: Dict[str, Any] = {}  # module name -> stand-in shortcut
         self.cursor_shape_stack = [Qt.CursorShape.ArrowCursor]
 
         self.parent_object = None
@@ -72,40 +102,110 @@ class Frame(QGraphicsView):
 
         self.is_self_moving = False
 
-        self.logger = loguru.logger
-        self.logger.add('log/{0}.log'.format(common.Time().date_and_time2))
+        # input coalescing, callbacks registered during a frame are keyed so that only the latest one runs
+        self.is_coalescing = Config.Input().enable_coalescing
+        self.coalesce_pending: Dict[Any, Callable] = {}
+        self.coalesce_timer = QTimer(self)
+        self.coalesce_timer.setInterval(int(1000 / Config.Input().coalescing_fps))
+        self.coalesce_timer.timeout.connect(self.process_coalesced)
+        self.input_stats = {'received': 0, 'processed': 0, 'total_received': 0, 'total_processed': 0}
+        self.paint_stats = {'count': 0, 'total': 0.0, 'max': 0.0}  # second, time spent painting the viewport
+
+        self.logger = log_manager.manager.setup()
+
+        # slot latency per frame signal, installed before any widget connects
+        self.signal_profiler: Optional[signal_profiler.SignalProfiler] = None
+        if is_import_module and Config.Profile().enable_signal_profiler:
+            self.signal_profiler = signal_profiler.SignalProfiler(self)
+            self.signal_profiler.install()
 
         self.is_import_module = is_import_module
         self.widget_object_manager = None
         self.widget_drag_select = None
         if is_import_module:
-            self.import_modules()
+            with startup_tracer.tracer.trace('Frame.import_modules', 'frame'):
+                self.import_modules()
+            startup_tracer.tracer.end('Frame.__init__', 'frame', time_init)
+
+        self.stall_watchdog: Optional[stall_watchdog.StallWatchdog] = None
+        if is_import_module and Config.Watchdog().enable:
+            self.stall_watchdog = stall_watchdog.StallWatchdog(self, self.logger)
+            QTimer.singleShot(0, self.stall_watchdog.start)
 
     def import_modules(self):
         for module_folder, class_name in zip(['widgets', 'pipeline'], ['Widget', 'Pipeline']):
             for module_filename in os.listdir(module_folder):
                 module_name, ext = os.path.splitext(module_filename)
                 if os.path.isfile(common.join_path(module_folder, module_filename)) and ext == '.py':
-                    importlib.import_module('{0}.{1}'.format(module_folder, module_name))
-                    try:
-                        exec(
-                            'if "{2}" in dir({0}.{1}):\n'
-                            '    module = {0}.{1}.{2}(self)\n'
-                            '    if module.objectName() in self.{0}:\n'
-                            '        self.logger.error("{1} has already been registered")\n'
-                            '    else:\n'
-                            '        self.{0}.update({{module.objectName(): module}})\n'
-                            '        self.logger.success("{1} registration successful")'
-                            .format(module_folder, module_name, class_name))
-                    except Exception as e:
-                        self.logger.error(e)
-                        self.logger.error(traceback.format_exc())
+                    if module_folder == 'widgets' and module_name in self.lazy_widgets:
+                        continue
+                    self.import_module(module_folder, module_name, class_name)
 
         self.widget_object_manager = self.load_widget(self, 'widget_object_manager')
         self.widget_drag_select = self.load_widget(self, 'widget_drag_select')
 
         for _module in [*self.widgets.values(), *self.pipeline.values()]:
-            _module.auto_start()
+            with startup_tracer.tracer.trace('auto_start {0}'.format(_module.objectName()), 'auto_start'):
+                _module.auto_start()
+
+        self.register_lazy_widgets()
+
+    def import_module(self, module_folder: str, module_name: str, class_name: str) -> Optional[QWidget]:
+        try:
+            with startup_tracer.tracer.trace('import {0}.{1}'.format(module_folder, module_name), 'import'):
+                module = importlib.import_module('{0}.{1}'.format(module_folder, module_name))
+            if not hasattr(module, class_name):
+                return None
+
+            with startup_tracer.tracer.trace('init {0}.{1}'.format(module_folder, module_name), 'init'):
+                instance = getattr(module, class_name)(self)
+            registry = getattr(self, module_folder)
+            if instance.objectName() in registry:
+                self.logger.error('{0} has already been registered'.format(module_name))
+            else:
+                registry.update({instance.objectName(): instance})
+                self.logger.success('{0} registration successful'.format(module_name))
+            return instance
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    def register_lazy_widgets(self) -> None:
+        from widgets import widget_shortcut
+
+        _widget_shortcut = self.widgets['widget_shortcut']
+        for module_name, manifest in self.lazy_widgets.items():
+            shortcut = widget_shortcut.Shortcut(widget=_widget_shortcut,
+                                                shortcut_name=manifest['shortcut_name'],
+                                                shortcut_key=manifest['shortcut_key'],
+                                                callback=lambda name=module_name: self.run_lazy_widget(name))
+            if _widget_shortcut.add_shortcut(shortcut):
+                self.lazy_shortcuts.update({module_name: shortcut})
+
+    def activate_lazy_widget(self, module_name: str) -> Optional[QWidget]:
+        if module_name not in self.lazy_widgets:
+            return self.widgets.get(module_name)
+
+        self.lazy_widgets.pop(module_name)
+        # the widget registers the same key itself, so the stand-in shortcut has to go first
+        shortcut = self.lazy_shortcuts.pop(module_name, None)
+        if shortcut:
+            _widget_shortcut = self.widgets['widget_shortcut']
+            _widget_shortcut.disable_shortcut(shortcut)
+            _widget_shortcut.remove_shortcut(shortcut)
+            shortcut.shortcut.deleteLater()
+
+        widget = self.import_module('widgets', module_name, 'Widget')
+        if widget:
+            widget.auto_start()
+        return widget
+
+    def run_lazy_widget(self, module_name: str) -> None:
+        entry_point = self.lazy_widgets[module_name]['entry_point']
+        widget = self.activate_lazy_widget(module_name)
+        if widget:
+            getattr(widget, entry_point)()
 
     def resize(self, arg__1) -> None:
         if isinstance(arg__1, QSize):
@@ -114,12 +214,75 @@ class Frame(QGraphicsView):
             self.logger.error('only support QSize')
         super().resize(arg__1)
 
+    def init_canvas(self) -> None:
+        canvas_size = Config.Render().canvas_container_size
+        self.canvas_origin = QPoint(canvas_size // 2, canvas_size // 2)
+
+        self.canvas = QWidget(self.viewport())
+        self.canvas.setObjectName('canvas')
+        self.canvas.setMouseTracking(True)
+        self.canvas.resize(QSize(canvas_size, canvas_size))
+        self.canvas.show()
+
+        self.canvas_item = QGraphicsRectItem()
+        self.canvas_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemHasNoContents, True)
+        self.scene().addItem(self.canvas_item)
+
+        self.update_canvas_pos()
+
+    def update_canvas_pos(self) -> None:
+        self.canvas.move(self.coordinate_offset - self.canvas_origin - self.viewport().pos())
+        self.canvas_item.setPos(self.coordinate_offset)
+
+    def set_coordinate_offset(self, offset: QPoint) -> None:
+        self.coordinate_offset = QPoint(offset)
+        if self.canvas:
+            self.update_canvas_pos()
+
+        self.is_viewport_dirty = True
+        self.is_offset_dirty = True
+        self.mark_dirty(self)
+
+    def mark_dirty(self, obj: Any) -> None:
+        process_list = [obj]
+        while process_list:
+            _obj = process_list.pop()
+            if _obj is not self:
+                self.dirty_idx.add(_obj.render_idx)
+
+            for idx in self.relative_pos_dependents.get(_obj, ()):
+                if idx not in self.dirty_idx and idx in self.render_data:
+                    process_list.append(self.render_data[idx])
+
+    def request_render(self) -> None:
+        self.signalRender.emit()
+
     def global_pos_to_relative_pos(self, pos: QPoint) -> QPoint:
         return pos + self.coordinate_offset
 
     def relative_pos_to_global_pos(self, pos: QPoint) -> QPoint:
         return pos - self.coordinate_offset
 
+    def global_pos_to_render_pos(self, pos: QPoint) -> QPoint:
+        # position of an object inside its parent widget, either the canvas or the frame
+        if self.canvas:
+            return pos + self.canvas_origin
+        else:
+            return self.global_pos_to_relative_pos(pos)
+
+    def global_pos_to_scene_pos(self, pos: QPoint) -> QPoint:
+        # items of the canvas are children of canvas_item, which already follows coordinate_offset
+        if self.canvas:
+            return QPoint(pos)
+        else:
+            return self.global_pos_to_relative_pos(pos)
+
+    def scene_pos_to_global_pos(self, pos: QPoint) -> QPoint:
+        if self.canvas:
+            return QPoint(pos)
+        else:
+            return self.relative_pos_to_global_pos(pos)
+
     def get_cursor_relative_pos(self) -> QPoint:
         return QPoint(QCursor().pos().x() - self.geometry().x(), QCursor().pos().y() - self.geometry().y())
 
@@ -131,14 +294,25 @@ class Frame(QGraphicsView):
         super().keyPressEvent(event)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
+        self.input_stats['received'] = 0
+        self.input_stats['processed'] = 0
         self.signalMousePress.emit(event)
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        self.signalMouseMove.emit(event)
+        if self.is_coalescing and event.buttons() != Qt.MouseButton.NoButton:
+            mouse_event = self.copy_mouse_event(event)
+            self.coalesce('frame_mouse_move', lambda: self.signalMouseMove.emit(mouse_event))
+        else:
+            self.signalMouseMove.emit(event)
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        self.flush_coalesced()
+        if self.input_stats['received']:
+            self.logger.debug('drag finished, {0} move events received, {1} frames processed'.format(
+                self.input_stats['received'], self.input_stats['processed']))
+            log_manager.manager.perf('drag', received=self.input_stats['received'], processed=self.input_stats['processed'])
         self.signalMouseRelease.emit(event)
         super().mouseReleaseEvent(event)
 
@@ -154,10 +328,62 @@ class Frame(QGraphicsView):
     def dropEvent(self, event: QDropEvent) -> None:
         self.signalDrop.emit(event)
 
+    def paintEvent(self, event: QPaintEvent) -> None:
+        time_start = time.perf_counter()
+        super().paintEvent(event)
+        duration = time.perf_counter() - time_start
+        self.paint_stats['count'] += 1
+        self.paint_stats['total'] += duration
+        if duration > self.paint_stats['max']:
+            self.paint_stats['max'] = duration
+
+        if self.is_import_module and not startup_tracer.tracer.is_finished:
+            startup_tracer.tracer.instant('first paint')
+            startup_tracer.tracer.finish(self.logger, 'log/startup_trace_{0}.json'.format(common.Time().date_and_time2))
+            if startup_tracer.tracer.is_finished:
+                log_manager.manager.perf('startup', first_paint_ms=startup_tracer.tracer.to_us(time.perf_counter()) / 1e3)
+
     def resizeEvent(self, event: QResizeEvent) -> None:
+        self.is_viewport_dirty = True
+        self.mark_dirty(self)
         self.signalResize.emit(event)
         super().resizeEvent(event)
 
+    @staticmethod
+    def copy_mouse_event(event: QMouseEvent) -> QMouseEvent:
+        # the original event is destroyed once the handler returns
+        return QMouseEvent(event.type(), event.position(), event.scenePosition(), event.globalPosition(),
+                           event.button(), event.buttons(), event.modifiers())
+
+    def coalesce(self, key: Any, callback: Callable) -> None:
+        self.input_stats['received'] += 1
+        self.input_stats['total_received'] += 1
+
+        if not self.is_coalescing:
+            callback()
+            return
+
+        self.coalesce_pending[key] = callback
+        if not self.coalesce_timer.isActive():
+            self.coalesce_timer.start()
+
+    def process_coalesced(self) -> None:
+        if not self.coalesce_pending:
+            self.coalesce_timer.stop()
+            return
+
+        self.input_stats['processed'] += 1
+        self.input_stats['total_processed'] += 1
+
+        pending, self.coalesce_pending = self.coalesce_pending, {}
+        for callback in pending.values():
+            callback()
+
+    def flush_coalesced(self) -> None:
+        if self.coalesce_pending:
+            self.process_coalesced()
+        self.coalesce_timer.stop()
+
     def add_cursor_shape(self, cursor_shape: Qt.CursorShape) -> None:
         self.cursor_shape_stack.append(cursor_shape)
         self.setCursor(self.cursor_shape_stack[-1])
@@ -173,30 +399,157 @@ class Frame(QGraphicsView):
         else:
             self.widget_object_manager.add_to_render_data(obj)
             self.children_objects.add(obj)
+            self.dirty_groups.add(obj)
             return obj
 
+    def add_objects(self, objs: List['Object']) -> List['Object']:
+        objs = [obj for obj in objs if obj not in self.children_objects]
+
+        with self.updates_disabled():
+            self.widget_object_manager.add_to_render_data_batch(objs)
+            self.children_objects.update(objs)
+            self.dirty_groups.update(objs)
+
+        return objs
+
     def remove_object(self, obj: 'Object') -> None:
         if obj in self.children_objects:
             self.children_objects.remove(obj)
+            self.group_index.remove(obj.render_idx)
+            self.dirty_groups.discard(obj)
             self.widget_object_manager.remove_from_render_data(obj)
         else:
             self.logger.error('failed to remove object, render_idx = {0}'.format(obj.render_idx))
 
     def remove_all_objects(self) -> None:
-        for obj in self.children_objects:
-            obj.remove_all_objects()
+        # newest first, every child takes its whole subtree along
+        for obj in reversed(self.get_children(self)):
+            self.remove_object(obj)
+
+    def get_group(self) -> List[Any]:
+        # members unselected or removed since the selection drop out here
+        group = []
+        for idx in list(self.group_idx):
+            obj = self.render_data.get(idx)
+            if obj is None:
+                self.group_idx.discard(idx)
+            elif (obj.state.get('is_select') if isinstance(obj, ObjectRecord) else getattr(obj, 'is_select', False)) and not obj.relative_pos:
+                group.append(obj)
+            else:
+                self.group_idx.discard(idx)
+        return group
+
+    def move_objects(self, objs: List[Any], offset_x: int, offset_y: int) -> None:
+        # the whole group is moved in one pass and laid out by a single render, the frame repaints once
+        if not objs or not (offset_x or offset_y):
+            return
+
+        rects = []
+        with self.updates_disabled():
+            for obj in objs:
+                if obj.relative_pos:
+                    # pinned, its position is kept relative to the frame or to another object
+                    obj.update_global_pos(QPoint(obj.global_pos.x() + offset_x, obj.global_pos.y() + offset_y))
+                    continue
+
+                common.assign_point(obj.global_pos, obj.global_pos.x() + offset_x, obj.global_pos.y() + offset_y)
+                obj.global_pos_left, obj.global_pos_top = obj.global_pos.toTuple()
+                obj.global_pos_right = obj.global_pos_left + obj.width()
+                obj.global_pos_bottom = obj.global_pos_top + obj.height()
+                rects.append((obj.render_idx, obj.global_pos_left, obj.global_pos_right, obj.global_pos_top, obj.global_pos_bottom))
+
+                # stops at the first ancestor already marked, every parent chain is walked once for the whole group
+                mark_bounds_dirty(obj)
+                self.mark_dirty(obj)
+
+            self.spatial_index.move_many(rects)
+            self.request_render()
+
+    def get_children(self, obj: Any) -> List[Any]:
+        # children in the order they were added, which is also their stacking order as nothing raises objects
+        idx = object_store.root_idx if obj is self else obj.render_idx
+        return [self.render_data[_idx] for _idx in self.object_store.get_children(idx)]
+
+    def refresh_group_index(self) -> None:
+        # bounds are recomputed lazily, only for the groups touched since the last query
+        for obj in self.dirty_groups:
+            if obj.render_idx not in self.render_data:
+                continue
+
+            left, right, top, bottom = get_bounds(obj)
+            self.group_index.insert(obj.render_idx,
+                                    min(left, obj.global_pos_left), max(right, obj.global_pos_right),
+                                    min(top, obj.global_pos_top), max(bottom, obj.global_pos_bottom))
+        self.dirty_groups.clear()
+
+    def clip_to_groups(self, left, right, top, bottom) -> Optional[Tuple[int, int, int, int]]:
+        # part of the rect covered by some group, None when it misses every group
+        group_idx = self.group_index.query_intersect(left, right, top, bottom)
+        if not group_idx:
+            return None
+
+        rects = [self.group_index.rects[idx] for idx in group_idx]
+        return (max(left, min(rect[0] for rect in rects)), min(right, max(rect[1] for rect in rects)),
+                max(top, min(rect[2] for rect in rects)), min(bottom, max(rect[3] for rect in rects)))
+
+    def query_point(self, x, y) -> Set[int]:
+        self.refresh_group_index()
+        if not self.group_index.query_point(x, y):
+            return set()
+        return self.spatial_index.query_point(x, y)
+
+    def query_intersect(self, left, right, top, bottom) -> Set[int]:
+        # anything intersecting the rect lies in a group intersecting it, the object lookup only covers those groups
+        self.refresh_group_index()
+        rect = self.clip_to_groups(left, right, top, bottom)
+        return self.spatial_index.query_intersect(*rect) if rect else set()
+
+    def query_contain(self, left, right, top, bottom) -> Set[int]:
+        self.refresh_group_index()
+        rect = self.clip_to_groups(left, right, top, bottom)
+        return self.spatial_index.query_contain(*rect) if rect else set()
+
+    def fit_to_view(self, bounds: Tuple[float, float, float, float], margin: int = 20) -> None:
+        # centers the bounds, or puts their top left corner at the margin when they do not fit
+        left, right, top, bottom = bounds
+        if left > right or top > bottom:
+            return
+
+        width, height = self.viewport().width(), self.viewport().height()
+        offset_x = (width - (right - left)) // 2 - left if right - left + 2 * margin <= width else margin - left
+        offset_y = (height - (bottom - top)) // 2 - top if bottom - top + 2 * margin <= height else margin - top
+        self.set_coordinate_offset(QPoint(int(offset_x), int(offset_y)))
+        self.request_render()
+
+    @contextlib.contextmanager
+    def updates_disabled(self):
+        # nested batches are merged into the outermost one
+        if not self.updatesEnabled():
+            yield
+            return
+
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
 
     def load_widget(self, this_widget: QWidget, target_widget: str) -> Optional[QWidget]:
         if self.is_import_module:
             if target_widget in self.widgets:
                 return self.widgets[target_widget]
+            elif target_widget in self.lazy_widgets:
+                return self.activate_lazy_widget(target_widget)
             else:
                 self.logger.error('{0}: cannot find widget [{1}]'.format(this_widget.objectName(), target_widget))
                 return None
         else:
             self.logger.warning('this frame does not manage the widgets')
 
-    def generate_webview(self) -> QWebEngineView:
+    def generate_webview(self) -> 'QWebEngineView':
+        # deferred, the web engine is only needed by the terminal and costs a lot to import
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+
         return QWebEngineView(self)
 
 
@@ -205,10 +558,70 @@ class Frame(QGraphicsView):
 ####################################################################################################
 
 
+empty_bounds = (math.inf, -math.inf, math.inf, -math.inf)  # (left, right, top, bottom), contained in any bounds
+
+
+def get_bounds(obj) -> Tuple[float, float, float, float]:
+    # global bounds of an object and everything below it, only recomputed after an edge may have moved inwards
+    if obj.is_bounds_dirty:
+        left, right, top, bottom = obj.get_own_bounds()
+        for child in obj.children_objects:
+            child_left, child_right, child_top, child_bottom = get_bounds(child)
+            left, right = min(left, child_left), max(right, child_right)
+            top, bottom = min(top, child_top), max(bottom, child_bottom)
+        obj.bounds = (left, right, top, bottom)
+        obj.is_bounds_dirty = False
+    return obj.bounds
+
+
+def mark_bounds_dirty(obj) -> None:
+    # a dirty object always has dirty ancestors, so the walk stops at the first one already dirty
+    while obj is not None and not isinstance(obj, Frame) and not obj.is_bounds_dirty:
+        obj.is_bounds_dirty = True
+        parent_object = obj.parent_object
+        if isinstance(parent_object, Frame):
+            parent_object.dirty_groups.add(obj)
+            return
+        if parent_object is None or obj not in parent_object.children_objects:
+            return
+        obj = parent_object
+
+
+def update_bounds(obj, old_bounds: Tuple[float, float, float, float], new_bounds: Tuple[float, float, float, float]) -> None:
+    # a part of obj, its own area or a child, went from old_bounds to new_bounds, growth is carried up the parent chain
+    while not obj.is_bounds_dirty:
+        left, right, top, bottom = obj.bounds
+        old_left, old_right, old_top, old_bottom = old_bounds
+        new_left, new_right, new_top, new_bottom = new_bounds
+
+        is_on_edge = old_left <= left or old_right >= right or old_top <= top or old_bottom >= bottom
+        is_growing = new_left <= old_left and new_right >= old_right and new_top <= old_top and new_bottom >= old_bottom
+        if is_on_edge and not is_growing:
+            mark_bounds_dirty(obj)
+            return
+
+        bounds = (min(left, new_left), max(right, new_right), min(top, new_top), max(bottom, new_bottom))
+        if bounds == obj.bounds:
+            return
+        old_bounds, new_bounds = obj.bounds, bounds
+        obj.bounds = bounds
+
+        parent_object = obj.parent_object
+        if isinstance(parent_object, Frame):
+            parent_object.dirty_groups.add(obj)
+            return
+        if parent_object is None or obj not in parent_object.children_objects:
+            return
+        obj = parent_object
+
+
 class RelativePos:
-    def __init__(self, ref: Callable, relative_pos: QPoint):
+    __slots__ = ('ref', 'relative_pos', 'ref_object')
+
+    def __init__(self, ref: Callable, relative_pos: QPoint, ref_object: Any = None):
         self.ref = ref
         self.relative_pos = relative_pos
+        self.ref_object = ref_object  # the object read by ref, the frame if None
 
     def get_global_pos(self) -> QPoint:
         return self.ref() + self.relative_pos
@@ -240,6 +653,8 @@ class RenderType(Enum):
 
 
 class RenderData:
+    __slots__ = ('content', 'render_type')
+
     def __init__(self, content, render_type: RenderType):
         self.content = content
         self.render_type = render_type
@@ -263,9 +678,21 @@ class SubObjectMenu(QMenu):
             menu=self,
             text='Change Size',
             func=Func('Change Size',
-                      click_func=lambda: (self.sub_obj.bounding_rect.hide()
-                                          if self.sub_obj.bounding_rect.isVisible()
-                                          else self.sub_obj.bounding_rect.show()))
+                      click_func=lambda: self.sub_obj.toggle_bounding_rect())
+        ))
+
+        self.addAction(Action(
+            menu=self,
+            text='Select Group',
+            func=Func('Select Group',
+                      click_func=lambda: self.select_group())
+        ))
+
+        self.addAction(Action(
+            menu=self,
+            text='Fit Group to View',
+            func=Func('Fit Group to View',
+                      click_func=lambda: self.sub_obj.frame.fit_to_view(get_bounds(self.get_group())))
         ))
 
         self.addAction(Action(
@@ -275,6 +702,25 @@ class SubObjectMenu(QMenu):
                       click_func=lambda: self.sub_obj.deleteLater())
         ))
 
+    def get_group(self) -> 'Object':
+        obj = self.sub_obj
+        while not isinstance(obj, Object):
+            obj = obj.parent_object
+        return obj
+
+    def select_group(self) -> None:
+        process_list = list(self.get_group().children_objects)
+        while process_list:
+            obj = process_list.pop()
+            # only the selection state changes, a click would also run func_select, e.g. close or connect buttons
+            if isinstance(obj, ObjectRecord):
+                if obj.kwargs.get('is_changeable', True) and obj.state.get('is_select') is False:
+                    obj.state['is_select'] = True
+            elif isinstance(obj, PushButton) and obj.is_changeable and not obj.is_select:
+                obj.is_select = True
+                obj.set_style_sheet(True)
+            process_list.extend(obj.children_objects)
+
 
 class SubObject:
     def __init__(self,
@@ -288,7 +734,9 @@ class SubObject:
 
         self.render_idx = None
         self.is_show = True
+        self.is_culled = False
         self.is_delete = False
+        self.is_virtualizable = False  # only objects nobody else keeps a reference to may be virtualized
 
         if size:
             self.resize(size)  # type: ignore
@@ -296,44 +744,39 @@ class SubObject:
         self.global_pos = QPoint()
         self.relative_pos = None
         if isinstance(pos, QPoint):
-            self.global_pos: QPoint = pos
+            self.global_pos: QPoint = QPoint(pos)  # owned copy, it is updated in place afterwards
         elif isinstance(pos, RelativePos):
             self.relative_pos: RelativePos = pos
         else:
             self.frame.logger.error('unrecognized pos type: {}'.format(type(pos)))
             return
 
+        if self.frame.canvas and not self.relative_pos:
+            self.setParent(self.frame.canvas)  # type: ignore
+
         self.is_self_moving = common.ToggleBool()
-        self.bounding_rect = GraphicsRectItem(frame=self.frame,
-                                              scene=self.frame.scene(),
-                                              rect=QRect(),
-                                              selectable=True,
-                                              movable=True,
-                                              accept_hover=True,
-                                              enable_handle=True)
-        self.bounding_rect.handle_top_left.signalPositionChange.connect(lambda x: self.on_handle_move())
-        self.bounding_rect.handle_top_right.signalPositionChange.connect(lambda x: self.on_handle_move())
-        self.bounding_rect.handle_bottom_left.signalPositionChange.connect(lambda x: self.on_handle_move())
-        self.bounding_rect.handle_bottom_right.signalPositionChange.connect(lambda x: self.on_handle_move())
-        self.bounding_rect.hide()
-
-        self.menu = SubObjectMenu(self)
 
-        self.move_and_show()
+        # most objects are never resized or right clicked, the chrome is built on first use
+        self.bounding_rect: Optional[GraphicsRectItem] = None
+        self.menu: Optional[SubObjectMenu] = None
+
+        self.global_pos_left = self.global_pos_right = self.global_pos_top = self.global_pos_bottom = 0
+        self.bounds = empty_bounds  # aggregated with the children, read through get_bounds
+        self.is_bounds_dirty = True
 
-        self.global_pos_left = self.global_pos.x()
-        self.global_pos_right = self.global_pos.x() + self.width()  # type: ignore
-        self.global_pos_top = self.global_pos.y()
-        self.global_pos_bottom = self.global_pos.y() + self.height()  # type: ignore
+        self.move_and_show()
+        self.update_global_pos_bounds()
 
     def deleteLater(self) -> None:  # noqa
         if self.is_delete:
             return
         else:
             self.is_delete = True
-            self.bounding_rect.deleteLater()
-            self.frame.scene().removeItem(self.bounding_rect)
-            self.parent_object.remove_object(self)
+            if self.bounding_rect:
+                self.bounding_rect.deleteLater()
+            # already detached when the removal came from the parent through remove_from_render_data
+            if self in self.parent_object.children_objects:
+                self.parent_object.remove_object(self)
             super().deleteLater()
 
     def reset(self) -> None:
@@ -349,16 +792,18 @@ class SubObject:
         pass
 
     def move_and_show(self) -> None:
+        self.is_culled = False
         with self.is_self_moving:
             if self.relative_pos:
                 new_pos = self.relative_pos.get_global_pos()
                 self.global_pos = new_pos
+                self.update_global_pos_bounds()
+                scene_pos = new_pos
             else:
-                new_pos = self.global_pos + self.frame.coordinate_offset
+                new_pos = self.frame.global_pos_to_render_pos(self.global_pos)
+                scene_pos = self.frame.global_pos_to_scene_pos(self.global_pos)
             self.move(new_pos)  # type: ignore
-            self.bounding_rect.update_all_pos(top_left=QPoint(new_pos.x() - 2, new_pos.y() - 2),
-                                              bottom_right=QPoint(new_pos.x() + self.width() + 2,  # type: ignore
-                                                                  new_pos.y() + self.height() + 2))  # type: ignore
+            self.update_bounding_rect(scene_pos)
 
             if self.is_show:
                 self.show()
@@ -372,53 +817,159 @@ class SubObject:
     def hide(self) -> None:
         super().hide()
         self.is_show = False
-        self.bounding_rect.hide()
+        if self.bounding_rect:
+            self.bounding_rect.hide()
+
+    def cull(self) -> None:
+        # out of the viewport, is_show is kept so that move_and_show brings it back as it was
+        self.is_culled = True
+        self.setVisible(False)  # type: ignore
+        if self.bounding_rect:
+            self.bounding_rect.hide()
+
+    def create_bounding_rect(self) -> 'GraphicsRectItem':
+        if self.bounding_rect is None:
+            self.bounding_rect = GraphicsRectItem(frame=self.frame,
+                                                  scene=self.frame.scene(),
+                                                  rect=QRect(),
+                                                  selectable=True,
+                                                  movable=True,
+                                                  accept_hover=True,
+                                                  enable_handle=True)
+            if self.frame.canvas and not self.relative_pos:
+                self.bounding_rect.set_parent_item(self.frame.canvas_item)
+            self.bounding_rect.hide()
+
+            with self.is_self_moving:
+                self.update_bounding_rect(self.global_pos if self.relative_pos else self.frame.global_pos_to_scene_pos(self.global_pos))
+
+            self.bounding_rect.handle_move_callback = self.on_handle_move
+
+        return self.bounding_rect
+
+    def update_bounding_rect(self, scene_pos: QPoint) -> None:
+        if self.bounding_rect:
+            self.bounding_rect.update_all_pos(top_left=QPoint(scene_pos.x() - 2, scene_pos.y() - 2),
+                                              bottom_right=QPoint(scene_pos.x() + self.width() + 2,  # type: ignore
+                                                                  scene_pos.y() + self.height() + 2))  # type: ignore
+
+    def toggle_bounding_rect(self) -> None:
+        bounding_rect = self.create_bounding_rect()
+        if bounding_rect.isVisible():
+            bounding_rect.hide()
+        else:
+            bounding_rect.show()
+
+    def create_menu(self) -> 'SubObjectMenu':
+        return SubObjectMenu(self)
+
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        # arguments, besides obj and pos, needed to rebuild the object from an ObjectRecord
+        return {}
+
+    def get_record_state(self) -> Dict[str, Any]:
+        # attributes restored after the object is rebuilt from an ObjectRecord
+        return {}
+
+    def restore_record_state(self) -> None:
+        # called once the attributes of get_record_state are back, for the content that has to be rebuilt from them
+        pass
+
+    def dematerialize(self) -> 'ObjectRecord':
+        record = ObjectRecord(self)
+
+        self.is_delete = True
+        if self.bounding_rect:
+            self.bounding_rect.deleteLater()
+        super().deleteLater()
+
+        return record
 
     def add_object(self, obj: Union['SubObject', 'EmbeddedObject', 'Object']) -> Any:
         if obj in self.children_objects:
             self.frame.logger.error('object is already here, render_idx = {0}'.format(obj.render_idx))
             return None
         else:
+            obj.parent_object = self
             self.frame.widget_object_manager.add_to_render_data(obj)
             self.children_objects.add(obj)
-            obj.parent_object = self
+            update_bounds(self, empty_bounds, get_bounds(obj))
 
             return obj
 
+    def add_objects(self, objs: List[Union['SubObject', 'EmbeddedObject', 'Object']]) -> List[Union['SubObject', 'EmbeddedObject', 'Object']]:
+        objs = [obj for obj in objs if obj not in self.children_objects]
+
+        with self.frame.updates_disabled():
+            for obj in objs:
+                obj.parent_object = self
+            self.frame.widget_object_manager.add_to_render_data_batch(objs)
+            self.children_objects.update(objs)
+            for obj in objs:
+                update_bounds(self, empty_bounds, get_bounds(obj))
+
+        return objs
+
     def remove_object(self, obj: Union['SubObject', 'EmbeddedObject', 'Object']) -> None:
         if obj in self.children_objects:
             self.children_objects.remove(obj)
+            update_bounds(self, get_bounds(obj), empty_bounds)
             self.frame.widget_object_manager.remove_from_render_data(obj)
         else:
             self.frame.logger.error('failed to remove object, render_idx = {0}'.format(obj.render_idx))
 
     def remove_all_objects(self) -> None:
-        for obj in self.children_objects:
-            obj.remove_all_objects()
+        # newest first, every child takes its whole subtree along
+        for obj in reversed(self.frame.get_children(self)):
+            self.remove_object(obj)
 
     def contextMenuEvent(self, event: QContextMenuEvent) -> None:  # noqa
+        if self.menu is None:
+            self.menu = self.create_menu()
         self.menu.exec(event.globalPos())
         super().contextMenuEvent(event)
 
     def on_handle_move(self) -> None:
         if not self.frame.is_self_moving and not self.is_self_moving:
-            new_pos = self.bounding_rect.pos_handle_top_left + QPoint(2, 2)
-            self.update_global_pos(self.frame.relative_pos_to_global_pos(new_pos))
+            scene_pos = self.bounding_rect.pos_handle_top_left + QPoint(2, 2)
+            self.update_global_pos(self.frame.scene_pos_to_global_pos(scene_pos))
 
-            self.move(new_pos)  # type: ignore
+            self.move(self.frame.global_pos_to_render_pos(self.global_pos))  # type: ignore
             self.resize_bounding_rect(self.bounding_rect.rect().size().toSize() - QSize(2, 2))
+            self.update_global_pos_bounds()
 
     def resize_bounding_rect(self, size: QSize) -> None:
         self.resize(size)  # type: ignore
+        if self.render_idx is not None:
+            self.frame.mark_dirty(self)
 
     def update_global_pos(self, global_pos) -> None:
-        self.global_pos = copy.deepcopy(global_pos)
+        common.assign_point(self.global_pos, global_pos.x(), global_pos.y())
         if self.relative_pos:
             self.relative_pos.update_relative_pos(self.global_pos)
 
-        self.global_pos_left, self.global_pos_top = self.global_pos.toTuple()
+        self.update_global_pos_bounds()
+        if self.render_idx is not None:
+            self.frame.mark_dirty(self)
+
+    def update_global_pos_bounds(self) -> None:
+        # bounds are always kept in global coordinates, objects pinned by RelativePos live in frame coordinates
+        old_bounds = self.get_own_bounds()
+        if self.relative_pos:
+            self.global_pos_left, self.global_pos_top = self.frame.relative_pos_to_global_pos(self.global_pos).toTuple()
+        else:
+            self.global_pos_left, self.global_pos_top = self.global_pos.toTuple()
         self.global_pos_right = self.global_pos_left + self.width()  # type: ignore
         self.global_pos_bottom = self.global_pos_top + self.height()  # type: ignore
+        update_bounds(self, old_bounds, self.get_own_bounds())
+
+        if self.render_idx is not None:
+            self.frame.spatial_index.move(self.render_idx,
+                                          self.global_pos_left, self.global_pos_right,
+                                          self.global_pos_top, self.global_pos_bottom)
+
+    def get_own_bounds(self) -> Tuple[float, float, float, float]:
+        return self.global_pos_left, self.global_pos_right, self.global_pos_top, self.global_pos_bottom
 
 
 class EmbeddedObject:
@@ -434,15 +985,24 @@ class EmbeddedObject:
         self.is_show = True
         self.is_delete = False
 
+        self.bounds = empty_bounds
+        self.is_bounds_dirty = True
+
         if size:
             self.resize(size)  # type: ignore
 
+    @staticmethod
+    def get_own_bounds() -> Tuple[float, float, float, float]:
+        # laid out by the widget embedding it, only its children count
+        return empty_bounds
+
     def deleteLater(self) -> None:  # noqa
         if self.is_delete:
             return
         else:
             self.is_delete = True
-            self.parent_object.remove_object(self)
+            if self in self.parent_object.children_objects:
+                self.parent_object.remove_object(self)
             super().deleteLater()
 
     def add_object(self, obj: Union[SubObject, 'EmbeddedObject', 'Object']) -> Any:
@@ -450,22 +1010,138 @@ class EmbeddedObject:
             self.frame.logger.error('object is already here, render_idx = {0}'.format(obj.render_idx))
             return None
         else:
+            obj.parent_object = self
             self.frame.widget_object_manager.add_to_render_data(obj)
             self.children_objects.add(obj)
-            obj.parent_object = self
+            update_bounds(self, empty_bounds, get_bounds(obj))
 
             return obj
 
+    def add_objects(self, objs: List[Union[SubObject, 'EmbeddedObject', 'Object']]) -> List[Union[SubObject, 'EmbeddedObject', 'Object']]:
+        objs = [obj for obj in objs if obj not in self.children_objects]
+
+        with self.frame.updates_disabled():
+            for obj in objs:
+                obj.parent_object = self
+            self.frame.widget_object_manager.add_to_render_data_batch(objs)
+            self.children_objects.update(objs)
+            for obj in objs:
+                update_bounds(self, empty_bounds, get_bounds(obj))
+
+        return objs
+
     def remove_object(self, obj: Union[SubObject, 'EmbeddedObject', 'Object']) -> None:
         if obj in self.children_objects:
             self.children_objects.remove(obj)
+            update_bounds(self, get_bounds(obj), empty_bounds)
             self.frame.widget_object_manager.remove_from_render_data(obj)
         else:
             self.frame.logger.error('failed to remove object, render_idx = {0}'.format(obj.render_idx))
 
     def remove_all_objects(self) -> None:
-        for obj in self.children_objects:
-            obj.remove_all_objects()
+        # newest first, every child takes its whole subtree along
+        for obj in reversed(self.frame.get_children(self)):
+            self.remove_object(obj)
+
+
+class ObjectRecord:
+    # lightweight stand-in for a virtualized SubObject, keeps what is needed to rebuild it
+    def __init__(self, obj: SubObject):
+        self.frame: Frame = obj.frame
+
+        self.parent_object = obj.parent_object
+        self.children_objects: Set[Union[SubObject, EmbeddedObject]] = set()
+
+        self.cls = type(obj)
+        self.object_name = obj.objectName()  # type: ignore
+        self.kwargs = obj.get_record_kwargs()
+        self.state = obj.get_record_state()
+
+        self.render_idx = obj.render_idx
+        self.global_pos = QPoint(obj.global_pos)
+        self.relative_pos = None
+        self.size = obj.size()  # type: ignore
+        self.global_pos_left = obj.global_pos_left
+        self.global_pos_right = obj.global_pos_right
+        self.global_pos_top = obj.global_pos_top
+        self.global_pos_bottom = obj.global_pos_bottom
+        self.bounds = empty_bounds
+        self.is_bounds_dirty = True
+
+        self.is_show = obj.is_show
+        self.is_culled = True
+        self.is_delete = False
+        self.is_virtualizable = True
+
+    def materialize(self) -> SubObject:
+        obj = self.cls(obj=self.parent_object, pos=QPoint(self.global_pos), **self.kwargs)
+        obj.is_virtualizable = True
+        for key, value in self.state.items():
+            setattr(obj, key, value)
+        obj.restore_record_state()
+        if 'is_select' in self.state:
+            obj.set_style_sheet(obj.is_select)
+        obj.is_show = self.is_show
+
+        return obj
+
+    def objectName(self) -> str:  # noqa
+        return self.object_name
+
+    def width(self) -> int:
+        return self.size.width()
+
+    def height(self) -> int:
+        return self.size.height()
+
+    def deleteLater(self) -> None:  # noqa
+        if self.is_delete:
+            return
+        else:
+            self.is_delete = True
+            if self in self.parent_object.children_objects:
+                self.parent_object.remove_object(self)
+
+    def reset(self) -> None:
+        pass
+
+    def move_and_show(self) -> None:
+        pass
+
+    def cull(self) -> None:
+        pass
+
+    def click(self) -> None:
+        if 'is_select' in self.state:
+            self.state['is_select'] = not self.state['is_select']
+
+    def pseudo_click(self) -> None:
+        pass
+
+    def reset_pseudo_click(self) -> None:
+        pass
+
+    def remove_all_objects(self) -> None:
+        pass
+
+    def get_own_bounds(self) -> Tuple[float, float, float, float]:
+        return self.global_pos_left, self.global_pos_right, self.global_pos_top, self.global_pos_bottom
+
+    def update_global_pos(self, global_pos) -> None:
+        common.assign_point(self.global_pos, global_pos.x(), global_pos.y())
+        self.update_global_pos_bounds()
+        self.frame.mark_dirty(self)
+
+    def update_global_pos_bounds(self) -> None:
+        old_bounds = self.get_own_bounds()
+        self.global_pos_left, self.global_pos_top = self.global_pos.toTuple()
+        self.global_pos_right = self.global_pos_left + self.size.width()
+        self.global_pos_bottom = self.global_pos_top + self.size.height()
+        update_bounds(self, old_bounds, self.get_own_bounds())
+
+        self.frame.spatial_index.move(self.render_idx,
+                                      self.global_pos_left, self.global_pos_right,
+                                      self.global_pos_top, self.global_pos_bottom)
 
 
 class Object(QWidget):
@@ -481,8 +1157,10 @@ class Object(QWidget):
 
         self.mime = QMimeData()
 
+        self.global_pos = QPoint()
+        self.relative_pos = None
         if isinstance(pos, QPoint):
-            self.global_pos: QPoint = pos
+            self.global_pos: QPoint = QPoint(pos)
         elif isinstance(pos, RelativePos):
             self.relative_pos: RelativePos = pos
         else:
@@ -497,10 +1175,10 @@ class Object(QWidget):
         self.parent_object = frame
         self.children_objects: Set[Union['SubObject', 'EmbeddedObject']] = set()
 
-        self.global_pos_left = self.global_pos.x()
-        self.global_pos_right = self.global_pos.x()
-        self.global_pos_top = self.global_pos.y()
-        self.global_pos_bottom = self.global_pos.y()
+        self.global_pos_left = self.global_pos_right = self.global_pos_top = self.global_pos_bottom = 0
+        self.bounds = empty_bounds  # union of the children, a whole group can be pruned or fitted with a single test
+        self.is_bounds_dirty = True
+        self.update_global_pos_bounds()
 
     def deleteLater(self) -> None:
         if self.is_delete:
@@ -516,6 +1194,9 @@ class Object(QWidget):
     def move_and_show(self) -> None:
         pass
 
+    def cull(self) -> None:
+        pass
+
     def click(self) -> None:
         pass
 
@@ -530,31 +1211,62 @@ class Object(QWidget):
             self.frame.logger.error('object is already here, render_idx = {0}'.format(obj.render_idx))
             return None
         else:
+            obj.parent_object = self
             self.frame.widget_object_manager.add_to_render_data(obj)
             self.children_objects.add(obj)
-            obj.parent_object = self
+            update_bounds(self, empty_bounds, get_bounds(obj))
 
             return obj
 
+    def add_objects(self, objs: List[Union[SubObject, EmbeddedObject, 'Object']]) -> List[Union[SubObject, EmbeddedObject, 'Object']]:
+        objs = [obj for obj in objs if obj not in self.children_objects]
+
+        with self.frame.updates_disabled():
+            for obj in objs:
+                obj.parent_object = self
+            self.frame.widget_object_manager.add_to_render_data_batch(objs)
+            self.children_objects.update(objs)
+            for obj in objs:
+                update_bounds(self, empty_bounds, get_bounds(obj))
+
+        return objs
+
     def remove_object(self, obj: Union[SubObject, EmbeddedObject, 'Object']) -> None:
         if obj in self.children_objects:
             self.children_objects.remove(obj)
+            update_bounds(self, get_bounds(obj), empty_bounds)
             self.frame.widget_object_manager.remove_from_render_data(obj)
         else:
             self.frame.logger.error('failed to remove widget, render_idx = {0}'.format(obj.render_idx))
 
     def remove_all_objects(self) -> None:
-        for obj in self.children_objects:
-            obj.remove_all_objects()
+        # newest first, every child takes its whole subtree along
+        for obj in reversed(self.frame.get_children(self)):
+            self.remove_object(obj)
 
     def update_global_pos(self, global_pos) -> None:
-        self.global_pos = copy.deepcopy(global_pos)
+        common.assign_point(self.global_pos, global_pos.x(), global_pos.y())
         if self.relative_pos:
             self.relative_pos.update_relative_pos(self.global_pos)
 
-        self.global_pos_left, self.global_pos_top = self.global_pos.toTuple()
-        self.global_pos_right = self.global_pos_left + self.width()  # type: ignore
-        self.global_pos_bottom = self.global_pos_top + self.height()  # type: ignore
+        self.update_global_pos_bounds()
+        if self.render_idx in self.frame.render_data:
+            self.frame.mark_dirty(self)
+
+    @staticmethod
+    def get_own_bounds() -> Tuple[float, float, float, float]:
+        return empty_bounds
+
+    def update_global_pos_bounds(self) -> None:
+        # the object itself is only a container, it occupies no area
+        self.global_pos_left = self.global_pos_right = self.global_pos.x()
+        self.global_pos_top = self.global_pos_bottom = self.global_pos.y()
+
+        if self.render_idx in self.frame.render_data:
+            self.frame.spatial_index.move(self.render_idx,
+                                          self.global_pos_left, self.global_pos_right,
+                                          self.global_pos_top, self.global_pos_bottom)
+            self.frame.dirty_groups.add(self)
 
 
 ####################################################################################################
@@ -602,7 +1314,90 @@ class GraphicsHandle(QGraphicsObject):
         return super().itemChange(change, value)
 
 
+class GraphicsHandleOverlay:
+    # one set of handles per scene, bound to the selected item instead of every item owning its own
+    def __init__(self, frame: Frame, scene: QGraphicsScene):
+        self.frame = frame
+        self.scene = scene
+
+        self.item: Optional[Union['GraphicsRectItem', 'GraphicsLineItem']] = None
+        self.handle_names: List[str] = []
+        self.handles: List[GraphicsHandle] = []
+        self.is_handle_moving = common.ToggleBool()
+
+    @staticmethod
+    def get_overlay(frame: Frame, scene: QGraphicsScene) -> 'GraphicsHandleOverlay':
+        # keyed by the c++ object, a scene fetched back through item.scene() may come with a new python wrapper
+        key = shiboken6.getCppPointer(scene)[0]
+        overlay = frame.handle_overlays.get(key)
+        if overlay is None:
+            overlay = GraphicsHandleOverlay(frame, scene)
+            frame.handle_overlays[key] = overlay
+            scene.destroyed.connect(lambda: frame.handle_overlays.pop(key, None))
+        return overlay
+
+    def get_handle(self, idx: int) -> GraphicsHandle:
+        while len(self.handles) <= idx:
+            handle = GraphicsHandle(self.frame, pos=QPoint())
+            handle.setZValue(1 << 16)  # above every item it may be bound to
+            handle.signalPositionChange.connect(lambda x, handle_idx=len(self.handles): self.on_handle_move(x.toPoint(), handle_idx))
+            self.handles.append(handle)
+
+        return self.handles[idx]
+
+    def bind(self, item: Union['GraphicsRectItem', 'GraphicsLineItem']) -> None:
+        if self.item is not None and self.item is not item:
+            self.unbind()
+
+        self.item = item
+        self.handle_names = list(item.handle_cursor_shapes)
+        for idx, handle_name in enumerate(self.handle_names):
+            handle = self.get_handle(idx)
+            handle.cursor_shape = item.handle_cursor_shapes[handle_name]
+            if handle.scene() is not self.scene:
+                self.scene.addItem(handle)
+            handle.setParentItem(item.parentItem())
+            handle.show()
+
+        self.update_pos()
+
+    def unbind(self, item: Union['GraphicsRectItem', 'GraphicsLineItem'] = None) -> None:
+        if item is not None and item is not self.item:
+            return
+
+        # unbound handles leave the scene, so they add nothing to its index
+        for handle in self.handles:
+            if handle.scene() is self.scene:
+                handle.setParentItem(None)
+                self.scene.removeItem(handle)
+        self.item = None
+        self.handle_names = []
+
+    def is_under_mouse(self) -> bool:
+        return any(handle.isUnderMouse() for handle in self.handles[:len(self.handle_names)])
+
+    def update_pos(self) -> None:
+        if self.item is None:
+            return
+
+        with self.is_handle_moving:
+            handle_pos = self.item.get_handle_pos()
+            for handle, handle_name in zip(self.handles, self.handle_names):
+                handle.setPos(handle_pos[handle_name])
+
+    def on_handle_move(self, pos: QPoint, idx: int) -> None:
+        if self.item is not None and not self.is_handle_moving and idx < len(self.handle_names):
+            self.item.on_handle_move(pos, self.handle_names[idx])
+
+
 class GraphicsRectItem(QGraphicsRectItem):
+    handle_cursor_shapes = {
+        'top_left': Qt.CursorShape.SizeFDiagCursor,
+        'top_right': Qt.CursorShape.SizeBDiagCursor,
+        'bottom_left': Qt.CursorShape.SizeBDiagCursor,
+        'bottom_right': Qt.CursorShape.SizeFDiagCursor
+    }
+
     def __init__(self,
                  frame: Frame,
                  scene: QGraphicsScene,
@@ -626,34 +1421,19 @@ class GraphicsRectItem(QGraphicsRectItem):
         self.pos_handle_bottom_right = rect.bottomRight()
         self.pos_item_change = QPointF()
 
-        self.handle_top_left = GraphicsHandle(frame, pos=self.pos().toPoint(), cursor_shape=Qt.CursorShape.SizeFDiagCursor)
-        self.handle_top_right = GraphicsHandle(frame, pos=self.pos().toPoint(), cursor_shape=Qt.CursorShape.SizeBDiagCursor)
-        self.handle_bottom_left = GraphicsHandle(frame, pos=self.pos().toPoint(), cursor_shape=Qt.CursorShape.SizeBDiagCursor)
-        self.handle_bottom_right = GraphicsHandle(frame, pos=self.pos().toPoint(), cursor_shape=Qt.CursorShape.SizeFDiagCursor)
-
         self.scene.addItem(self)
         self.enable_handle = enable_handle
-        self.is_handle_moving = common.ToggleBool()
-
-        if enable_handle:
-            self.scene.addItem(self.handle_top_left)
-            self.scene.addItem(self.handle_top_right)
-            self.scene.addItem(self.handle_bottom_left)
-            self.scene.addItem(self.handle_bottom_right)
-
-            self.hide_handles()
-
-            self.handle_top_left.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'top_left'))
-            self.handle_top_right.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'top_right'))
-            self.handle_bottom_left.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'bottom_left'))
-            self.handle_bottom_right.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'bottom_right'))
+        self.handle_overlay = GraphicsHandleOverlay.get_overlay(frame, scene) if enable_handle else None
+        self.handle_move_callback: Optional[Callable] = None
 
     def deleteLater(self) -> None:  # noqa
+        self.hide_handles()
         self.scene.removeItem(self)
-        self.scene.removeItem(self.handle_top_left)
-        self.scene.removeItem(self.handle_top_right)
-        self.scene.removeItem(self.handle_bottom_left)
-        self.scene.removeItem(self.handle_bottom_right)
+
+    def set_parent_item(self, item: QGraphicsItem) -> None:
+        self.setParentItem(item)
+        if self.is_handle_bound():
+            self.handle_overlay.bind(self)
 
     def hoverEnterEvent(self, event: QGraphicsSceneHoverEvent) -> None:
         self.frame.add_cursor_shape(Qt.CursorShape.UpArrowCursor)
@@ -664,10 +1444,10 @@ class GraphicsRectItem(QGraphicsRectItem):
         super().hoverLeaveEvent(event)
 
     def update_rect_pos(self, top_left: QPoint, bottom_right: QPoint) -> None:
-        self.pos_handle_top_left = copy.deepcopy(top_left)
-        self.pos_handle_top_right = QPoint(bottom_right.x(), top_left.y())
-        self.pos_handle_bottom_left = QPoint(top_left.x(), bottom_right.y())
-        self.pos_handle_bottom_right = copy.deepcopy(bottom_right)
+        common.assign_point(self.pos_handle_top_left, top_left.x(), top_left.y())
+        common.assign_point(self.pos_handle_top_right, bottom_right.x(), top_left.y())
+        common.assign_point(self.pos_handle_bottom_left, top_left.x(), bottom_right.y())
+        common.assign_point(self.pos_handle_bottom_right, bottom_right.x(), bottom_right.y())
 
         self.setRect(top_left.x() - self.pos_item_change.x(),
                      top_left.y() - self.pos_item_change.y(),
@@ -676,16 +1456,21 @@ class GraphicsRectItem(QGraphicsRectItem):
 
     def update_handle_pos(self, top_left: QPoint, bottom_right: QPoint) -> None:
         if self.enable_handle:
-            with self.is_handle_moving:
-                self.pos_handle_top_left = copy.deepcopy(top_left)
-                self.pos_handle_top_right = QPoint(bottom_right.x(), top_left.y())
-                self.pos_handle_bottom_left = QPoint(top_left.x(), bottom_right.y())
-                self.pos_handle_bottom_right = copy.deepcopy(bottom_right)
-
-                self.handle_top_left.setPos(self.pos_handle_top_left)
-                self.handle_top_right.setPos(self.pos_handle_top_right)
-                self.handle_bottom_left.setPos(self.pos_handle_bottom_left)
-                self.handle_bottom_right.setPos(self.pos_handle_bottom_right)
+            common.assign_point(self.pos_handle_top_left, top_left.x(), top_left.y())
+            common.assign_point(self.pos_handle_top_right, bottom_right.x(), top_left.y())
+            common.assign_point(self.pos_handle_bottom_left, top_left.x(), bottom_right.y())
+            common.assign_point(self.pos_handle_bottom_right, bottom_right.x(), bottom_right.y())
+
+            if self.is_handle_bound():
+                self.handle_overlay.update_pos()
+
+    def get_handle_pos(self) -> Dict[str, QPoint]:
+        return {
+            'top_left': self.pos_handle_top_left,
+            'top_right': self.pos_handle_top_right,
+            'bottom_left': self.pos_handle_bottom_left,
+            'bottom_right': self.pos_handle_bottom_right
+        }
 
     def update_all_pos(self, top_left: QPoint, bottom_right: QPoint) -> None:
         top_left_ = QPoint(min(top_left.x(), bottom_right.x()), min(top_left.y(), bottom_right.y()))
@@ -695,17 +1480,19 @@ class GraphicsRectItem(QGraphicsRectItem):
         self.update_handle_pos(top_left_, bottom_right_)
 
     def on_handle_move(self, pos: QPoint, point: str) -> None:
-        if not self.is_handle_moving:
-            if point == 'top_left':
-                self.update_all_pos(pos, self.pos_handle_bottom_right)
-            elif point == 'top_right':
-                self.update_all_pos(QPoint(self.pos_handle_top_left.x(), pos.y()),
-                                    QPoint(pos.x(), self.pos_handle_bottom_right.y()))
-            elif point == 'bottom_left':
-                self.update_all_pos(QPoint(pos.x(), self.pos_handle_top_left.y()),
-                                    QPoint(self.pos_handle_bottom_right.x(), pos.y()))
-            elif point == 'bottom_right':
-                self.update_all_pos(self.pos_handle_top_left, pos)
+        if point == 'top_left':
+            self.update_all_pos(pos, self.pos_handle_bottom_right)
+        elif point == 'top_right':
+            self.update_all_pos(QPoint(self.pos_handle_top_left.x(), pos.y()),
+                                QPoint(pos.x(), self.pos_handle_bottom_right.y()))
+        elif point == 'bottom_left':
+            self.update_all_pos(QPoint(pos.x(), self.pos_handle_top_left.y()),
+                                QPoint(self.pos_handle_bottom_right.x(), pos.y()))
+        elif point == 'bottom_right':
+            self.update_all_pos(self.pos_handle_top_left, pos)
+
+        if self.handle_move_callback:
+            self.handle_move_callback()
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange:
@@ -713,29 +1500,23 @@ class GraphicsRectItem(QGraphicsRectItem):
             self.pos_item_change = value
             self.update_handle_pos(self.pos_handle_top_left + pos_diff, self.pos_handle_bottom_right + pos_diff)
         elif change == QGraphicsItem.GraphicsItemChange.ItemSelectedChange:
-            if value or (
-                    self.handle_top_left.isUnderMouse() or
-                    self.handle_top_right.isUnderMouse() or
-                    self.handle_bottom_left.isUnderMouse() or
-                    self.handle_bottom_right.isUnderMouse()
-            ):
+            if value or (self.is_handle_bound() and self.handle_overlay.is_under_mouse()):
                 self.show_handles()
             else:
                 self.hide_handles()
 
         return super().itemChange(change, value)
 
+    def is_handle_bound(self) -> bool:
+        return self.enable_handle and self.handle_overlay.item is self
+
     def show_handles(self) -> None:
-        self.handle_top_left.show()
-        self.handle_top_right.show()
-        self.handle_bottom_left.show()
-        self.handle_bottom_right.show()
+        if self.enable_handle:
+            self.handle_overlay.bind(self)
 
     def hide_handles(self) -> None:
-        self.handle_top_left.hide()
-        self.handle_top_right.hide()
-        self.handle_bottom_left.hide()
-        self.handle_bottom_right.hide()
+        if self.enable_handle:
+            self.handle_overlay.unbind(self)
 
     def show(self) -> None:
         super().show()
@@ -780,6 +1561,11 @@ class GraphicsPixmapItem(GraphicsRectItem):
 
 
 class GraphicsLineItem(QGraphicsLineItem):
+    handle_cursor_shapes = {
+        'start': Qt.CursorShape.SizeAllCursor,
+        'end': Qt.CursorShape.SizeAllCursor
+    }
+
     def __init__(self,
                  frame: Frame,
                  scene: QGraphicsScene,
@@ -802,27 +1588,14 @@ class GraphicsLineItem(QGraphicsLineItem):
         self.pos_handle_end = copy.deepcopy(pos_end)
         self.pos_item_change = QPointF()
 
-        self.handle_start = GraphicsHandle(frame=frame, pos=self.pos().toPoint())
-        self.handle_end = GraphicsHandle(frame=frame, pos=self.pos().toPoint())
-
         self.scene.addItem(self)
         self.enable_handle = enable_handle
-        self.is_handle_moving = common.ToggleBool()
-
-        if enable_handle:
-            self.scene.addItem(self.handle_start)
-            self.scene.addItem(self.handle_end)
-
-            self.handle_start.hide()
-            self.handle_end.hide()
-
-            self.handle_start.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'start'))
-            self.handle_end.signalPositionChange.connect(lambda x: self.on_handle_move(x.toPoint(), 'end'))
+        self.handle_overlay = GraphicsHandleOverlay.get_overlay(frame, scene) if enable_handle else None
+        self.handle_move_callback: Optional[Callable] = None
 
     def deleteLater(self) -> None:  # noqa
+        self.hide_handles()
         self.scene.removeItem(self)
-        self.scene.removeItem(self.pos_handle_start)
-        self.scene.removeItem(self.pos_handle_end)
 
     def hoverEnterEvent(self, event: QGraphicsSceneHoverEvent) -> None:
         self.frame.add_cursor_shape(Qt.CursorShape.UpArrowCursor)
@@ -843,23 +1616,30 @@ class GraphicsLineItem(QGraphicsLineItem):
 
     def update_handle_pos(self, pos_handle_start: QPoint, pos_handle_end: QPoint) -> None:
         if self.enable_handle:
-            with self.is_handle_moving:
-                self.pos_handle_start = pos_handle_start
-                self.pos_handle_end = pos_handle_end
+            self.pos_handle_start = pos_handle_start
+            self.pos_handle_end = pos_handle_end
 
-                self.handle_start.setPos(pos_handle_start.x(), pos_handle_start.y())
-                self.handle_end.setPos(pos_handle_end.x(), pos_handle_end.y())
+            if self.is_handle_bound():
+                self.handle_overlay.update_pos()
+
+    def get_handle_pos(self) -> Dict[str, QPoint]:
+        return {
+            'start': self.pos_handle_start,
+            'end': self.pos_handle_end
+        }
 
     def update_all_pos(self, pos_start: QPoint, pos_end: QPoint) -> None:
         self.update_line_pos(pos_start, pos_end)
         self.update_handle_pos(pos_start, pos_end)
 
     def on_handle_move(self, pos: QPoint, point: str) -> None:
-        if not self.is_handle_moving:
-            if point == 'start':
-                self.update_line_pos(pos, self.pos_handle_end)
-            elif point == 'end':
-                self.update_line_pos(self.pos_handle_start, pos)
+        if point == 'start':
+            self.update_line_pos(pos, self.pos_handle_end)
+        elif point == 'end':
+            self.update_line_pos(self.pos_handle_start, pos)
+
+        if self.handle_move_callback:
+            self.handle_move_callback()
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange:
@@ -867,23 +1647,23 @@ class GraphicsLineItem(QGraphicsLineItem):
             self.pos_item_change = value
             self.update_handle_pos(self.pos_handle_start + pos_diff, self.pos_handle_end + pos_diff)
         elif change == QGraphicsItem.GraphicsItemChange.ItemSelectedChange:
-            if value or (
-                    self.handle_start.isUnderMouse() or
-                    self.handle_end.isUnderMouse()
-            ):
+            if value or (self.is_handle_bound() and self.handle_overlay.is_under_mouse()):
                 self.show_handles()
             else:
                 self.hide_handles()
 
         return super().itemChange(change, value)
 
+    def is_handle_bound(self) -> bool:
+        return self.enable_handle and self.handle_overlay.item is self
+
     def show_handles(self) -> None:
-        self.handle_start.show()
-        self.handle_end.show()
+        if self.enable_handle:
+            self.handle_overlay.bind(self)
 
     def hide_handles(self) -> None:
-        self.handle_start.hide()
-        self.handle_end.hide()
+        if self.enable_handle:
+            self.handle_overlay.unbind(self)
 
     def show(self) -> None:
         super().show()
@@ -943,7 +1723,7 @@ class GraphicsView(SubObject, QGraphicsView):
         SubObject.__init__(self, obj=obj, pos=pos, size=size)
         self.margin = 0
 
-        self.setScene(QGraphicsScene(QRect(QPoint(), size - QSize(self.margin, self.margin))))
+        self.setScene(QGraphicsScene(QRect(QPoint(), size - QSize(self.margin, self.margin)), self))
 
     def set_scene_size(self, width: int, height: int, update_view_size: bool = False) -> None:
         self.setSceneRect(QRect(QPoint(0, 0), QSize(width, height)))
@@ -1102,6 +1882,8 @@ class TableCellType(Enum):
 
 
 class TableCell:
+    __slots__ = ('key', 'value', 'type', 'size')
+
     def __init__(self,
                  key: str,
                  value: Any,
@@ -1114,6 +1896,8 @@ class TableCell:
 
 
 class TableRow:
+    __slots__ = ('data', 'check')
+
     def __init__(self,
                  data: Dict[str, TableCell] = None,
                  check: Qt.CheckState = Qt.CheckState.Unchecked):
@@ -1249,6 +2033,23 @@ class Table(SubObject, BaseTable):
         BaseTable.__init__(self, obj=obj, enable_checkbox=enable_checkbox)
         SubObject.__init__(self, obj=obj, pos=pos, size=size)
 
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        return {
+            'size': self.size(),
+            'enable_checkbox': self.enable_checkbox
+        }
+
+    def get_record_state(self) -> Dict[str, Any]:
+        # the rows are edited in place by the cells, so they already hold the current values and check states
+        return {
+            'table_header': self.table_header,
+            'table_data': self.table_data
+        }
+
+    def restore_record_state(self) -> None:
+        if self.table_data:
+            self.render_list(self.table_header, self.table_data)
+
 
 ####################################################################################################
 # Function
@@ -1262,7 +2063,14 @@ class FuncArgParseType(Enum):
     dclick = auto()
 
 
+def parse_arg(x) -> str:
+    # default parser shared by every FuncArg instead of two lambdas per instance
+    return ' {0}'.format(x)
+
+
 class FuncArg:
+    __slots__ = ('key', 'value', 'check', 'is_key_output', 'comment', 'parse_key', 'parse_value', 'parse_type', 'readonly_value')
+
     def __init__(self,
                  key: str,
                  value: str = None,
@@ -1278,8 +2086,8 @@ class FuncArg:
         self.check = Qt.CheckState.Checked if check else Qt.CheckState.Unchecked
         self.is_key_output = is_key_output
         self.comment = comment
-        self.parse_key = parse_key or (lambda x: ' {0}'.format(x))
-        self.parse_value = parse_value or (lambda x: ' {0}'.format(x))
+        self.parse_key = parse_key or parse_arg
+        self.parse_value = parse_value or parse_arg
         self.parse_type = parse_type
         self.readonly_value = readonly_value
 
@@ -1294,6 +2102,8 @@ class FuncArg:
 
 
 class Func:
+    __slots__ = ('name', 'click_func', 'dclick_func', 'args', 'args_parser', 'parent', 'children', 'is_leaf')
+
     def __init__(self,
                  name: str,
                  click_func: Callable = (lambda x: None),
@@ -1378,6 +2188,7 @@ class FuncTree(SubObject, QTreeWidget):
         SubObject.__init__(self, obj=obj, pos=pos, size=QSize(300, 300))
 
         self.is_show = False
+        self.func_list = func_list
 
         self.clicked.connect(self.on_mouse_click)
         self.doubleClicked.connect(self.on_mouse_double_click)
@@ -1393,20 +2204,24 @@ class FuncTree(SubObject, QTreeWidget):
         self.setHeaderLabels(['Function'])
 
         def build_tree(tree: List[Func], parent, level) -> None:
+            # subtrees are built detached and attached in one call per parent
+            nodes = []
             for func in tree:
                 node = QTreeWidgetItem([func.name])
-
-                if level == 0:
-                    parent.addTopLevelItem(node)
-                else:
-                    parent.addChild(node)
-
                 self.map_func.update({node: func})
 
                 if not func.is_leaf:
                     build_tree(func.children, node, level + 1)
 
-        build_tree(func_list, self, 0)
+                nodes.append(node)
+
+            if level == 0:
+                parent.addTopLevelItems(nodes)
+            else:
+                parent.addChildren(nodes)
+
+        with self.frame.updates_disabled():
+            build_tree(func_list, self, 0)
         # self.on_mouse_click()
 
     def on_mouse_click(self) -> None:
@@ -1428,10 +2243,21 @@ class FuncTree(SubObject, QTreeWidget):
         if item in self.map_func:
             self.map_func[item].double_click()
 
-    def deleteLater(self) -> None:  # noqa  # TODO
-        # self.obj.widget_object_manager.delete_from_render_data(self.func_args_table)
+    def deleteLater(self) -> None:  # noqa
+        # the args table is registered on the parent of the tree, not on the tree itself
+        if not self.is_delete and self.func_args_table in self.parent_object.children_objects:
+            self.parent_object.remove_object(self.func_args_table)
         super().deleteLater()
 
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        return {'func_list': self.func_list}
+
+    def dematerialize(self) -> 'ObjectRecord':
+        # the args table only shows the clicked function, the rebuilt tree creates a fresh one
+        if self.func_args_table in self.parent_object.children_objects:
+            self.parent_object.remove_object(self.func_args_table)
+        return super().dematerialize()
+
     def show_func_args_table(self):
         self.func_args_table.show()
 
@@ -1467,10 +2293,12 @@ class PushButton(SubObject, QPushButton):
         self.func_unselect = func_unselect
 
         self.press_start_pos = QPoint()
-        self.last_global_pos = copy.deepcopy(self.global_pos)
+        self.last_global_pos = QPoint(self.global_pos)
+        self.drag_global_pos = QPoint()  # reused on every mouse move
+        self.drag_callback = self.drag
         self.is_dragging = False
         self.is_clicking = False
-        self.start_time = common.Time().timestamp
+        self.start_time = time.monotonic()
 
         self.move_and_show()
 
@@ -1485,28 +2313,48 @@ class PushButton(SubObject, QPushButton):
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
             self.press_start_pos = event.globalPos()
-            self.last_global_pos = copy.deepcopy(self.global_pos)
+            common.assign_point(self.last_global_pos, self.global_pos.x(), self.global_pos.y())
+            # a selected member of the rubber band selection takes the rest of the group along
+            self.drag_callback = self.drag_group if self.is_select and self.render_idx in self.frame.group_idx else self.drag
             self.is_dragging = True
             self.is_clicking = True
             self.is_self_moving.set(True)
-            self.start_time = common.Time().timestamp
+            self.start_time = time.monotonic()
 
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         if self.is_dragging:
-            pos_diff = event.globalPos() - self.press_start_pos
-            self.update_global_pos(self.last_global_pos + pos_diff)
-            self.move_and_show()
+            global_pos = event.globalPos()
+            pos_diff_x = global_pos.x() - self.press_start_pos.x()
+            pos_diff_y = global_pos.y() - self.press_start_pos.y()
+            common.assign_point(self.drag_global_pos, self.last_global_pos.x() + pos_diff_x, self.last_global_pos.y() + pos_diff_y)
+            self.frame.coalesce(self, self.drag_callback)
 
-            if pos_diff.manhattanLength() > Config.Object.SubObject.Click().cursor_move_distance_tolerance:
+            if abs(pos_diff_x) + abs(pos_diff_y) > cursor_move_distance_tolerance:
                 self.is_clicking = False
 
         super().mouseMoveEvent(event)
 
+    def drag(self) -> None:
+        if self.is_dragging:
+            self.update_global_pos(self.drag_global_pos)
+            self.frame.request_render()
+
+    def drag_group(self) -> None:
+        if self.is_dragging:
+            group = self.frame.get_group()
+            if self not in group:
+                group.append(self)
+            self.frame.move_objects(group,
+                                    self.drag_global_pos.x() - self.global_pos.x(),
+                                    self.drag_global_pos.y() - self.global_pos.y())
+
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
-        time_diff = common.Time().timestamp - self.start_time
-        if time_diff <= Config.Object.SubObject.Click().cursor_press_time_tolerance and self.is_clicking:
+        self.frame.flush_coalesced()
+
+        time_diff = time.monotonic() - self.start_time
+        if time_diff <= cursor_press_time_tolerance and self.is_clicking:
             self.click()
 
         self.is_dragging = False
@@ -1549,6 +2397,18 @@ class PushButton(SubObject, QPushButton):
     def set_style_sheet(self, is_select: bool) -> None:
         pass
 
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        return {
+            'size': self.size(),
+            'is_default_select': self.is_default_select,
+            'is_changeable': self.is_changeable,
+            'func_select': self.func_select,
+            'func_unselect': self.func_unselect
+        }
+
+    def get_record_state(self) -> Dict[str, Any]:
+        return {'is_select': self.is_select}
+
 
 class TextMenu(SubObjectMenu):
     def __init__(self,
@@ -1594,16 +2454,20 @@ class Text(PushButton):
         self.move_and_show()
 
         self.widget_clipboard: Any = self.frame.load_widget(self, 'widget_clipboard')
-        self.menu = TextMenu(self)
 
-        self.menu.addAction(Action(
-            menu=self.menu,
+        self.reset()
+
+    def create_menu(self) -> 'TextMenu':
+        menu = TextMenu(self)
+
+        menu.addAction(Action(
+            menu=menu,
             text='Copy Mime',
             func=Func('Copy Mime', click_func=lambda: self.widget_clipboard.set_mime(
                 common.copy_mime_data(self.frame.widget_object_manager.get_grandfather_object(self).mime, customized=True)))
         ))
 
-        self.reset()
+        return menu
 
     def set_style_sheet(self, is_select: bool) -> None:
         if is_select:
@@ -1612,6 +2476,14 @@ class Text(PushButton):
             self.setStyleSheet(Config.Object.Text().BgColor().unselected)
         self.show()
 
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        kwargs = super().get_record_kwargs()
+        kwargs.update({
+            'text': self.content,
+            'icon': None if self.icon().isNull() else self.icon()
+        })
+        return kwargs
+
 
 class ImageMenu(SubObjectMenu):
     def __init__(self,
@@ -1649,7 +2521,6 @@ class Image(PushButton):
         self.widget_clipboard: Any = self.frame.load_widget(self, 'widget_clipboard')
         self.scaled_image = image
 
-        self.menu = ImageMenu(self)
         self.is_resizing = common.ToggleBool()
 
     def paintEvent(self, event: QPaintEvent) -> None:
@@ -1658,10 +2529,23 @@ class Image(PushButton):
         painter.drawPixmap(self.scaled_image.rect(), self.scaled_image)
         self.resize(self.scaled_image.size())
 
+    def create_menu(self) -> 'ImageMenu':
+        return ImageMenu(self)
+
     def resize_bounding_rect(self, size: QSize) -> None:
         with self.is_resizing:
             self.scaled_image = converter.resize_image(self.content, size)
 
+    def get_record_kwargs(self) -> Dict[str, Any]:
+        kwargs = super().get_record_kwargs()
+        kwargs.update({'image': self.content})
+        return kwargs
+
+    def get_record_state(self) -> Dict[str, Any]:
+        state = super().get_record_state()
+        state.update({'scaled_image': self.scaled_image})
+        return state
+
 
 ####################################################################################################
 # Tab
@@ -1677,7 +2561,12 @@ class Page:
         self.title = title
         self.frontend = frontend
         self.func_list = func_list or []
-        self.deleteLater = delete_later or (lambda: None)
+        self.deleteLater = delete_later or self.delete_frontend
+
+    def delete_frontend(self) -> None:
+        # removeTab only detaches the page, the frontend widget stays alive until deleted
+        if self.frontend is not None:
+            self.frontend.deleteLater()
 
 
 class Tab(SubObject, QTabWidget):
@@ -6,6 +6,89 @@ class Config:
         def __init__(self):
             self.background_color = '#F0F0F0'
 
+    class Startup:
+        def __init__(self):
+            self.enable_trace = True  # record a chrome trace of the startup, saved to log/ on first paint
+
+    class Profile:
+        def __init__(self):
+            self.enable_signal_profiler = False  # time every slot connected to the frame signals, dump with Ctrl+Alt+P
+            self.sampling_interval = 5  # millisecond, interval of the sampling profiler toggled with Ctrl+Alt+R
+            self.tracemalloc_frames = 10  # stack depth kept per allocation while the memory snapshot of Ctrl+Alt+M is tracing
+
+    class Watchdog:
+        def __init__(self):
+            self.enable = True  # report event loop stalls with the stacks of the gui thread
+            self.stall_threshold = 200  # millisecond
+            self.heartbeat_interval = 50  # millisecond
+            self.sample_interval = 20  # millisecond
+            self.max_stack_depth = 12
+            self.num_top_stacks = 3
+            self.num_reports = 100  # stall reports kept in memory
+
+    class ObjectManager:
+        def __init__(self):
+            self.size = [300, 500]
+            self.fetch_batch_size = 1000  # children listed per expansion or scroll to the bottom
+
+    class Log:
+        def __init__(self):
+            self.level = 'DEBUG'
+            self.enable_console = True
+            self.rotation = '20 MB'  # a new file once the current one reaches this size, a time such as '00:00' works too
+            self.retention = 10  # rotated files kept
+            self.compression = 'zip'  # applied to rotated files on the writer thread
+            self.enable_perf_channel = True  # structured performance events in log/perf_<time>.jsonl
+            self.ring_buffer_size = 2000  # recent messages kept in memory for the log viewer of Ctrl+Alt+L
+            self.viewer_update_interval = 500  # millisecond
+            self.viewer_size = [800, 400]
+
+    class Dashboard:
+        def __init__(self):
+            self.update_interval = 1000  # millisecond, the dashboard toggled with Ctrl+Alt+D only polls while open
+            self.size = [420, 320]
+
+    class Render:
+        def __init__(self):
+            self.enable_culling = True  # hide objects outside the viewport and skip them while re-rendering
+            self.culling_margin = 200  # pixel, objects within this distance of the viewport are kept alive
+            self.enable_canvas_container = False  # host objects in one container, panning moves the container only
+            self.canvas_container_size = 1 << 23  # pixel, must stay below QWIDGETSIZE_MAX
+            self.enable_virtualization = False  # replace far off-screen objects by records and release their widgets
+            self.virtualization_margin = 2000  # pixel, objects beyond this distance of the viewport are virtualized
+
+    class Input:
+        def __init__(self):
+            self.enable_coalescing = True  # during a drag only the latest pointer position is processed once per frame
+            self.coalescing_fps = 120
+
+    class Plugin:
+        def __init__(self):
+            # widgets listed here are not imported at startup, their shortcut is registered on their behalf
+            # and the module is imported, instantiated and its entry point called on first use
+            self.lazy_widgets = {
+                'widget_git': {
+                    'shortcut_name': 'generate git widget',
+                    'shortcut_key': ['Ctrl', 'G'],
+                    'entry_point': 'generate_git_widget'
+                },
+                'widget_ssh': {
+                    'shortcut_name': 'generate ssh widget',
+                    'shortcut_key': ['Ctrl', 'S'],
+                    'entry_point': 'generate_ssh_widget'
+                },
+                'widget_terminal': {
+                    'shortcut_name': 'generate terminal widget',
+                    'shortcut_key': ['Ctrl', 'T'],
+                    'entry_point': 'generate_terminal_widget'
+                },
+                'widget_screenshot': {
+                    'shortcut_name': 'capture screen',
+                    'shortcut_key': ['Ctrl', 'Alt', 'Q'],
+                    'entry_point': 'capture_screen'
+                }
+            }
+
     class Object:
         class SubObject:
             class Click:
@@ -1,11 +1,18 @@
 import sys
 
-from PySide6.QtWidgets import QApplication
-from common.widget_base import Frame
+from common.startup_tracer import tracer
+
+with tracer.trace('import PySide6.QtWidgets', 'import'):
+    from PySide6.QtWidgets import QApplication
+with tracer.trace('import common.widget_base', 'import'):
+    from common.widget_base import Frame
 
 
 if __name__ == '__main__':
-    app = QApplication([])
-    demo = Frame(is_import_module=True)
-    demo.show()
+    with tracer.trace('QApplication', 'main'):
+        app = QApplication([])
+    with tracer.trace('Frame', 'main'):
+        demo = Frame(is_import_module=True)
+    with tracer.trace('Frame.show', 'main'):
+        demo.show()
     sys.exit(app.exec())
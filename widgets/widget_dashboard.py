@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, Optional
+
+from PySide6.QtCore import QTimer, QSize
+from PySide6.QtWidgets import QGraphicsView
+
+from common import common, widget_base
+from config import Config
+from widgets import widget_shortcut
+
+
+def get_rss() -> float:
+    # MiB, 0 where /proc is unavailable
+    if not os.path.exists('/proc/self/statm'):
+        return 0.0
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_dashboard')
+        self.is_auto_start = True
+
+        self.update_interval = Config.Dashboard().update_interval
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.update_interval)
+        self.timer.timeout.connect(self.update_dashboard)
+        self.last_update = 0.0
+        self.last_paint_stats: Dict[str, Any] = {}
+        self.last_num_stalls = 0
+
+        self.obj: Optional[widget_base.Object] = None
+        self.text: Optional[widget_base.PlainTextEdit] = None
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='toggle performance dashboard',
+                                                 shortcut_key=['Ctrl', 'Alt', 'D'],
+                                                 callback=self.toggle_dashboard)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+        self.close_dashboard()
+
+    def toggle_dashboard(self) -> None:
+        if self.obj is None:
+            self.open_dashboard()
+        else:
+            self.close_dashboard()
+
+    def open_dashboard(self) -> None:
+        self.obj = self.frame.widget_object_manager.generate_object()
+        self.text = self.obj.add_object(widget_base.PlainTextEdit(obj=self.obj, pos=self.obj.global_pos, text='',
+                                                                  size=QSize(*Config.Dashboard().size), readonly=True))
+
+        self.last_update = time.perf_counter()
+        self.last_paint_stats = dict(self.frame.paint_stats)
+        self.last_num_stalls = self.get_num_stalls()
+        self.update_dashboard()
+        self.timer.start()
+
+    def close_dashboard(self) -> None:
+        # nothing is polled once closed, the timer is the only cost of the dashboard
+        self.timer.stop()
+        if self.obj is None:
+            return
+
+        if not self.text.is_delete:
+            self.text.deleteLater()
+        if not self.obj.is_delete:
+            self.frame.remove_object(self.obj)
+        self.obj = self.text = None
+
+    def get_num_stalls(self) -> int:
+        if self.frame.stall_watchdog is None:
+            return 0
+        return len(self.frame.stall_watchdog.stall_reports)
+
+    def collect_metrics(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        elapsed = now - self.last_update
+        self.last_update = now
+
+        paint_stats = self.frame.paint_stats
+        num_paints = paint_stats['count'] - self.last_paint_stats.get('count', 0)
+        paint_time = paint_stats['total'] - self.last_paint_stats.get('total', 0.0)
+        self.last_paint_stats = dict(paint_stats)
+        paint_stats['max'] = 0.0
+
+        num_stalls = self.get_num_stalls()
+        stalls, self.last_num_stalls = num_stalls - self.last_num_stalls, num_stalls
+
+        scenes = {'frame': len(self.frame.scene().items())}
+        for view in self.frame.findChildren(QGraphicsView):
+            if view.scene() is not None and view.isVisible():
+                name = view.objectName() or type(view).__name__
+                scenes[name] = scenes.get(name, 0) + len(view.scene().items())
+
+        # lazy widgets are not activated here, unloaded ones have nothing running
+        widget_terminal = self.frame.widgets.get('widget_terminal')
+        terminals = widget_terminal.terminals if widget_terminal else []
+        widget_ssh = self.frame.widgets.get('widget_ssh')
+        ssh_proxies = widget_ssh.ssh_proxies if widget_ssh else []
+
+        terminal_queue_depth = 0
+        for terminal in terminals:
+            try:
+                terminal_queue_depth += terminal.io['io_write'].qsize()
+            except NotImplementedError:
+                pass
+
+        widget_render = self.frame.widgets.get('widget_render')
+
+        return {
+            'fps': num_paints / elapsed if elapsed else 0.0,
+            'paint_ms': paint_time / num_paints * 1e3 if num_paints else 0.0,
+            'paint_max_ms': self.last_paint_stats['max'] * 1e3,
+            'loop_lag_ms': max(elapsed * 1e3 - self.update_interval, 0.0),
+            'stalls': stalls,
+            'rss_mib': get_rss(),
+            'python_blocks': sys.getallocatedblocks(),
+            'traced_mib': tracemalloc.get_traced_memory()[0] / (1 << 20) if tracemalloc.is_tracing() else None,
+            'render_data': len(self.frame.render_data),
+            'culled': len(widget_render.culled_idx) if widget_render else 0,
+            'virtualized': len(widget_render.virtualized_idx) if widget_render else 0,
+            'scene_items': scenes,
+            'terminal_backends': sum(1 for terminal in terminals if terminal.backend.is_alive()),
+            'sftp_transports': sum(1 for ssh_proxy in ssh_proxies if ssh_proxy.transport is not None and ssh_proxy.transport.is_active()),
+            'coalesce_pending': len(self.frame.coalesce_pending),
+            'terminal_queue_depth': terminal_queue_depth
+        }
+
+    @staticmethod
+    def format_metrics(metrics: Dict[str, Any]) -> str:
+        lines = [
+            'frame      {0:>6.1f} fps  paint {1:.2f} ms  max {2:.2f} ms'.format(metrics['fps'], metrics['paint_ms'], metrics['paint_max_ms']),
+            'event loop lag {0:.1f} ms  stalls {1}'.format(metrics['loop_lag_ms'], metrics['stalls']),
+            'memory     rss {0:.1f} MiB  python {1} blocks{2}'.format(
+                metrics['rss_mib'], metrics['python_blocks'],
+                '' if metrics['traced_mib'] is None else '  traced {0:.1f} MiB'.format(metrics['traced_mib'])),
+            'objects    {0} rendered  {1} culled  {2} virtualized'.format(metrics['render_data'], metrics['culled'], metrics['virtualized']),
+            'scene items'
+        ]
+        lines.extend('    {0:<20} {1}'.format(name, count) for name, count in sorted(metrics['scene_items'].items(), key=lambda x: -x[1]))
+        lines.extend([
+            'terminal   {0} backends  {1} queued'.format(metrics['terminal_backends'], metrics['terminal_queue_depth']),
+            'ssh        {0} sftp transports'.format(metrics['sftp_transports']),
+            'input      {0} coalesced callbacks pending'.format(metrics['coalesce_pending'])
+        ])
+        return '\n'.join(lines)
+
+    def update_dashboard(self) -> None:
+        if self.text is None or self.text.is_delete:
+            # closed from the object menu
+            self.close_dashboard()
+            return
+
+        self.text.set_plain_text(self.format_metrics(self.collect_metrics()))
@@ -59,4 +59,5 @@ class Widget(widget_base.WidgetBase):
             file_icon = None
 
         text: widget_base.Text = obj.add_object(widget_base.Text(obj=obj, pos=QPoint(pos_x, pos_y), text=file_path, icon=file_icon))
+        text.is_virtualizable = True
         pass
@@ -4,7 +4,6 @@ from PySide6.QtCore import QPoint
 from PySide6.QtGui import Qt, QMouseEvent
 
 from common import common, widget_base
-from widgets import widget_render
 
 
 @common.singleton
@@ -22,8 +21,6 @@ class Widget(widget_base.WidgetBase):
         self.is_dragging_canvas = False
         self.is_moving_frame = False
 
-        self.widget_render: widget_render.Widget = widget_render.Widget(frame)
-
         self.reset()
 
     def reset(self) -> None:
@@ -58,12 +55,11 @@ class Widget(widget_base.WidgetBase):
     def on_mouse_move(self, event: QMouseEvent):
         if self.is_dragging_canvas:
             pos_diff = event.globalPos() - self.start_pos
-            self.frame.coordinate_offset = self.last_coordinate_offset + pos_diff
-            self.widget_render.re_render_all()
+            self.frame.set_coordinate_offset(self.last_coordinate_offset + pos_diff)
+            self.frame.request_render()
         elif self.is_moving_frame:
             pos_diff = event.globalPos() - self.start_pos
             self.frame.move(self.last_frame_pos + pos_diff)
-            self.widget_render.re_render_all()
 
     def on_mouse_release(self, event: QMouseEvent):
         self.reset()
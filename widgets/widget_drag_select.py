@@ -1,5 +1,3 @@
-import copy
-
 from PySide6.QtCore import QRect, QPoint, QSize
 from PySide6.QtGui import Qt, QMouseEvent
 from PySide6.QtWidgets import QRubberBand
@@ -46,51 +44,39 @@ class Widget(widget_base.WidgetBase):
 
     def on_mouse_press(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
-            for obj in self.frame.render_data.values():
-                if common.is_point_a_in_rec_b(a_x=event.windowPos().x(),
-                                              a_y=event.windowPos().y(),
-                                              b_left=obj.global_pos_left,
-                                              b_right=obj.global_pos_right,
-                                              b_top=obj.global_pos_top,
-                                              b_bottom=obj.global_pos_right):
-                    return
-
-            self.start_pos = event.windowPos()
+            pos = self.frame.relative_pos_to_global_pos(event.windowPos().toPoint())
+            if self.frame.query_point(pos.x(), pos.y()):
+                return
+
+            self.start_pos = event.windowPos().toPoint()
             self.rubber_band.resize(QSize(0, 0))
             self.rubber_band.show()
             self.is_dragging = True
 
     def on_mouse_move(self, event: QMouseEvent) -> None:
         if self.is_dragging:
-            pos_left = min(self.start_pos.x(), event.windowPos().x())
-            pos_right = max(self.start_pos.x(), event.windowPos().x())
-            pos_top = min(self.start_pos.y(), event.windowPos().y())
-            pos_bottom = max(self.start_pos.y(), event.windowPos().y())
-
-            obj_pos = self.frame.df_obj_pos[self.frame.df_obj_pos.apply(  # type:ignore
-                lambda x: max(x['left'], pos_left) <= min(x['right'], pos_right) and max(x['top'], pos_top) <= min(x['bottom'], pos_bottom),
-                axis=1)]
-
-            if obj_pos.empty:
-                self.obj_idx_in_roi.clear()
+            pos = event.windowPos().toPoint()
+            pos_left = min(self.start_pos.x(), pos.x())
+            pos_right = max(self.start_pos.x(), pos.x())
+            pos_top = min(self.start_pos.y(), pos.y())
+            pos_bottom = max(self.start_pos.y(), pos.y())
+
+            # the rubber band lives in frame coordinates while the index is kept in global coordinates
+            global_left, global_top = self.frame.relative_pos_to_global_pos(QPoint(pos_left, pos_top)).toTuple()
+            global_right, global_bottom = self.frame.relative_pos_to_global_pos(QPoint(pos_right, pos_bottom)).toTuple()
+
+            if pos.x() < self.start_pos.x():
+                self.obj_idx_in_roi = self.frame.query_contain(global_left, global_right, global_top, global_bottom)
             else:
-                self.obj_idx_in_roi = set(obj_pos['idx'])
-
-                if event.windowPos().x() < self.start_pos.x():
-                    self.obj_idx_in_roi = set(obj_idx for obj_idx in self.obj_idx_in_roi if common.is_rec_a_contain_b(
-                        pos_left, pos_right, pos_top, pos_bottom,
-                        self.frame.render_data[obj_idx].global_pos_left,
-                        self.frame.render_data[obj_idx].global_pos_right,
-                        self.frame.render_data[obj_idx].global_pos_top,
-                        self.frame.render_data[obj_idx].global_pos_bottom,
-                    ))
+                self.obj_idx_in_roi = self.frame.query_intersect(global_left, global_right, global_top, global_bottom)
 
             for idx in self.obj_idx_in_roi - self.last_obj_idx_in_roi:
                 self.frame.render_data[idx].pseudo_click()
             for idx in self.last_obj_idx_in_roi - self.obj_idx_in_roi:
                 self.frame.render_data[idx].reset_pseudo_click()
 
-            self.last_obj_idx_in_roi = copy.deepcopy(self.obj_idx_in_roi)
+            # obj_idx_in_roi is a fresh set from the index on every move, it can be handed over without a copy
+            self.last_obj_idx_in_roi = self.obj_idx_in_roi
 
             self.rubber_band.setGeometry(QRect(QPoint(pos_left, pos_top), QPoint(pos_right, pos_bottom)))
 
@@ -98,5 +84,7 @@ class Widget(widget_base.WidgetBase):
         if event.button() == Qt.MouseButton.LeftButton:
             for idx in self.obj_idx_in_roi:
                 self.frame.render_data[idx].click()
+            # dragging any selected one moves them all, the ones unselected by this click leave the group on the next drag
+            self.frame.group_idx.update(self.obj_idx_in_roi)
 
             self.reset()
@@ -14,6 +14,7 @@ class FileManager:
         func_list = [self.generate_dir_tree(os.path.abspath('.'))]
         self.func_tree = obj.add_object(widget_base.FuncTree(obj, self.obj.global_pos, func_list))
         self.func_tree.show()
+        self.func_tree.is_virtualizable = True  # the file manager itself is not kept once built
 
     def generate_dir_tree(self, abs_path) -> widget_base.Func:
         root = widget_base.Func(name=os.path.basename(abs_path), args=[widget_base.FuncArg('abs_path', abs_path)])
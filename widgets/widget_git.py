@@ -1,3 +1,4 @@
+from array import array
 from collections import deque
 from typing import List, Dict, Deque, Optional, cast
 
@@ -14,14 +15,65 @@ node_hollow_rad = Config.Git.CSS().node_hollow_rad
 node_solid_rad = Config.Git.CSS().node_solid_rad
 
 
+class CommitTable:
+    # one column per field, newest commit first, the git objects are released once their fields are copied out
+    def __init__(self, ori_commits: List[git.objects.commit.Commit]):
+        self.hexsha: List[str] = [ori_commit.hexsha for ori_commit in ori_commits]
+        self.message: List[str] = [ori_commit.message for ori_commit in ori_commits]
+        self.committed_date = array('q', (ori_commit.committed_date for ori_commit in ori_commits))
+        self.map_sha_idx: Dict[str, int] = {hexsha: idx for idx, hexsha in enumerate(self.hexsha)}
+
+        # first and second parent by row, -1 when absent or outside of the fetched history
+        self.parent_first = array('i', [-1]) * len(ori_commits)
+        self.parent_second = array('i', [-1]) * len(ori_commits)
+        for idx, ori_commit in enumerate(ori_commits):
+            parents = ori_commit.parents
+            if parents:
+                self.parent_first[idx] = self.map_sha_idx.get(parents[0].hexsha, -1)
+            if len(parents) == 2:
+                self.parent_second[idx] = self.map_sha_idx.get(parents[1].hexsha, -1)
+
+    def __len__(self) -> int:
+        return len(self.hexsha)
+
+    def __getitem__(self, idx: int) -> 'Commit':
+        return Commit(self, idx)
+
+    def __iter__(self):
+        return (Commit(self, idx) for idx in range(len(self.hexsha)))
+
+    def get_parents(self, idx: int) -> List[int]:
+        return [parent_idx for parent_idx in (self.parent_first[idx], self.parent_second[idx]) if parent_idx >= 0]
+
+
 class Commit:
-    def __init__(self, idx: int, ori_commit: git.objects.commit.Commit):
+    # row view on a CommitTable, built on demand
+    __slots__ = ('table', 'idx')
+
+    def __init__(self, table: CommitTable, idx: int):
+        self.table = table
         self.idx = idx
-        self.ori_commit = ori_commit
-        self.branch: Optional[Branch] = None
+
+    @property
+    def hexsha(self) -> str:
+        return self.table.hexsha[self.idx]
+
+    @property
+    def message(self) -> str:
+        return self.table.message[self.idx]
+
+    @property
+    def committed_date(self) -> int:
+        return self.table.committed_date[self.idx]
+
+    @property
+    def parents(self) -> List[int]:
+        return self.table.get_parents(self.idx)
 
 
 class Branch:
+    __slots__ = ('name', 'branch', 'commits', 'num_commits')
+
     def __init__(self, branch: git.refs.head.Head):
         self.name = branch.name
         self.branch = branch
@@ -31,15 +83,15 @@ class Branch:
 
 class OccupiedMap:
     def __init__(self, row_cnt: int):
-        self.map: List[List[bool]] = [[] for _ in range(row_cnt)]
+        # one byte per cell instead of a list of bool references
+        self.map: List[bytearray] = [bytearray() for _ in range(row_cnt)]
 
     def is_cell_occupied(self, row_idx: int, col_idx: int):
         col_num = len(self.map[row_idx])
         if col_idx >= col_num:
-            for _ in range(col_idx - col_num + 1):
-                self.map[row_idx].append(False)
+            self.map[row_idx].extend(bytes(col_idx - col_num + 1))
 
-        return self.map[row_idx][col_idx]
+        return bool(self.map[row_idx][col_idx])
 
     def get_first_available_column(self, row_idx_start: int, row_idx_end: int):
         col_idx = 0
@@ -58,7 +110,7 @@ class OccupiedMap:
     def occupy(self, row_idx_start: int, row_idx_end: int, col_idx: int):
         for row_idx in range(row_idx_start, row_idx_end + 1):
             self.is_cell_occupied(row_idx, col_idx)
-            self.map[row_idx][col_idx] = True
+            self.map[row_idx][col_idx] = 1
 
 
 class GitTable(widget_base.EmbeddedTable):
@@ -79,10 +131,9 @@ class Repo:
         self.git_tab = git_tab
 
         self.branches: Dict[str, Branch] = {}
-        self.commits: List[Commit] = []  # all commits
+        self.commits: CommitTable = CommitTable([])  # all commits
         self.occupied_map: Optional[OccupiedMap] = None
 
-        self.map_sha_commit: Dict[str, Commit] = {}
         self.map_sha_idx: Dict[str, int] = {}
         self.map_sha_node: Dict[str, Node] = {}
         self.map_sha_branch_tag: Dict[str, List[str]] = {}
@@ -93,7 +144,8 @@ class Repo:
 
         self.page: widget_base.Page = widget_base.Page(
             title=self.name,
-            frontend=self.table
+            frontend=self.table,
+            delete_later=self.delete_later
         )
         if self.is_local:
             self.page.func_list = [
@@ -103,6 +155,11 @@ class Repo:
                 widget_base.Func(name='log', dclick_func=lambda x: git_tab.log())
             ]
 
+    def delete_later(self) -> None:
+        # the graph is only parented to the table once rendered, and its scene holds every node and arc
+        self.graph.deleteLater()
+        self.table.deleteLater()
+
     def init_occupied_map(self):
         self.occupied_map = OccupiedMap(len(self.commits))
 
@@ -114,7 +171,7 @@ class Node(widget_base.GraphicsEllipseItem):
         self.row_idx = row_idx
         self.col_idx = col_idx
 
-        is_merge = True if len(commit.ori_commit.parents) == 2 else False
+        is_merge = True if len(commit.parents) == 2 else False
         if is_merge:
             rad = node_solid_rad
         else:
@@ -150,9 +207,9 @@ class GitTab:
     def __init__(self, frame: widget_base.Frame):
         self.frame = frame
         self.obj: widget_base.Object = frame.widget_object_manager.generate_object()
-        self.tab_local: widget_base.Tab = self.obj.add_object(widget_base.Tab(obj=self.obj, pos=self.obj.global_pos, size=QSize(800, 600)))
-        self.tab_remote: widget_base.Tab = self.obj.add_object(
-            widget_base.Tab(obj=self.obj, pos=self.obj.global_pos + QPoint(1100, 0), size=QSize(800, 600)))
+        self.tab_local: widget_base.Tab = widget_base.Tab(obj=self.obj, pos=self.obj.global_pos, size=QSize(800, 600))
+        self.tab_remote: widget_base.Tab = widget_base.Tab(obj=self.obj, pos=self.obj.global_pos + QPoint(1100, 0), size=QSize(800, 600))
+        self.obj.add_objects([self.tab_local, self.tab_remote])
 
         self.git_repo: Optional[git.Repo] = None
         self.repos = {'local': Repo('local', True, self), 'remote': {}}
@@ -267,21 +324,17 @@ class GitTab:
             else:
                 repo.map_sha_branch_tag[sha].append(branch.branch.name)
 
-        repo.commits = [Commit(idx, ori_commit) for idx, ori_commit in enumerate(
-            sorted(list(commit_history.values()), key=lambda x: -x.committed_date))]
-        repo.map_sha_commit = {commit.ori_commit.hexsha: commit for commit in repo.commits}
-        repo.map_sha_idx = {commit.ori_commit.hexsha: idx for idx, commit in enumerate(repo.commits)}
+        repo.commits = CommitTable(sorted(list(commit_history.values()), key=lambda x: -x.committed_date))
+        repo.map_sha_idx = repo.commits.map_sha_idx
         repo.init_occupied_map()
 
         # to be verified
-        for commit in repo.commits:
-            hexsha = commit.ori_commit.hexsha
+        for row_idx, hexsha in enumerate(repo.commits.hexsha):
             if hexsha not in repo.map_sha_node:
-                row_idx = repo.map_sha_idx[hexsha]
                 col_idx = repo.occupied_map.get_first_available_column(row_idx, row_idx)
 
                 node = Node(
-                    commit=commit,
+                    commit=repo.commits[row_idx],
                     row_idx=row_idx,
                     col_idx=col_idx,
                     pos=self.map_row_col_to_pos(row_idx, col_idx)
@@ -298,16 +351,15 @@ class GitTab:
     def fetch_commits_helper(self, repo: Repo, process_list: Deque[str]) -> None:
         while process_list:
             process_list = deque(sorted(process_list, key=lambda x: repo.map_sha_idx[x]))  # efficiency?
-            latter_commit = repo.map_sha_commit[process_list[0]].ori_commit
-            latter_node = repo.map_sha_node[latter_commit.hexsha]
+            latter_node = repo.map_sha_node[process_list[0]]
 
-            parents = latter_commit.parents
+            parents = repo.commits.get_parents(repo.map_sha_idx[process_list[0]])
             if parents:
-                prev_hexsha: str = parents[0].hexsha
-                prev_commit: Commit = repo.map_sha_commit[prev_hexsha]
+                prev_commit: Commit = repo.commits[parents[0]]
+                prev_hexsha: str = prev_commit.hexsha
 
                 if prev_hexsha not in repo.map_sha_node:
-                    row_idx = repo.map_sha_idx[prev_hexsha]
+                    row_idx = prev_commit.idx
                     col_idx = latter_node.col_idx
 
                     prev_node = Node(
@@ -329,11 +381,11 @@ class GitTab:
                     repo.occupied_map.occupy(latter_node.row_idx, prev_node.row_idx, latter_node.col_idx)
 
                 if len(parents) == 2:
-                    prev_hexsha = parents[1].hexsha
-                    prev_commit = repo.map_sha_commit[prev_hexsha]
+                    prev_commit = repo.commits[parents[1]]
+                    prev_hexsha = prev_commit.hexsha
 
                     if prev_hexsha not in repo.map_sha_node:
-                        row_idx = repo.map_sha_idx[prev_hexsha]
+                        row_idx = prev_commit.idx
                         col_idx = repo.occupied_map.get_first_available_column(latter_node.row_idx + 1, row_idx)
 
                         prev_node = Node(
@@ -365,13 +417,13 @@ class GitTab:
         table_data = []
         for row_cnt, commit in enumerate(repo.commits):
             row_data = {
-                'branch/tag': widget_base.TableCell('branch/tag', repo.map_sha_branch_tag[commit.ori_commit.hexsha][0],  # TODO
+                'branch/tag': widget_base.TableCell('branch/tag', repo.map_sha_branch_tag[commit.hexsha][0],  # TODO
                                                     widget_base.TableCellType.LINEEDIT_READONLY, QSize(100, self.node_interval))
-            } if commit.ori_commit.hexsha in repo.map_sha_branch_tag else {}
+            } if commit.hexsha in repo.map_sha_branch_tag else {}
             row_data.update({
-                'message': widget_base.TableCell('message', commit.ori_commit.message, widget_base.TableCellType.LINEEDIT_READONLY,
+                'message': widget_base.TableCell('message', commit.message, widget_base.TableCellType.LINEEDIT_READONLY,
                                                  QSize(400, self.node_interval)),
-                'hexsha': widget_base.TableCell('hexsha', commit.ori_commit.hexsha[:7], widget_base.TableCellType.LINEEDIT_READONLY,
+                'hexsha': widget_base.TableCell('hexsha', commit.hexsha[:7], widget_base.TableCellType.LINEEDIT_READONLY,
                                                 QSize(60, self.node_interval))
             })
             table_row = widget_base.TableRow(data=row_data)
@@ -412,10 +464,12 @@ class Widget(widget_base.WidgetBase):
         self.setObjectName('widget_git')
         self.is_auto_start = True
 
+        # name and key come from the plugin manifest, the same entry registers the stand-in shortcut before import
+        manifest = Config.Plugin().lazy_widgets['widget_git']
         self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
         self.shortcut = widget_shortcut.Shortcut(widget=self,
-                                                 shortcut_name='generate git widget',
-                                                 shortcut_key=['Ctrl', 'G'],
+                                                 shortcut_name=manifest['shortcut_name'],
+                                                 shortcut_key=manifest['shortcut_key'],
                                                  callback=self.generate_git_widget)
         self.widget_shortcut.add_shortcut(self.shortcut)
 
@@ -0,0 +1,50 @@
+from PySide6.QtGui import Qt
+
+from common import common, widget_base, input_trace
+from widgets import widget_shortcut
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_input_recorder')
+        self.is_auto_start = True
+
+        self.recorder = input_trace.InputRecorder(frame)
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='toggle input recording',
+                                                 shortcut_key=['Ctrl', 'Alt', 'I'],
+                                                 callback=self.toggle_recording)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+        self.recorder.stop()
+
+    def toggle_recording(self) -> None:
+        if self.recorder.is_recording:
+            self.stop_recording()
+        else:
+            self.recorder.start()
+            self.frame.logger.info('input recording started')
+
+    def stop_recording(self) -> None:
+        self.recorder.stop()
+        self.recorder.drop_trailing_keys(Qt.Key.Key_I)
+
+        file_path = 'log/input_trace_{0}.jsonl.gz'.format(common.Time().date_and_time2)
+        try:
+            self.recorder.save(file_path)
+            self.frame.logger.info('input recording stopped, {0} events saved to {1}, replay with '
+                                   'python -m benchmark.bench_replay {1}'.format(len(self.recorder.events), file_path))
+        except OSError as e:
+            self.frame.logger.error('failed to save input trace: {0}'.format(e))
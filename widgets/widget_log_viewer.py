@@ -0,0 +1,84 @@
+from typing import Optional
+
+from PySide6.QtCore import QTimer, QSize
+from PySide6.QtGui import Qt
+
+from common import common, widget_base, log_manager
+from config import Config
+from widgets import widget_shortcut
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_log_viewer')
+        self.is_auto_start = True
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(Config.Log().viewer_update_interval)
+        self.timer.timeout.connect(self.update_viewer)
+        self.last_num_messages = -1
+
+        self.obj: Optional[widget_base.Object] = None
+        self.text: Optional[widget_base.PlainTextEdit] = None
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='toggle log viewer',
+                                                 shortcut_key=['Ctrl', 'Alt', 'L'],
+                                                 callback=self.toggle_viewer)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+        self.close_viewer()
+
+    def toggle_viewer(self) -> None:
+        if self.obj is None:
+            self.open_viewer()
+        else:
+            self.close_viewer()
+
+    def open_viewer(self) -> None:
+        self.obj = self.frame.widget_object_manager.generate_object()
+        self.text = self.obj.add_object(widget_base.PlainTextEdit(obj=self.obj, pos=self.obj.global_pos, text='',
+                                                                  size=QSize(*Config.Log().viewer_size), readonly=True))
+        # the height follows the text otherwise, the ring buffer can hold thousands of lines
+        self.text.textChanged.disconnect(self.text.update_size)
+        self.text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+
+        self.last_num_messages = -1
+        self.update_viewer()
+        self.timer.start()
+
+    def close_viewer(self) -> None:
+        self.timer.stop()
+        if self.obj is None:
+            return
+
+        if not self.text.is_delete:
+            self.text.deleteLater()
+        if not self.obj.is_delete:
+            self.frame.remove_object(self.obj)
+        self.obj = self.text = None
+
+    def update_viewer(self) -> None:
+        if self.text is None or self.text.is_delete:
+            self.close_viewer()
+            return
+
+        # the text is only rebuilt when something was logged since the last update
+        if log_manager.manager.num_messages == self.last_num_messages:
+            return
+        self.last_num_messages = log_manager.manager.num_messages
+
+        self.text.set_plain_text('\n'.join(log_manager.manager.ring_buffer))
+        scroll_bar = self.text.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
@@ -0,0 +1,64 @@
+import json
+import tracemalloc
+from typing import Optional
+
+from common import common, widget_base, memory_snapshot
+from config import Config
+from widgets import widget_shortcut
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_memory')
+        self.is_auto_start = True
+
+        self.baseline: Optional[memory_snapshot.MemorySnapshot] = None
+        self.is_tracing_started = False
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='memory snapshot and diff',
+                                                 shortcut_key=['Ctrl', 'Alt', 'M'],
+                                                 callback=self.take_snapshot)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+        self.stop_tracing()
+
+    def stop_tracing(self) -> None:
+        if self.is_tracing_started:
+            tracemalloc.stop()
+            self.is_tracing_started = False
+        self.baseline = None
+
+    def take_snapshot(self) -> None:
+        # the first press takes the baseline, the second one diffs against it
+        if self.baseline is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(Config.Profile().tracemalloc_frames)
+                self.is_tracing_started = True
+            self.baseline = memory_snapshot.MemorySnapshot(self.frame)
+            self.frame.logger.info('memory baseline taken, {0}'.format(self.baseline.get_summary()))
+            return
+
+        snapshot = memory_snapshot.MemorySnapshot(self.frame)
+        diff = snapshot.compare_to(self.baseline)
+        self.stop_tracing()
+
+        file_path = 'log/memory_diff_{0}.json'.format(common.Time().date_and_time2)
+        try:
+            with open(file_path, 'w') as f:
+                json.dump(diff, f, indent=2)
+            self.frame.logger.info('memory diff saved to {0}'.format(file_path))
+        except OSError as e:
+            self.frame.logger.error('failed to save memory diff: {0}'.format(e))
+        self.frame.logger.info(memory_snapshot.format_diff(diff))
@@ -1,44 +1,239 @@
-from collections import deque
-from typing import Union
+from typing import List, Dict, Set, Union, Optional, Any
 
-import pandas as pd
-from PySide6.QtCore import QPoint
-from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QPoint, QSize, QTimer, QAbstractItemModel, QModelIndex
+from PySide6.QtGui import Qt
+from PySide6.QtWidgets import QWidget, QTreeView
 
-from common import common, widget_base
+from common import common, object_store, widget_base
+from config import Config
 from widgets import widget_shortcut
 
 
-class ObjectManager:
-    def __init__(self, frame: widget_base.Frame, obj: widget_base.Object):
+class ObjectTreeNode:
+    __slots__ = ('render_idx', 'name', 'parent', 'children', 'row', 'unfetched', 'fetch_pos')
+
+    def __init__(self, render_idx: Optional[int], name: str, parent: Optional['ObjectTreeNode'], row: int):
+        self.render_idx = render_idx  # None for the frame, objects are looked up by idx as virtualization swaps them in place
+        self.name = name
+        self.parent = parent
+        self.children: List['ObjectTreeNode'] = []
+        self.row = row
+        self.unfetched: Optional[List[int]] = None  # idx of the children in creation order, None until first expanded
+        self.fetch_pos = 0
+
+
+class ObjectTreeModel(QAbstractItemModel):
+    # children are fetched on expansion, add and remove notifications are applied in batches once the event loop is idle
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__()
         self.frame = frame
-        self.obj = obj
-        self.func_list = {}
-
-        self.process_list = deque()
-        func_list = [self.generate_object_tree()]
-        self.func_tree = obj.add_object(widget_base.FuncTree(obj, self.obj.global_pos, func_list))
-        self.func_tree.show()
-
-    def generate_object_tree(self) -> widget_base.Func:
-        root = widget_base.Func(name=self.frame.objectName())
-        self.process_list.append([root, self.frame])
-
-        while self.process_list:
-            self.process(*self.process_list[0])
-            self.process_list.popleft()
-
-        return root
-
-    def process(self, father: widget_base.Func, obj: Union[widget_base.SubObject, widget_base.EmbeddedObject, widget_base.Object]) -> None:
-        if obj.children_objects:
-            father.is_leaf = False
-            for children_object in obj.children_objects:
-                func = widget_base.Func(name=children_object.objectName())  # type:ignore
-                father.children.append(func)
-                self.process_list.append([func, children_object])
+
+        self.root = ObjectTreeNode(None, frame.objectName(), None, 0)
+        self.map_idx_node: Dict[int, ObjectTreeNode] = {}
+
+        self.pending_add: List[int] = []
+        self.pending_remove: Set[int] = set()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(0)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.frame.signalObjectAdd.connect(self.on_object_add)
+        self.frame.signalObjectRemove.connect(self.on_object_remove)
+
+    def disconnect_frame(self) -> None:
+        self.flush_timer.stop()
+        self.frame.signalObjectAdd.disconnect(self.on_object_add)
+        self.frame.signalObjectRemove.disconnect(self.on_object_remove)
+
+    @staticmethod
+    def get_object_name(obj) -> str:
+        if isinstance(obj, widget_base.ObjectRecord):
+            return '{0} #{1} (virtualized)'.format(obj.cls.__name__, obj.render_idx)
+        elif obj.objectName():
+            return '{0} #{1} ({2})'.format(type(obj).__name__, obj.render_idx, obj.objectName())
         else:
-            father.is_leaf = True
+            return '{0} #{1}'.format(type(obj).__name__, obj.render_idx)
+
+    def get_object(self, node: ObjectTreeNode) -> Any:
+        if node is self.root:
+            return self.frame
+        return self.frame.render_data.get(node.render_idx)
+
+    def get_node(self, index: QModelIndex) -> ObjectTreeNode:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def get_index(self, node: ObjectTreeNode) -> QModelIndex:
+        return QModelIndex() if node is self.root else self.createIndex(node.row, 0, node)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        node = self.get_node(parent)
+        if 0 <= row < len(node.children) and column == 0:
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # noqa
+        if not index.isValid():
+            return QModelIndex()
+        return self.get_index(index.internalPointer().parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self.get_node(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        # names are kept on the node, the object may already be gone until the next flush
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return index.internalPointer().name
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return 'Object'
+        return None
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self.get_node(parent)
+        if node.children:
+            return True
+        elif node.unfetched is None:
+            obj = self.get_object(node)
+            return bool(obj is not None and obj.children_objects)
+        else:
+            return node.fetch_pos < len(node.unfetched)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self.get_node(parent)
+        if node.unfetched is None:
+            return self.hasChildren(parent)
+        return node.fetch_pos < len(node.unfetched)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self.get_node(parent)
+        if node.unfetched is None:
+            obj = self.get_object(node)
+            if obj is None:
+                return
+            node.unfetched = sorted(child.render_idx for child in obj.children_objects if child.render_idx is not None)
+            node.fetch_pos = 0
+
+        batch_size = Config.ObjectManager().fetch_batch_size
+        idx_list = [idx for idx in node.unfetched[node.fetch_pos:node.fetch_pos + batch_size]
+                    if idx in self.frame.render_data and idx not in self.map_idx_node]
+        node.fetch_pos += batch_size
+        if node.fetch_pos >= len(node.unfetched):
+            node.unfetched, node.fetch_pos = [], 0
+        self.append_children(node, idx_list)
+
+    def append_children(self, node: ObjectTreeNode, idx_list: List[int]) -> None:
+        if not idx_list:
+            return
+
+        num_rows = len(node.children)
+        self.beginInsertRows(self.get_index(node), num_rows, num_rows + len(idx_list) - 1)
+        for row, idx in enumerate(idx_list, num_rows):
+            child = ObjectTreeNode(idx, self.get_object_name(self.frame.render_data[idx]), node, row)
+            node.children.append(child)
+            self.map_idx_node[idx] = child
+        self.endInsertRows()
+
+    def on_object_add(self, obj) -> None:
+        # the parent only lists the object once add_object returns, so it is picked up on the next flush
+        self.pending_add.append(obj.render_idx)
+        self.flush_timer.start()
+
+    def on_object_remove(self, obj) -> None:
+        self.pending_remove.add(obj.render_idx)
+        self.flush_timer.start()
+
+    def flush(self) -> None:
+        pending_add, self.pending_add = self.pending_add, []
+        pending_remove, self.pending_remove = self.pending_remove, set()
+
+        map_parent_rows: Dict[ObjectTreeNode, List[int]] = {}
+        for idx in pending_remove:
+            if idx in self.map_idx_node:
+                node = self.map_idx_node[idx]
+                map_parent_rows.setdefault(node.parent, []).append(node.row)
+        for node, rows in map_parent_rows.items():
+            # skipped when an ancestor went in the same flush
+            if node is self.root or node.render_idx in self.map_idx_node:
+                self.remove_rows(node, rows)
+
+        map_parent_idx: Dict[ObjectTreeNode, List[int]] = {}
+        unfetched_parents: Set[ObjectTreeNode] = set()
+        for idx in pending_add:
+            obj = self.frame.render_data.get(idx)
+            if obj is None or idx in self.map_idx_node:
+                continue
+
+            parent_object = obj.parent_object
+            parent = self.root if parent_object is self.frame else self.map_idx_node.get(getattr(parent_object, 'render_idx', None))
+            if parent is None:
+                continue
+            elif parent.unfetched is None:
+                unfetched_parents.add(parent)
+            elif parent.fetch_pos < len(parent.unfetched):
+                parent.unfetched.append(idx)
+            else:
+                map_parent_idx.setdefault(parent, []).append(idx)
+        for node, idx_list in map_parent_idx.items():
+            self.append_children(node, idx_list)
+
+        # not expanded yet, the children are listed on expansion, only the expand indicator may change
+        for node in unfetched_parents:
+            if node is not self.root:
+                index = self.get_index(node)
+                self.dataChanged.emit(index, index)
+
+    def remove_rows(self, node: ObjectTreeNode, rows: List[int]) -> None:
+        # contiguous rows go in one call, from the bottom so that the rows above keep their numbers
+        rows.sort(reverse=True)
+        last = first = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == first - 1:
+                first = row
+                continue
+
+            self.beginRemoveRows(self.get_index(node), first, last)
+            for child in node.children[first:last + 1]:
+                self.forget_subtree(child)
+            del node.children[first:last + 1]
+            self.endRemoveRows()
+
+            if row is not None:
+                last = first = row
+
+        for row, child in enumerate(node.children):
+            child.row = row
+
+    def forget_subtree(self, node: ObjectTreeNode) -> None:
+        process_list = [node]
+        while process_list:
+            _node = process_list.pop()
+            self.map_idx_node.pop(_node.render_idx, None)
+            process_list.extend(_node.children)
+
+
+class ObjectTreeView(widget_base.SubObject, QTreeView):
+    def __init__(self,
+                 obj: Union[widget_base.SubObject, widget_base.EmbeddedObject, widget_base.Object],
+                 pos: Union[QPoint, widget_base.RelativePos]):
+        QTreeView.__init__(self, parent=obj.frame)
+        widget_base.SubObject.__init__(self, obj=obj, pos=pos, size=QSize(*Config.ObjectManager().size))
+
+        self.tree_model = ObjectTreeModel(self.frame)
+        self.setModel(self.tree_model)
+        self.setUniformRowHeights(True)
+
+    def deleteLater(self) -> None:  # noqa
+        if not self.is_delete:
+            self.tree_model.disconnect_frame()
+        super().deleteLater()
 
 
 @common.singleton
@@ -49,8 +244,6 @@ class Widget(widget_base.WidgetBase):
         self.setObjectName('widget_object_manager')
         self.is_auto_start = True
 
-        self.frame.df_obj_pos = pd.DataFrame(columns=['idx', 'left', 'right', 'top', 'bottom'])
-
         self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
         self.shortcut = widget_shortcut.Shortcut(widget=self,
                                                  shortcut_name='open object manager',
@@ -82,26 +275,85 @@ class Widget(widget_base.WidgetBase):
             self.frame.render_idx: obj
         })
 
-        # TODO: indispensable?
-        self.frame.df_obj_pos.loc[len(self.frame.df_obj_pos)] = [  # type:ignore
-            self.frame.render_idx,
-            self.frame.render_data[self.frame.render_idx].global_pos_left,
-            self.frame.render_data[self.frame.render_idx].global_pos_right,
-            self.frame.render_data[self.frame.render_idx].global_pos_top,
-            self.frame.render_data[self.frame.render_idx].global_pos_bottom
-        ]
+        obj.update_global_pos_bounds()
+        self.frame.spatial_index.insert(obj.render_idx,
+                                        obj.global_pos_left, obj.global_pos_right,
+                                        obj.global_pos_top, obj.global_pos_bottom)
+        self.frame.object_store.insert(obj.render_idx, self.get_parent_idx(obj))
+        if obj.relative_pos:
+            self.frame.pinned_idx.add(obj.render_idx)
+            self.frame.relative_pos_dependents.setdefault(obj.relative_pos.ref_object or self.frame, set()).add(obj.render_idx)
 
         self.frame.render_idx += 1
+        self.frame.signalObjectAdd.emit(obj)
+
+    def add_to_render_data_batch(self, objs) -> None:
+        for obj in objs:
+            obj.render_idx = self.frame.render_idx
+            self.frame.render_data[obj.render_idx] = obj
+            self.frame.render_idx += 1
+
+            obj.update_global_pos_bounds()
+            if obj.relative_pos:
+                self.frame.pinned_idx.add(obj.render_idx)
+                self.frame.relative_pos_dependents.setdefault(obj.relative_pos.ref_object or self.frame, set()).add(obj.render_idx)
+
+        self.frame.spatial_index.insert_many(
+            (obj.render_idx, obj.global_pos_left, obj.global_pos_right, obj.global_pos_top, obj.global_pos_bottom) for obj in objs)
+        self.frame.object_store.insert_many((obj.render_idx, self.get_parent_idx(obj)) for obj in objs)
+
+        for obj in objs:
+            self.frame.signalObjectAdd.emit(obj)
+
+    def get_parent_idx(self, obj) -> int:
+        parent_object = obj.parent_object
+        if parent_object is None or isinstance(parent_object, widget_base.Frame) or parent_object.render_idx not in self.frame.object_store:
+            return object_store.root_idx
+        return parent_object.render_idx
 
     def remove_from_render_data(self, obj) -> None:
-        self.frame.render_data.pop(obj.render_idx)
-        self.frame.df_obj_pos.drop(  # type:ignore
-            index=self.frame.df_obj_pos[self.frame.df_obj_pos.idx == obj.render_idx].index.tolist(), inplace=True)  # type:ignore
-        obj.deleteLater()
+        # obj and everything below it leave together, the caller has already detached obj from its parent
+        idx_list = self.frame.object_store.remove_subtree(obj.render_idx) or [obj.render_idx]
+        objs = [self.frame.render_data.pop(idx) for idx in idx_list if idx in self.frame.render_data]
+
+        for _obj in objs:
+            self.frame.spatial_index.remove(_obj.render_idx)
+            self.frame.pinned_idx.discard(_obj.render_idx)
+            self.frame.dirty_idx.discard(_obj.render_idx)
+            self.frame.group_idx.discard(_obj.render_idx)
+            if _obj.relative_pos:
+                self.frame.relative_pos_dependents.get(_obj.relative_pos.ref_object or self.frame, set()).discard(_obj.render_idx)
+            self.frame.relative_pos_dependents.pop(_obj, None)
+            self.frame.signalObjectRemove.emit(_obj)
+
+        # the links inside the subtree go with it, deleteLater then has nothing left to detach one by one
+        for _obj in objs:
+            _obj.children_objects.clear()
+        for _obj in reversed(objs):
+            _obj.deleteLater()
+
+    def replace_in_render_data(self, old_obj, new_obj) -> None:
+        # swap an object for its ObjectRecord or back, render_idx and the index entry are kept
+        old_bounds = widget_base.get_bounds(old_obj)
+        new_obj.render_idx = old_obj.render_idx
+        self.frame.render_data[new_obj.render_idx] = new_obj
+
+        parent_object = old_obj.parent_object
+        parent_object.children_objects.discard(old_obj)
+        parent_object.children_objects.add(new_obj)
+        new_obj.parent_object = parent_object
+
+        new_obj.update_global_pos_bounds()
+        # the stand-in starts with its bounds unknown, the parent keeps aggregating the same area through it
+        if not isinstance(parent_object, widget_base.Frame):
+            widget_base.update_bounds(parent_object, old_bounds, widget_base.get_bounds(new_obj))
+        else:
+            parent_object.dirty_groups.discard(old_obj)
+            parent_object.dirty_groups.add(new_obj)
 
     def render_tree(self) -> None:
         obj = self.generate_object()
-        ObjectManager(self.frame, obj)
+        obj.add_object(ObjectTreeView(obj, obj.global_pos))
 
     def get_grandfather_object(self,
                                obj: Union[widget_base.SubObject, widget_base.EmbeddedObject, widget_base.Object]) -> widget_base.Object:
@@ -0,0 +1,46 @@
+from common import common, widget_base, sampling_profiler
+from config import Config
+from widgets import widget_shortcut
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_profiler')
+        self.is_auto_start = True
+
+        self.profiler = sampling_profiler.SamplingProfiler(Config.Profile().sampling_interval / 1000)
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='toggle sampling profiler',
+                                                 shortcut_key=['Ctrl', 'Alt', 'R'],
+                                                 callback=self.toggle_profiler)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+        self.profiler.stop()
+
+    def toggle_profiler(self) -> None:
+        if self.profiler.is_running:
+            self.stop_profiler()
+        else:
+            self.profiler.start()
+            self.frame.logger.info('sampling profiler started')
+
+    def stop_profiler(self) -> None:
+        self.profiler.stop()
+
+        file_path = 'log/profile_{0}'.format(common.Time().date_and_time2)
+        self.profiler.dump_collapsed('{0}.collapsed.txt'.format(file_path))
+        self.profiler.dump_pstats('{0}.pstats'.format(file_path))
+        self.frame.logger.info('sampling profiler stopped, {0} samples in {1:.1f} s saved to {2}.*'.format(
+            self.profiler.num_samples, self.profiler.time_end - self.profiler.time_start, file_path))
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Set, Tuple
 
 from PySide6.QtCore import QPoint, QEvent
 
 from common import common, widget_base, converter
+from config import Config
 
 
 @common.singleton
@@ -13,13 +14,125 @@ class Widget(widget_base.WidgetBase):
         self.setObjectName('widget_render')
         self.is_auto_start = True
 
-        self.frame.signalResize.connect(self.re_render_all)
+        self.is_culling = Config.Render().enable_culling
+        self.culling_margin = Config.Render().culling_margin
+        self.visible_idx: Set[int] = set(self.frame.render_data)  # objects which are not culled
+
+        self.is_virtualizing = self.is_culling and Config.Render().enable_virtualization
+        self.virtualization_margin = Config.Render().virtualization_margin
+        self.culled_idx: Set[int] = set()
+        self.virtualized_idx: Set[int] = set()  # objects replaced by an ObjectRecord
+
+        self.frame.signalResize.connect(self.flush_dirty)
+        self.frame.signalRender.connect(self.flush_dirty)
+        self.frame.signalObjectAdd.connect(self.on_object_add)
+        self.frame.signalObjectRemove.connect(self.on_object_remove)
 
         self.reset()
 
+    def on_object_add(self, obj) -> None:
+        # new objects are shown on creation, they are culled on the next render if needed
+        self.visible_idx.add(obj.render_idx)
+
+    def on_object_remove(self, obj) -> None:
+        self.visible_idx.discard(obj.render_idx)
+        self.culled_idx.discard(obj.render_idx)
+        self.virtualized_idx.discard(obj.render_idx)
+
+    def get_viewport_rect(self, margin: int = None) -> Tuple[int, int, int, int]:
+        if margin is None:
+            margin = self.culling_margin
+
+        top_left = self.frame.relative_pos_to_global_pos(QPoint(0, 0))
+        return (top_left.x() - margin,
+                top_left.x() + self.frame.width() + margin,
+                top_left.y() - margin,
+                top_left.y() + self.frame.height() + margin)
+
+    def get_visible_idx(self) -> Set[int]:
+        return self.frame.spatial_index.query_intersect(*self.get_viewport_rect()) | self.frame.pinned_idx
+
+    def is_visible(self, obj) -> bool:
+        return obj.render_idx in self.frame.pinned_idx or common.is_rec_overlapped(
+            *self.get_viewport_rect(), obj.global_pos_left, obj.global_pos_right, obj.global_pos_top, obj.global_pos_bottom)
+
+    def materialize(self, idx: int):
+        record: widget_base.ObjectRecord = self.frame.render_data[idx]
+        obj = record.materialize()
+        self.frame.widget_object_manager.replace_in_render_data(record, obj)
+        self.virtualized_idx.discard(idx)
+
+        return obj
+
+    def dematerialize(self, idx: int) -> None:
+        obj: widget_base.SubObject = self.frame.render_data[idx]
+        record = obj.dematerialize()
+        self.frame.widget_object_manager.replace_in_render_data(obj, record)
+        self.virtualized_idx.add(idx)
+
+    def get_shown_object(self, idx: int):
+        if idx in self.virtualized_idx:
+            return self.materialize(idx)
+        else:
+            return self.frame.render_data[idx]
+
+    def virtualize(self) -> None:
+        # culled objects far enough from the viewport release their widgets, the margin avoids thrashing at the border
+        if not self.culled_idx:
+            return
+
+        kept_idx = self.frame.spatial_index.query_intersect(*self.get_viewport_rect(self.virtualization_margin))
+        for idx in self.culled_idx - kept_idx:
+            obj = self.frame.render_data[idx]
+            if obj.is_virtualizable and not obj.children_objects:
+                self.dematerialize(idx)
+        self.culled_idx &= kept_idx
+
     def re_render_all(self, event: QEvent = None) -> None:
-        for obj in self.frame.render_data.values():
-            obj.move_and_show()
+        self.frame.is_offset_dirty = True
+        self.frame.is_viewport_dirty = True
+        self.flush_dirty()
+
+    def flush_dirty(self, event: QEvent = None) -> None:
+        dirty_idx, self.frame.dirty_idx = self.frame.dirty_idx, set()
+        # objects hosted by the canvas follow it, otherwise every visible object moves along with the offset
+        is_full = self.frame.is_offset_dirty and not self.frame.canvas
+        is_viewport_dirty = self.frame.is_viewport_dirty
+        self.frame.is_offset_dirty = False
+        self.frame.is_viewport_dirty = False
+
+        if not self.is_culling:
+            for idx in (list(self.frame.render_data) if is_full else dirty_idx):
+                if idx in self.frame.render_data:
+                    self.frame.render_data[idx].move_and_show()
+            return
+
+        if is_viewport_dirty:
+            visible_idx = self.get_visible_idx()
+
+            for idx in self.visible_idx - visible_idx:
+                self.frame.render_data[idx].cull()
+            for idx in (visible_idx if is_full else (visible_idx - self.visible_idx) | (visible_idx & dirty_idx)):
+                self.get_shown_object(idx).move_and_show()
+
+            if self.is_virtualizing:
+                self.culled_idx = (self.culled_idx | (self.visible_idx - visible_idx)) - visible_idx
+                self.virtualize()
+            self.visible_idx = visible_idx
+        else:
+            for idx in dirty_idx:
+                obj = self.frame.render_data.get(idx)
+                if obj is None:
+                    continue
+                elif self.is_visible(obj):
+                    self.get_shown_object(idx).move_and_show()
+                    self.visible_idx.add(idx)
+                    self.culled_idx.discard(idx)
+                elif idx in self.visible_idx:
+                    obj.cull()
+                    self.visible_idx.discard(idx)
+                    if self.is_virtualizing:
+                        self.culled_idx.add(idx)
 
     def render_to_frame(self, data) -> None:
         if not hasattr(data, 'render_list'):
@@ -29,17 +142,25 @@ class Widget(widget_base.WidgetBase):
         obj: widget_base.Object = self.frame.widget_object_manager.generate_object()
         pos_x, pos_y = obj.global_pos.x(), obj.global_pos.y()
 
+        sub_objs = []
         render_list: List[widget_base.RenderData] = data.render_list
-        for render_data in render_list:
-            if render_data.render_type == widget_base.RenderType.RENDER_TYPE_PLAIN_TEXT:
-                text = obj.add_object(widget_base.Text(obj=obj,
-                                                       pos=QPoint(pos_x, pos_y),
-                                                       text=render_data.content))
-                pos_y += text.height()
-            elif render_data.render_type == widget_base.RenderType.RENDER_TYPE_QIMAGE:
-                image = obj.add_object(widget_base.Image(obj=obj,
-                                                         pos=QPoint(pos_x, pos_y),
-                                                         image=converter.qimage_to_qpixmap(render_data.content)))
-                pos_y += image.height()
-            else:
-                self.frame.logger.warning('unrecognized render type')
+        with self.frame.updates_disabled():
+            for render_data in render_list:
+                if render_data.render_type == widget_base.RenderType.RENDER_TYPE_PLAIN_TEXT:
+                    text = widget_base.Text(obj=obj,
+                                            pos=QPoint(pos_x, pos_y),
+                                            text=render_data.content)
+                    text.is_virtualizable = True
+                    sub_objs.append(text)
+                    pos_y += text.height()
+                elif render_data.render_type == widget_base.RenderType.RENDER_TYPE_QIMAGE:
+                    image = widget_base.Image(obj=obj,
+                                              pos=QPoint(pos_x, pos_y),
+                                              image=converter.qimage_to_qpixmap(render_data.content))
+                    image.is_virtualizable = True
+                    sub_objs.append(image)
+                    pos_y += image.height()
+                else:
+                    self.frame.logger.warning('unrecognized render type')
+
+            obj.add_objects(sub_objs)
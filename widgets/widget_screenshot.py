@@ -5,7 +5,8 @@ from PySide6.QtCore import Qt, QPoint, QRect, QSize
 from PySide6.QtGui import QKeyEvent, QMouseEvent, QPixmap, QImage, QPainter
 from PySide6.QtWidgets import QApplication, QGraphicsScene
 
-from common import common, widget_base, converter, opencv_helper
+from common import common, widget_base, converter
+from config import Config
 from widgets import widget_clipboard, widget_shortcut
 
 
@@ -62,6 +63,8 @@ class ScreenshotFrame(widget_base.Frame):
 
         self.widget_clipboard = _widget_clipboard
 
+        from common import opencv_helper  # deferred, cv2 and numpy are only needed once a screenshot is taken
+
         self.screenshot = screenshot
         background = converter.qpixmap_to_numpy_bgr(screenshot)
         background = opencv_helper.change_rgb_image_brightness(background, -30)
@@ -106,6 +109,8 @@ class ScreenshotFrame(widget_base.Frame):
         }
 
     def reset(self):
+        # the shared handles must leave the scene before clear() destroys its items
+        widget_base.GraphicsHandleOverlay.get_overlay(self, self.scene()).unbind()
         self.scene().clear()
         widget_base.GraphicsPixmapItem(
             frame=self,
@@ -205,10 +210,12 @@ class Widget(widget_base.WidgetBase):
 
         self.widget_clipboard: widget_clipboard.Widget = widget_clipboard.Widget(frame)
 
+        # name and key come from the plugin manifest, the same entry registers the stand-in shortcut before import
+        manifest = Config.Plugin().lazy_widgets['widget_screenshot']
         self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
         self.shortcut = widget_shortcut.Shortcut(widget=self,
-                                                 shortcut_name='capture screen',
-                                                 shortcut_key=['Ctrl', 'Alt', 'Q'],
+                                                 shortcut_name=manifest['shortcut_name'],
+                                                 shortcut_key=manifest['shortcut_key'],
                                                  callback=self.capture_screen)
         self.widget_shortcut.add_shortcut(self.shortcut)
 
@@ -0,0 +1,42 @@
+import json
+
+from common import common, widget_base
+from widgets import widget_shortcut
+
+
+@common.singleton
+class Widget(widget_base.WidgetBase):
+    def __init__(self, frame: widget_base.Frame):
+        super().__init__(frame)
+
+        self.setObjectName('widget_signal_profiler')
+        self.is_auto_start = True
+
+        self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
+        self.shortcut = widget_shortcut.Shortcut(widget=self,
+                                                 shortcut_name='dump signal profile',
+                                                 shortcut_key=['Ctrl', 'Alt', 'P'],
+                                                 callback=self.dump)
+        self.widget_shortcut.add_shortcut(self.shortcut)
+
+        self.reset()
+
+    def enable_widget(self) -> None:
+        super().enable_widget()
+
+    def disable_widget(self) -> None:
+        super().disable_widget()
+
+    def dump(self) -> None:
+        signal_profiler = self.frame.signal_profiler
+        if signal_profiler is None:
+            self.frame.logger.warning('signal profiler is disabled, enable it in Config.Profile')
+            return
+
+        file_path = 'log/signal_profile_{0}.json'.format(common.Time().date_and_time2)
+        with open(file_path, 'w') as f:
+            json.dump(signal_profiler.get_report(), f, indent=4)
+
+        self.frame.logger.info(signal_profiler.get_summary())
+        self.frame.logger.info('signal profile saved to {0}'.format(file_path))
+        signal_profiler.reset()
@@ -1,7 +1,7 @@
 import os
 from collections import deque
 from stat import S_ISDIR
-from typing import Dict, Optional
+from typing import List, Dict, Optional
 
 import paramiko
 from PySide6.QtCore import QSize, QPoint
@@ -122,27 +122,31 @@ class SSHProxy:
         obj_pos = obj.global_pos
         height = 30
 
-        self.lineedit_host_ip: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_host_ip: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos, size=QSize(100, height), text=''))
-        self.lineedit_host_port: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_host_port: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 1 * height), size=QSize(100, height), text=''))
-        self.lineedit_username: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_username: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 2 * height), size=QSize(100, height), text=''))
-        self.lineedit_password: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_password: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 3 * height), size=QSize(100, height), text=''))
-        self.lineedit_cwd: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_cwd: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 4 * height), size=QSize(100, height), text=''))
-        self.button_connect: widget_base.Text = obj.add_object(
+        self.button_connect: widget_base.Text = (
             widget_base.Text(obj=obj, pos=obj_pos + QPoint(0, 5 * height), text='connect', is_changeable=False,
                              func_select=widget_base.Func(name='', click_func=lambda x: self.establish_connection())))
-        self.lineedit_local_path: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_local_path: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 6 * height), size=QSize(100, height), text=''))
-        self.lineedit_remote_path: widget_base.EmbeddedLineedit = obj.add_object(
+        self.lineedit_remote_path: widget_base.EmbeddedLineedit = (
             widget_base.Lineedit(obj=obj, pos=obj_pos + QPoint(0, 7 * height), size=QSize(100, height), text=''))
-        self.button_upload: widget_base.Text = obj.add_object(
+        self.button_upload: widget_base.Text = (
             widget_base.Text(obj=obj, pos=obj_pos + QPoint(0, 8 * height), text='upload', is_changeable=False,
                              func_select=widget_base.Func(name='', click_func=lambda x: self.upload())))
 
+        obj.add_objects([self.lineedit_host_ip, self.lineedit_host_port, self.lineedit_username, self.lineedit_password,
+                         self.lineedit_cwd, self.button_connect, self.lineedit_local_path, self.lineedit_remote_path,
+                         self.button_upload])
+
         self.lineedit_password.setEchoMode(widget_base.EmbeddedLineedit.EchoMode.Password)
 
     def establish_connection(self) -> None:
@@ -220,8 +224,12 @@ class SSHProxy:
             self.frame.logger.error('transport is not active')
 
     def close(self) -> None:
-        self.sftp.close()
-        self.transport.close()
+        if self.sftp is not None:
+            self.sftp.close()
+            self.sftp = None
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
 
 
 @common.singleton
@@ -232,10 +240,14 @@ class Widget(widget_base.WidgetBase):
         self.setObjectName('widget_ssh')
         self.is_auto_start = True
 
+        self.ssh_proxies: List[SSHProxy] = []
+
+        # name and key come from the plugin manifest, the same entry registers the stand-in shortcut before import
+        manifest = Config.Plugin().lazy_widgets['widget_ssh']
         self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
         self.shortcut = widget_shortcut.Shortcut(widget=self,
-                                                 shortcut_name='generate ssh widget',
-                                                 shortcut_key=['Ctrl', 'S'],
+                                                 shortcut_name=manifest['shortcut_name'],
+                                                 shortcut_key=manifest['shortcut_key'],
                                                  callback=self.generate_ssh_widget)
         self.widget_shortcut.add_shortcut(self.shortcut)
 
@@ -243,13 +255,21 @@ class Widget(widget_base.WidgetBase):
 
     def enable_widget(self) -> None:
         super().enable_widget()
+        self.frame.signalObjectRemove.connect(self.on_object_remove)
 
     def disable_widget(self) -> None:
         super().disable_widget()
+        self.frame.signalObjectRemove.disconnect(self.on_object_remove)
+
+    def on_object_remove(self, obj) -> None:
+        # the connection goes with the canvas object holding its widgets
+        for ssh_proxy in [ssh_proxy for ssh_proxy in self.ssh_proxies if ssh_proxy.obj is obj]:
+            ssh_proxy.close()
+            self.ssh_proxies.remove(ssh_proxy)
 
     def generate_ssh_widget(self):
         obj: widget_base.Object = self.frame.widget_object_manager.generate_object()
-        SSHProxy(self.frame, obj)
+        self.ssh_proxies.append(SSHProxy(self.frame, obj))
 
         # print(ssh_proxy.command('pwd'))
         # ssh_proxy.upload('1.txt', '1.txt')
@@ -1,8 +1,10 @@
 from multiprocessing import Process, Queue
+from typing import List
 
 from PySide6.QtCore import QSize, QUrl
 
 from common import common, widget_base, net_tools
+from config import Config
 from third_party.pyxtermjs import app
 from widgets import widget_shortcut
 
@@ -20,11 +22,14 @@ class Widget(widget_base.WidgetBase):
         self.is_auto_start = True
 
         self.terminal_port = 5000
+        self.terminals: List[widget_base.Page] = []  # open terminal pages, each one owns a backend process
 
+        # name and key come from the plugin manifest, the same entry registers the stand-in shortcut before import
+        manifest = Config.Plugin().lazy_widgets['widget_terminal']
         self.widget_shortcut: widget_shortcut.Widget = widget_shortcut.Widget(frame)
         self.shortcut = widget_shortcut.Shortcut(widget=self,
-                                                 shortcut_name='generate terminal widget',
-                                                 shortcut_key=['Ctrl', 'T'],
+                                                 shortcut_name=manifest['shortcut_name'],
+                                                 shortcut_key=manifest['shortcut_key'],
                                                  callback=self.generate_terminal_widget)
         self.widget_shortcut.add_shortcut(self.shortcut)
 
@@ -32,9 +37,24 @@ class Widget(widget_base.WidgetBase):
 
     def enable_widget(self) -> None:
         super().enable_widget()
+        self.frame.signalObjectRemove.connect(self.on_object_remove)
 
     def disable_widget(self) -> None:
         super().disable_widget()
+        self.frame.signalObjectRemove.disconnect(self.on_object_remove)
+
+    def on_object_remove(self, obj) -> None:
+        # the backend goes with the tab holding its page
+        for terminal in [terminal for terminal in self.terminals if terminal.tab is obj]:
+            self.close_terminal(terminal)
+
+    def close_terminal(self, terminal: widget_base.Page) -> None:
+        if terminal not in self.terminals:
+            return
+
+        self.terminals.remove(terminal)
+        terminal.frontend.deleteLater()
+        terminal.backend.kill()
 
     def generate_terminal_widget(self) -> None:
         obj: widget_base.Object = self.frame.widget_object_manager.generate_object()
@@ -60,6 +80,7 @@ class Widget(widget_base.WidgetBase):
         }
         terminal.backend = Process(target=app.start, args=(self.terminal_port, terminal.io,))
         terminal.port = self.terminal_port
+        terminal.tab = tab
         terminal.backend.start()
 
         terminal.frontend.load(QUrl('http://127.0.0.1:{0}/'.format(self.terminal_port)))
@@ -67,12 +88,9 @@ class Widget(widget_base.WidgetBase):
 
         terminal.func_list = self.generate_func_list(tab, terminal)
 
-        def deleteLater():  # noqa
-            terminal.frontend.deleteLater()
-            terminal.backend.kill()
-
-        terminal.deleteLater = deleteLater
+        terminal.deleteLater = lambda: self.close_terminal(terminal)
 
+        self.terminals.append(terminal)
         tab.add_page(page=terminal)
         tab.on_page_change(0)
 
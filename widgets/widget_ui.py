@@ -1,4 +1,3 @@
-import copy
 import sys
 from typing import Optional
 
@@ -21,11 +20,13 @@ class ResizeWindowButton(widget_base.Text):
 
         self.last_frame_width = self.frame.width()
         self.last_frame_height = self.frame.height()
+        self.resize_pos_diff = QPoint()  # reused on every mouse move
+        self.resize_callback = self.resize_frame
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
             self.press_start_pos = event.globalPos()
-            self.last_global_pos = copy.deepcopy(self.global_pos)
+            common.assign_point(self.last_global_pos, self.global_pos.x(), self.global_pos.y())
             self.last_frame_width = self.frame.width()
             self.last_frame_height = self.frame.height()
             self.is_dragging = True
@@ -33,13 +34,18 @@ class ResizeWindowButton(widget_base.Text):
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         if self.is_dragging:
-            pos_diff = event.globalPos() - self.press_start_pos
-            self.move_and_show()
-            self.frame.resize(QSize(self.last_frame_width + pos_diff.x(), self.last_frame_height + pos_diff.y()))
+            global_pos = event.globalPos()
+            common.assign_point(self.resize_pos_diff, global_pos.x() - self.press_start_pos.x(), global_pos.y() - self.press_start_pos.y())
+            self.frame.coalesce(self, self.resize_callback)
         super().mousePressEvent(event)
 
+    def resize_frame(self) -> None:
+        self.move_and_show()
+        self.frame.resize(QSize(self.last_frame_width + self.resize_pos_diff.x(), self.last_frame_height + self.resize_pos_diff.y()))
+
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
+            self.frame.flush_coalesced()
             self.is_dragging = False
         super().mouseReleaseEvent(event)
 